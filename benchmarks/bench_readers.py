@@ -0,0 +1,145 @@
+"""
+Micro-benchmarks of the decode cost of each metadata scope reader.
+
+Each reader is run on chunk data already read from one of the test files,
+so the figures are the cost of decoding one file's chunk, without I/O. Run
+from the repository root and keep the output to compare across releases:
+
+    python benchmarks/bench_readers.py > bench_output.txt
+"""
+
+import gzip
+import os
+import tempfile
+import timeit
+from io import BytesIO
+from struct import pack
+
+from wavinfo import WavInfoReader
+from wavinfo.rf64_parser import parse_rf64
+from wavinfo.riff_parser import parse_chunk
+from wavinfo.wave_bext_reader import WavBextReader
+from wavinfo.wave_dbmd_reader import WavDolbyMetadataReader
+from wavinfo.wave_info_reader import WavInfoChunkReader
+from wavinfo.wave_smpl_reader import WavSmplReader
+
+SOUNDDEVICES = "tests/test_files/sounddevices/A101_1.WAV"
+SMPL = "tests/test_files/smpl/alarm_citizen_loop1_udata.wav"
+INFO = "tests/test_files/sound_grinder_pro/new_camera bumb 1.wav"
+CUES = "tests/test_files/cue_chunks/izotoperx_cues_test.wav"
+ADM = "tests/test_files/protools/Test_ADM_ProTools.wav"
+RF64 = "tests/test_files/rf64/Testfile_SEQ_RF64_Big.wav.gz"
+
+
+def file_data(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def chunk_data(path, ident):
+    reader = WavInfoReader(path)
+    with open(path, 'rb') as f:
+        return reader._find_chunk_data(ident, f)
+
+
+def sparse_rf64(path, frame_count, block_align=6):
+    """
+    Write an RF64 file with `frame_count` frames of silence, as a sparse file
+    that takes no space on disk for its audio.
+    """
+    data_size = frame_count * block_align
+    ds64 = pack("<QQQI", data_size + 80, data_size, frame_count, 0)
+    fmt = pack("<HHIIHH", 1, block_align // 3, 48000, 48000 * block_align,
+               block_align, 24)
+
+    with open(path, 'wb') as f:
+        f.write(b'RF64' + pack("<I", 0xFFFFFFFF) + b'WAVE' +
+                b'ds64' + pack("<I", len(ds64)) + ds64 +
+                b'fmt ' + pack("<I", len(fmt)) + fmt +
+                b'data' + pack("<I", 0xFFFFFFFF))
+        f.truncate(f.tell() + data_size)
+
+
+def benchmarks():
+    bext = chunk_data(SOUNDDEVICES, b'bext')
+    yield "bext", lambda: WavBextReader(bext, 'ascii')
+
+    smpl = chunk_data(SMPL, b'smpl')
+    yield "smpl", lambda: WavSmplReader(smpl)
+
+    fmt_reader = WavInfoReader(SOUNDDEVICES)
+    fmt_file = BytesIO(file_data(SOUNDDEVICES))
+    yield "fmt", lambda: fmt_reader._get_format(fmt_file)
+
+    info_reader = WavInfoReader(INFO)
+    info_file = BytesIO(file_data(INFO))
+    info_chunk = info_reader._find_list_chunk(b'INFO')
+    yield "info", lambda: WavInfoChunkReader(info_file, 'latin_1',
+                                             info_chunk=info_chunk)
+
+    cue_reader = WavInfoReader(CUES)
+    cue_file = BytesIO(file_data(CUES))
+    yield "cues", lambda: cue_reader._get_cue(cue_file)
+
+    dbmd = chunk_data(ADM, b'dbmd')
+
+    def dolby():
+        d = WavDolbyMetadataReader(dbmd)
+        d.dolby_digital_plus()
+        d.dolby_atmos()
+
+    yield "dolby", dolby
+
+    ixml = chunk_data(SOUNDDEVICES, b'iXML')
+
+    def ixml_format():
+        from wavinfo.wave_ixml_reader import WavIXMLFormat
+        WavIXMLFormat(ixml.rstrip(b'\0'))
+
+    yield "ixml", ixml_format
+
+    axml = chunk_data(ADM, b'axml')
+    chna = chunk_data(ADM, b'chna')
+
+    def adm():
+        from wavinfo.wave_adm_reader import WavADMReader
+        WavADMReader(axml, chna)
+
+    yield "adm", adm
+
+    with gzip.open(RF64) as gz:
+        rf64_head = BytesIO(gz.read(4096))
+
+    def rf64():
+        rf64_head.seek(8)
+        parse_rf64(rf64_head, signature=b'RF64')
+
+    yield "rf64 ds64", rf64
+
+    riff = BytesIO(file_data(SOUNDDEVICES))
+
+    def riff_parse():
+        riff.seek(0)
+        parse_chunk(riff)
+
+    yield "riff chunks", riff_parse
+
+    yield "WavInfoReader", lambda: WavInfoReader(SOUNDDEVICES)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        big = os.path.join(tmp, "big.wav")
+        sparse_rf64(big, frame_count=1_000_000_000)
+        yield "RF64 6 GB probe", lambda: WavInfoReader(big)
+
+
+def main():
+    print(f"{'reader':<16}{'usec/file':>12}")
+    for name, func in benchmarks():
+        timer = timeit.Timer(func)
+        number, _ = timer.autorange()
+        best = min(timer.repeat(repeat=5, number=number)) / number
+        print(f"{name:<16}{best * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,8 @@
 Probe WAVE Files for iXML, Broadcast-WAVE and other metadata.
 """
 
-__all__ = ['WavInfoReader', 'WavInfoEOFError']
+__all__ = ['WavInfoReader', 'WavInfoEOFError', 'WavInfoChunkSizeError']
 
 from .wave_reader import WavInfoReader
-from .riff_parser import WavInfoEOFError
+from .riff_parser import WavInfoEOFError, WavInfoChunkSizeError
 
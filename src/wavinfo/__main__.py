@@ -6,11 +6,14 @@ import sys
 import os
 import json
 from enum import Enum
+from uuid import UUID
 import importlib.metadata
 from base64 import b64encode
 from cmd import Cmd
 from shlex import split
-from typing import List, Dict, Union
+from itertools import groupby
+from collections.abc import Iterator
+from typing import List, Dict, Union, Iterable, Tuple, Any, TextIO
 
 
 class MyJSONEncoder(json.JSONEncoder):
@@ -19,10 +22,60 @@ class MyJSONEncoder(json.JSONEncoder):
             return o._name_
         elif isinstance(o, bytes):
             return 'base64:' + b64encode(o).decode('ascii')
+        elif isinstance(o, UUID):
+            return str(o)
         else:
             return super().default(o)
 
 
+class LazyJSONObject:
+    """
+    A JSON object whose members are read from an iterable of key/value pairs
+    while it is being written by :func:`write_json`.
+    """
+
+    def __init__(self, items: Iterable[Tuple[Any, Any]]):
+        self.items = items
+
+
+def write_json(value, fp: TextIO, indent: int = 2, level: int = 0):
+    """
+    Write `value` as JSON, formatted like :func:`json.dump` with `indent`,
+    consuming any iterators and :class:`LazyJSONObject` members as they
+    are reached so the complete value is never held in memory.
+    """
+    inner = '\n' + ' ' * (indent * (level + 1))
+    outer = '\n' + ' ' * (indent * level)
+
+    if isinstance(value, (dict, LazyJSONObject)):
+        items = value.items() if isinstance(value, dict) else value.items
+        fp.write('{')
+        empty = True
+        for key, member in items:
+            if not isinstance(key, str):
+                key = json.dumps(key)
+
+            fp.write(('' if empty else ',') + inner + json.dumps(key) + ': ')
+            write_json(member, fp, indent, level + 1)
+            empty = False
+
+        fp.write('}' if empty else outer + '}')
+
+    elif isinstance(value, (list, tuple, Iterator)):
+        fp.write('[')
+        empty = True
+        for member in value:
+            fp.write(('' if empty else ',') + inner)
+            write_json(member, fp, indent, level + 1)
+            empty = False
+
+        fp.write(']' if empty else outer + ']')
+
+    else:
+        fp.write(json.dumps(value, cls=MyJSONEncoder, indent=indent)
+                 .replace('\n', outer))
+
+
 class MissingDataError(RuntimeError):
     pass
 
@@ -111,7 +164,7 @@ def main():
     manpath = os.path.dirname(__file__) + "/man"
     parser = OptionParser()
 
-    parser.usage = 'wavinfo (--adm | --ixml) <FILE> +'
+    parser.usage = 'wavinfo (--adm | --ixml | --duplicates) <FILE> +'
 
     # parser.add_option('--install-manpages',
     #                   help="Install manual pages for wavinfo",
@@ -133,6 +186,11 @@ def main():
                       default=False,
                       action='store_true')
 
+    parser.add_option('--duplicates', dest='duplicates',
+                      help='Output groups of files with identical audio',
+                      default=False,
+                      action='store_true')
+
     parser.add_option('-i',
                       help='Read metadata with an interactive prompt',
                       default=False,
@@ -161,6 +219,17 @@ def main():
         os.system(shlex.join(args))
         return
 
+    if options.duplicates:
+        from .duplicate_finder import find_duplicates
+        groups = ({'digest': group.digest,
+                   'fmt': group.fmt._asdict(),
+                   'byte_count': group.byte_count,
+                   'paths': group.paths}
+                  for group in find_duplicates(args[1:]))
+        write_json(groups, fp=sys.stdout, indent=2)
+        sys.stdout.write('\n')
+        return
+
     for arg in args[1:]:
         try:
             this_file = WavInfoReader(path=arg)
@@ -181,17 +250,23 @@ def main():
                     'application': f"wavinfo {version}",
                     'scopes': {}
                 }
-                for scope, name, value in this_file.walk():
-                    if scope not in ret_dict['scopes'].keys():
-                        ret_dict['scopes'][scope] = {}
+                if options.i:
+                    for scope, name, value in this_file.walk():
+                        if scope not in ret_dict['scopes'].keys():
+                            ret_dict['scopes'][scope] = {}
 
-                    ret_dict['scopes'][scope][name] = value
+                        ret_dict['scopes'][scope][name] = value
 
-                if options.i:
                     interactive_dict.append(ret_dict)
                 else:
-                    json.dump(ret_dict, cls=MyJSONEncoder, fp=sys.stdout,
-                              indent=2)
+                    scopes = groupby(this_file.walk(lazy=True),
+                                     key=lambda m: m[0])
+                    ret_dict['scopes'] = LazyJSONObject(
+                        (scope, LazyJSONObject((name, value)
+                                               for _, name, value in fields))
+                        for scope, fields in scopes)
+
+                    write_json(ret_dict, fp=sys.stdout, indent=2)
 
         except MissingDataError as e:
             print("MissingDataError: Missing metadata (%s) in file %s" %
@@ -0,0 +1,160 @@
+"""
+Signal checks of each channel: clipping, DC offset, leading and trailing
+silence and dead channels.
+
+Every check is made in the same streaming pass over the `data` chunk, with
+vectorized reductions over each block of frames, so a polyphonic file is
+read only once however many checks and channels there are. This requires
+NumPy, installed with ``wavinfo[numpy]``.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional
+
+from .recording_check import RunTracker, SampleRun
+from .sample_decoder import np, require_numpy
+
+if TYPE_CHECKING:
+    from .wave_reader import WavInfoReader
+
+
+class ChannelCheck(NamedTuple):
+    """
+    The signal checks of one channel. Levels are relative to full scale.
+    """
+
+    #: The highest absolute sample.
+    peak: float
+
+    #: The RMS level.
+    rms: float
+
+    #: The mean of the samples.
+    dc_offset: float
+
+    #: The number of samples at or beyond the clipping level.
+    clipped_samples: int
+
+    #: The runs of consecutive clipped samples at least as long as the
+    #: minimum.
+    clipped_runs: List[SampleRun]
+
+    #: The number of frames before the first sample louder than the silence
+    #: level.
+    leading_silence: int
+
+    #: The number of frames after the last sample louder than the silence
+    #: level.
+    trailing_silence: int
+
+    #: `True` if no sample is louder than the silence level.
+    dead: bool
+
+
+def check_channels(reader: 'WavInfoReader', silence_level: float = -60.0,
+                   clip_level: Optional[float] = None,
+                   min_clipped_run: int = 3,
+                   block_frames: int = 1 << 16) -> List[ChannelCheck]:
+    """
+    Check each channel of a file for clipping, DC offset, silence and
+    whether it is dead.
+
+    :param reader: The reader of the file.
+    :param silence_level: The level at or below which a sample is silent, in
+        dBFS.
+    :param clip_level: The absolute level at or beyond which a sample is
+        clipped, relative to full scale. By default this is the largest
+        positive integer sample, or 1.0 for float samples.
+    :param min_clipped_run: The shortest run of clipped samples reported.
+    :param block_frames: The number of frames read at once.
+    :returns: the checks of each channel.
+    """
+    require_numpy()
+    fmt = reader.fmt
+    assert fmt is not None and fmt.channel_count > 0
+    if clip_level is None:
+        clip_level = _full_scale(reader)
+
+    channels = fmt.channel_count
+    silence = 10.0 ** (silence_level / 20.0)
+    clipped_runs = RunTracker(channels, max(1, min_clipped_run))
+    peak = np.zeros(channels, dtype='f4')
+    sums = np.zeros(channels)
+    squares = np.zeros(channels)
+    clipped = np.zeros(channels, dtype='i8')
+    first_loud = np.full(channels, -1, dtype='i8')
+    last_loud = np.full(channels, -1, dtype='i8')
+
+    frame_count = 0
+    for block in reader.iter_blocks(block_frames, as_float=True):
+        levels = np.abs(block)
+        np.maximum(peak, levels.max(axis=0), out=peak)
+        sums += block.sum(axis=0, dtype='f8')
+        squares += np.square(block, dtype='f8').sum(axis=0)
+
+        is_clipped = levels >= clip_level
+        clipped += is_clipped.sum(axis=0)
+        clipped_runs.feed(is_clipped, frame_count)
+
+        loud = levels > silence
+        has_loud = loud.any(axis=0)
+        first = frame_count + loud.argmax(axis=0)
+        last = frame_count + len(block) - 1 - loud[::-1].argmax(axis=0)
+        first_loud = np.where(has_loud & (first_loud < 0), first, first_loud)
+        last_loud = np.where(has_loud, last, last_loud)
+
+        frame_count += len(block)
+
+    runs, _ = clipped_runs.finish(frame_count)
+    mean_squares = squares / max(frame_count, 1)
+    return [ChannelCheck(
+                peak=float(peak[channel]),
+                rms=math.sqrt(mean_squares[channel]),
+                dc_offset=float(sums[channel] / max(frame_count, 1)),
+                clipped_samples=int(clipped[channel]),
+                clipped_runs=runs[channel],
+                leading_silence=int(first_loud[channel])
+                if last_loud[channel] >= 0 else frame_count,
+                trailing_silence=frame_count - 1 - int(last_loud[channel])
+                if last_loud[channel] >= 0 else frame_count,
+                dead=bool(last_loud[channel] < 0))
+            for channel in range(channels)]
+
+
+def check_channels_batch(paths: Iterable[str],
+                         max_workers: Optional[int] = None,
+                         **kwargs) -> Dict[str, List[ChannelCheck]]:
+    """
+    Check the channels of many files, in a pool of processes.
+
+    :param paths: The files to check.
+    :param max_workers: The number of processes, by default the number of
+        processors.
+    :param kwargs: Passed to :func:`check_channels`.
+    :returns: the checks of each channel of each file, by path.
+    """
+    paths = list(paths)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(partial(_check_file, **kwargs), paths)
+        return dict(zip(paths, results))
+
+
+def _check_file(path: str, **kwargs) -> List[ChannelCheck]:
+    from .wave_reader import WavInfoReader
+    with WavInfoReader(path) as reader:
+        return check_channels(reader, **kwargs)
+
+
+def _full_scale(reader: 'WavInfoReader') -> float:
+    """
+    The largest positive sample of the file's format, relative to full
+    scale.
+    """
+    assert reader.fmt is not None
+    sample_format = reader.fmt.sample_format
+    if sample_format is None or sample_format.encoding == 'float':
+        return 1.0
+
+    return 1.0 - 2.0 ** (1 - 8 * sample_format.sample_width)
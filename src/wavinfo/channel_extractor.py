@@ -0,0 +1,229 @@
+"""
+Splitting a polyphonic file into a mono file for each of its channels.
+
+The `data` chunk is read once, in blocks, and each block is de-interleaved
+into every output file, so all the mono files are written in the same pass.
+Samples are copied without decoding, so any PCM or float format can be
+split. This requires NumPy, installed with ``wavinfo[numpy]``.
+"""
+
+import copy
+import os
+import re
+from contextlib import ExitStack
+from struct import Struct
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from .sample_decoder import np, require_numpy
+from .wave_reader import WAVE_FORMAT_EXTENSIBLE, WAVE_FORMAT_PCM
+
+if TYPE_CHECKING:
+    from .wave_reader import WavAudioFormat, WavInfoReader
+
+#: The ways output files are named, see :func:`extract_channels`.
+NAMING_MODES = ('ixml', 'index')
+
+CHUNK_HEADER = Struct("<4sI")
+FMT_LAYOUT = Struct("<HHIIHH")
+FMT_EXTENSIBLE_LAYOUT = Struct("<HHIIHHHHI16s")
+
+#: Characters that are replaced in track names used in file names.
+UNSAFE_NAME = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+
+def extract_channels(reader: 'WavInfoReader', out_dir: str,
+                     naming: str = 'ixml', stem: Optional[str] = None,
+                     block_frames: int = 1 << 16) -> List[str]:
+    """
+    Write each channel of a file to a mono file.
+
+    The ``bext`` chunk is copied to every output. The iXML chunk is copied
+    with its ``TRACK_LIST`` reduced to the output's own track. The
+    ``WAVE_FORMAT_EXTENSIBLE`` channel mask is reduced to the output's
+    speaker position.
+
+    :param reader: The reader of the file to split.
+    :param out_dir: The directory to write the mono files to.
+    :param naming: ``'ixml'`` names each file after the iXML ``TRACK_LIST``
+        name of its channel, if it has one, and ``'index'`` names each file
+        after its channel number, counting from 1.
+    :param stem: The start of each file name, by default the name of the
+        file being split.
+    :param block_frames: The number of frames read at once.
+    :returns: the paths of the mono files, in channel order. Each is named
+        ``<stem>_<name>.wav``.
+    :raises ValueError: if the format can't be written as mono files. If
+        splitting fails no output file is written.
+    """
+    require_numpy()
+    assert naming in NAMING_MODES, f"Unknown naming {naming!r}"
+
+    fmt = reader.fmt
+    assert fmt is not None and fmt.channel_count > 0
+    sample_width = fmt.block_align // fmt.channel_count
+
+    if stem is None:
+        stem = os.path.splitext(os.path.basename(reader.path))[0] \
+            if reader._stream is None else 'audio'
+
+    labels = channel_labels(reader, naming)
+    paths = [os.path.join(out_dir, f"{stem}_{label}.wav")
+             for label in labels]
+
+    with reader._open_audio() as f:
+        bext = reader._find_chunk_data(b'bext', f, default_none=True)
+
+    headers = []
+    for channel in range(fmt.channel_count):
+        chunks = [(b'fmt ', mono_format(fmt, channel))]
+        if bext:
+            chunks.append((b'bext', bext))
+        if reader.ixml is not None:
+            chunks.append((b'iXML', mono_ixml(reader, channel)))
+
+        headers.append(chunks)
+
+    # Files are written under temporary names and only renamed once they are
+    # complete, so a failure doesn't leave partial files behind.
+    partial_paths = [path + '.partial' for path in paths]
+    try:
+        with ExitStack() as stack:
+            outputs = [stack.enter_context(open(path, 'wb'))
+                       for path in partial_paths]
+            data_starts = [_write_header(out, chunks)
+                           for out, chunks in zip(outputs, headers)]
+
+            for block in reader._iter_data(block_frames):
+                frames = np.frombuffer(block, dtype='u1') \
+                    .reshape(-1, fmt.block_align)
+                for channel, out in enumerate(outputs):
+                    start = channel * sample_width
+                    out.write(frames[:, start:start + sample_width].tobytes())
+
+            for out, data_start in zip(outputs, data_starts):
+                _finish(out, data_start)
+
+    except BaseException:
+        for path in partial_paths:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    for partial_path, path in zip(partial_paths, paths):
+        os.replace(partial_path, path)
+
+    return paths
+
+
+def channel_labels(reader: 'WavInfoReader', naming: str) -> List[str]:
+    """
+    The name of each channel in output file names.
+    """
+    assert reader.fmt is not None
+    track_names: Dict[str, str] = {}
+    if naming == 'ixml' and reader.ixml is not None and \
+            reader.ixml.parsed.find("./TRACK_LIST") is not None:
+        track_names = {str(track.interleave_index): track.name
+                       for track in reader.ixml.track_list}
+
+    labels: List[str] = []
+    for channel in range(reader.fmt.channel_count):
+        number = str(channel + 1)
+        label = UNSAFE_NAME.sub('_', track_names.get(number, '').strip())
+        if not label:
+            label = number
+        elif label in labels:
+            label = f"{label}_{number}"
+
+        labels.append(label)
+
+    return labels
+
+
+def mono_format(fmt: 'WavAudioFormat', channel: int) -> bytes:
+    """
+    The ``fmt`` chunk of one channel of `fmt`.
+
+    :raises ValueError: if `fmt` is ``WAVE_FORMAT_EXTENSIBLE`` without a
+        SubFormat, so the format of its samples is unknown.
+    """
+    sample_width = fmt.block_align // fmt.channel_count
+    common = (fmt.audio_format, 1, fmt.sample_rate,
+              fmt.sample_rate * sample_width, sample_width,
+              fmt.bits_per_sample)
+
+    if fmt.audio_format == WAVE_FORMAT_EXTENSIBLE:
+        if fmt.sub_format is None:
+            raise ValueError("WAVE_FORMAT_EXTENSIBLE format has no SubFormat")
+
+        speakers = [1 << bit for bit in range(32)
+                    if (fmt.channel_mask or 0) >> bit & 1]
+        channel_mask = speakers[channel] if channel < len(speakers) else 0
+        return FMT_EXTENSIBLE_LAYOUT.pack(
+            *common, 22, fmt.valid_bits_per_sample or fmt.bits_per_sample,
+            channel_mask, fmt.sub_format.bytes_le)
+
+    elif fmt.audio_format == WAVE_FORMAT_PCM:
+        return FMT_LAYOUT.pack(*common)
+
+    else:
+        return FMT_LAYOUT.pack(*common) + b'\0\0'
+
+
+def mono_ixml(reader: 'WavInfoReader', channel: int) -> bytes:
+    """
+    The iXML of `reader` with only the ``TRACK`` of one channel.
+    """
+    from .xml_backend import tostring
+
+    assert reader.ixml is not None
+    tree = copy.deepcopy(reader.ixml.parsed)
+    track_list = tree.getroot().find("./TRACK_LIST")
+    if track_list is not None:
+        for track in track_list.findall("./TRACK"):
+            if track.findtext("INTERLEAVE_INDEX", '') == str(channel + 1):
+                index = track.find("INTERLEAVE_INDEX")
+                index.text = '1'
+            else:
+                track_list.remove(track)
+
+        track_count = track_list.find("TRACK_COUNT")
+        if track_count is not None:
+            track_count.text = str(len(track_list.findall("./TRACK")))
+
+    return tostring(tree).encode('utf-8')
+
+
+def _write_header(out, chunks) -> int:
+    """
+    Write the ``RIFF`` header, `chunks` and the ``data`` chunk header.
+
+    :returns: the position of the ``data`` chunk header.
+    """
+    out.write(CHUNK_HEADER.pack(b'RIFF', 0) + b'WAVE')
+    for ident, data in chunks:
+        out.write(CHUNK_HEADER.pack(ident, len(data)) + data)
+        if len(data) % 2:
+            out.write(b'\0')
+
+    data_start = out.tell()
+    out.write(CHUNK_HEADER.pack(b'data', 0))
+    return data_start
+
+
+def _finish(out, data_start: int):
+    """
+    Pad the ``data`` chunk and write the final chunk sizes.
+    """
+    data_length = out.tell() - data_start - CHUNK_HEADER.size
+    if data_length % 2:
+        out.write(b'\0')
+
+    riff_length = out.tell() - CHUNK_HEADER.size
+    if riff_length > 0xFFFFFFFF:
+        raise ValueError("Channel too long for a WAVE file")
+
+    out.seek(data_start)
+    out.write(CHUNK_HEADER.pack(b'data', data_length))
+    out.seek(0)
+    out.write(CHUNK_HEADER.pack(b'RIFF', riff_length))
@@ -0,0 +1,94 @@
+"""
+Finding files with identical audio across a library.
+
+Copies of a recording are often re-stamped with new Broadcast-WAV or iXML
+metadata while their audio is untouched. :func:`find_duplicates` groups
+files whose `data` chunk payloads are identical, whatever their metadata.
+
+Files are first put in buckets by their format and `data` chunk length, read
+from their headers, and only files that share a bucket with another file are
+hashed, in a pool of processes.
+"""
+
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .wave_reader import CHUNK_SCOPES, WavAudioFormat, WavInfoReader
+
+#: Size limits that skip every metadata chunk but ``fmt`` and ``fact``, so
+#: only the headers of files are read when putting them in buckets.
+HEADER_SIZE_LIMITS: Dict[str, Optional[int]] = {
+    scope: 0 for scope in set(CHUNK_SCOPES.values()) - {'fmt', 'data'}}
+
+
+class DuplicateGroup(NamedTuple):
+    """
+    Files with identical audio.
+    """
+
+    #: The digest of the `data` chunk payload shared by the files, from
+    #: :meth:`WavInfoReader.audio_digest()
+    #: <wavinfo.wave_reader.WavInfoReader.audio_digest>`.
+    digest: str
+
+    #: The format of the files.
+    fmt: WavAudioFormat
+
+    #: The length of the `data` chunk payload of the files, in bytes.
+    byte_count: int
+
+    #: The paths of the files, in the order they were given.
+    paths: List[str]
+
+
+def find_duplicates(paths: Iterable[str], algo: str = 'blake2b',
+                    max_workers: Optional[int] = None) -> List[DuplicateGroup]:
+    """
+    Find the files among `paths` with identical audio.
+
+    :param paths: The files to compare.
+    :param algo: The name of the :mod:`hashlib` algorithm to hash audio with.
+    :param max_workers: The number of processes hashing files, by default the
+        number of processors.
+    :returns: a group for each set of two or more files with the same format
+        and audio, in the order of their first files.
+    """
+    paths = list(paths)
+    buckets: Dict[Tuple[WavAudioFormat, int], List[str]] = defaultdict(list)
+    for path in paths:
+        with WavInfoReader(path, size_limits=HEADER_SIZE_LIMITS,
+                           oversize='skip') as reader:
+            assert reader.fmt is not None and reader.data is not None
+            buckets[(reader.fmt, reader.data.byte_count)].append(path)
+
+    candidates = [path for bucket in buckets.values() if len(bucket) > 1
+                  for path in bucket]
+    if not candidates:
+        return []
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        digests = dict(zip(candidates,
+                           executor.map(partial(_digest_of_file, algo=algo),
+                                        candidates)))
+
+    groups: List[DuplicateGroup] = []
+    for (fmt, byte_count), bucket in buckets.items():
+        by_digest: Dict[str, List[str]] = defaultdict(list)
+        for path in bucket:
+            if path in digests:
+                by_digest[digests[path]].append(path)
+
+        groups.extend(DuplicateGroup(digest, fmt, byte_count, members)
+                      for digest, members in by_digest.items()
+                      if len(members) > 1)
+
+    order = {path: index for index, path in enumerate(paths)}
+    return sorted(groups, key=lambda group: order[group.paths[0]])
+
+
+def _digest_of_file(path: str, algo: str) -> str:
+    with WavInfoReader(path, size_limits=HEADER_SIZE_LIMITS,
+                       oversize='skip') as reader:
+        return reader.audio_digest(algo=algo)
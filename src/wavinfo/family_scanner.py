@@ -0,0 +1,186 @@
+"""
+Split-mono file family aggregation.
+
+Recorders that write split-mono files give every file of a take nearly the
+same iXML and Broadcast-WAV metadata, with the iXML ``FILE_SET/FAMILY_UID``
+in common. :func:`scan_families` reads a collection of files and returns one
+:class:`WavFileFamily` per family, holding the metadata of its first member
+once, along with each member's differences from it.
+"""
+
+import sys
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .wave_reader import WavInfoReader
+
+#: The scopes compared between members of a family.
+FAMILY_SCOPES = ('fmt', 'data', 'bext', 'ixml', 'info')
+
+#: Broadcast-WAV text fields that are interned when scanning families.
+INTERNED_BEXT_FIELDS = ('description', 'originator', 'originator_ref',
+                        'originator_date', 'originator_time',
+                        'coding_history')
+
+#: The number of distinct iXML documents kept parsed while scanning. The
+#: members of a family are usually read together, so only the most recent
+#: few are worth keeping.
+IXML_CACHE_SIZE = 8
+
+
+class WavFileFamily(NamedTuple):
+    """
+    A file family and the metadata of its members.
+    """
+
+    #: iXML ``FAMILY_UID``, or `None` for a file that has none and is
+    #: therefore in a family by itself.
+    family_uid: Optional[str]
+
+    #: iXML ``FAMILY_NAME``
+    family_name: Optional[str]
+
+    #: The metadata of the first member of the family, a dictionary of
+    #: *scope* to a dictionary of *key* and *value*, as from
+    #: :meth:`WavInfoReader.walk()<wavinfo.wave_reader.WavInfoReader.walk>`,
+    #: or to `None` if the scope is not present.
+    common: Dict[str, Optional[Dict[str, Any]]]
+
+    #: For each member path, the *scope*, *key* and *value* of every metadatum
+    #: that differs from :attr:`common`. A scope that is missing from the
+    #: member but present in :attr:`common` has the value `None`.
+    deltas: Dict[str, Dict[str, Optional[Dict[str, Any]]]]
+
+
+class _IXMLCache:
+    """
+    The most recently read iXML documents, parsed and as dictionaries, by
+    the digest of their payloads.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.entries: OrderedDict[bytes, Tuple[Any, Dict[str, Any]]] = \
+            OrderedDict()
+
+    def get(self, ixml_data: bytes) -> Tuple[Any, Dict[str, Any]]:
+        """
+        The parsed document of `ixml_data` and its dictionary, parsing it
+        if it isn't cached.
+        """
+        digest = blake2b(ixml_data).digest()
+        if digest in self.entries:
+            self.entries.move_to_end(digest)
+            return self.entries[digest]
+
+        from .wave_ixml_reader import WavIXMLFormat
+        ixml = WavIXMLFormat(ixml_data)
+        self.entries[digest] = (ixml, ixml.to_dict())
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+        return self.entries[digest]
+
+
+class _FamilyMemberReader(WavInfoReader):
+    """
+    A :class:`WavInfoReader` that shares parsed iXML between files with
+    identical payloads and interns its Broadcast-WAV strings.
+    """
+
+    def __init__(self, path, ixml_cache: _IXMLCache, **kwargs):
+        self.ixml_cache = ixml_cache
+
+        #: The dictionary of the file's iXML, shared with other files with
+        #: the same payload.
+        self.ixml_dict: Optional[Dict[str, Any]] = None
+        super().__init__(path, **kwargs)
+
+    def _get_ixml(self, f):
+        ixml_data = self._find_chunk_data(b'iXML', f, default_none=True)
+        if not ixml_data:
+            return None
+
+        ixml, self.ixml_dict = self.ixml_cache.get(ixml_data.rstrip(b'\0'))
+        return ixml
+
+    def _get_bext(self, f, encoding):
+        bext = super()._get_bext(f, encoding)
+        if bext is not None:
+            for field in INTERNED_BEXT_FIELDS:
+                setattr(bext, field, sys.intern(getattr(bext, field)))
+
+        return bext
+
+
+def scan_families(paths: Iterable[str], **kwargs) -> List[WavFileFamily]:
+    """
+    Read a collection of files and aggregate them into file families.
+
+    Each distinct iXML payload is parsed and converted to a dictionary once
+    while files with it are read in close succession. Only the last
+    :data:`IXML_CACHE_SIZE` documents are kept parsed, so memory doesn't grow
+    with the size of the collection.
+
+    :param paths: The paths of the files to read.
+    :param kwargs: Passed to each :class:`WavInfoReader`.
+    :returns: the families, in the order their first member appears in
+        `paths`.
+    """
+    ixml_cache = _IXMLCache(IXML_CACHE_SIZE)
+    families: Dict[Any, WavFileFamily] = {}
+
+    for path in paths:
+        reader = _FamilyMemberReader(path, ixml_cache=ixml_cache, **kwargs)
+
+        metadata = {}
+        for scope in FAMILY_SCOPES:
+            attr = getattr(reader, scope)
+            if attr is None:
+                metadata[scope] = None
+            elif scope in ('fmt', 'data'):
+                metadata[scope] = attr._asdict()
+            elif scope == 'ixml':
+                metadata[scope] = reader.ixml_dict
+            else:
+                metadata[scope] = attr.to_dict()
+
+        family_uid = reader.ixml.family_uid if reader.ixml else None
+        key = family_uid if family_uid is not None else ('path', path)
+
+        family = families.get(key)
+        if family is None:
+            family = WavFileFamily(
+                family_uid=family_uid,
+                family_name=reader.ixml.family_name if reader.ixml else None,
+                common=metadata,
+                deltas={})
+            families[key] = family
+
+        family.deltas[path] = _delta(family.common, metadata)
+
+    return list(families.values())
+
+
+def _delta(common: Dict[str, Optional[Dict[str, Any]]],
+           metadata: Dict[str, Optional[Dict[str, Any]]]) \
+        -> Dict[str, Optional[Dict[str, Any]]]:
+    retval: Dict[str, Optional[Dict[str, Any]]] = {}
+    for scope, values in metadata.items():
+        common_values = common[scope]
+        if values is common_values:
+            continue
+        elif values is None:
+            retval[scope] = None
+            continue
+        elif common_values is None:
+            common_values = {}
+
+        changed = {key: value for key, value in values.items()
+                   if key not in common_values or
+                   common_values[key] != value}
+        if changed:
+            retval[scope] = changed
+
+    return retval
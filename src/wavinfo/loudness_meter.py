@@ -0,0 +1,375 @@
+"""
+EBU R128 loudness and true-peak measurement.
+
+Loudness is measured as in ITU-R BS.1770-4, with loudness range as in
+EBU Tech 3342. The `data` chunk is read once, in blocks. Each block is
+K-weighted by FFT convolution with the impulse response of the K-weighting
+filter, and reduced to the power of each 100 ms segment, which is all that
+is kept while the file is read. True peak is measured on a 4x oversampled
+signal. This requires NumPy, installed with ``wavinfo[numpy]``.
+
+The measurements can be compared with the loudness metadata declared in a
+file's Broadcast-WAV extension.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Any, Dict, Iterable, NamedTuple, Optional, Sequence
+
+from .sample_decoder import np, require_numpy
+
+if np is not None:
+    from numpy.lib.stride_tricks import sliding_window_view
+
+if TYPE_CHECKING:
+    from .wave_reader import WavAudioFormat, WavInfoReader
+
+#: The ``WAVE_FORMAT_EXTENSIBLE`` speaker positions that are weighted as
+#: surround channels: back left and right, and side left and right.
+SURROUND_SPEAKERS = 0x10 | 0x20 | 0x200 | 0x400
+
+#: The ``WAVE_FORMAT_EXTENSIBLE`` speaker position of the LFE channel, which
+#: is not measured.
+LFE_SPEAKER = 0x8
+
+#: The number of 100 ms segments in a momentary and a short-term window.
+MOMENTARY_SEGMENTS = 4
+SHORTTERM_SEGMENTS = 30
+
+#: Blocks and windows quieter than this are not counted, in LUFS.
+ABSOLUTE_GATE = -70.0
+
+#: The oversampling factor for measuring true peak.
+OVERSAMPLING = 4
+
+#: The bext loudness value of a field that is not set.
+BEXT_UNSET = 327.67
+
+
+class Loudness(NamedTuple):
+    """
+    EBU R128 loudness measurements. Each field is named like the
+    corresponding :class:`WavBextReader<wavinfo.wave_bext_reader.WavBextReader>`
+    attribute. Levels are ``-inf`` for silence.
+    """
+
+    #: Integrated loudness, in LUFS.
+    loudness_value: Optional[float]
+
+    #: Loudness range, in LU.
+    loudness_range: Optional[float]
+
+    #: True peak level, in dBTP.
+    max_true_peak: Optional[float]
+
+    #: Maximum momentary loudness, in LUFS.
+    max_momentary_loudness: Optional[float]
+
+    #: Maximum short-term loudness, in LUFS.
+    max_shortterm_loudness: Optional[float]
+
+
+class LoudnessReport(NamedTuple):
+    """
+    Measured loudness, and the loudness declared in the file's metadata.
+    """
+
+    #: The loudness measured from the audio.
+    measured: Loudness
+
+    #: The loudness declared in the file's Broadcast-WAV extension, or
+    #: `None` if it has none. Fields that are not set are `None`.
+    declared: Optional[Loudness]
+
+    def differences(self) -> Dict[str, Optional[float]]:
+        """
+        The measured less the declared value of each field, or `None` where
+        nothing is declared.
+        """
+        declared = self.declared or Loudness(None, None, None, None, None)
+        return {field: measured - value
+                if measured is not None and value is not None else None
+                for field, measured, value
+                in zip(Loudness._fields, self.measured, declared)}
+
+
+def measure_loudness(reader: 'WavInfoReader',
+                     block_frames: int = 1 << 17) -> LoudnessReport:
+    """
+    Measure the loudness of a file and compare it with its metadata.
+
+    :param reader: The reader of the file.
+    :param block_frames: About the number of frames read at once. This is
+        rounded to a whole number of 100 ms segments.
+    """
+    require_numpy()
+    fmt = reader.fmt
+    assert fmt is not None and fmt.channel_count > 0
+
+    segment = max(1, round(fmt.sample_rate / 10))
+    block_frames = max(1, block_frames // segment) * segment
+    weights = channel_weights(fmt)
+    k_filter = _StreamingFilter(k_weighting_response(fmt.sample_rate),
+                                fmt.channel_count)
+    oversampler = _TruePeak(OVERSAMPLING if fmt.sample_rate < 96000
+                            else OVERSAMPLING // 2, fmt.channel_count)
+
+    powers = []
+    for block in reader.iter_blocks(block_frames, as_float=True):
+        block = block.astype('f8')
+        oversampler.feed(block)
+
+        weighted = k_filter.feed(block)
+        whole = len(weighted) // segment * segment
+        squares = np.square(weighted[:whole]) \
+            .reshape(-1, segment, fmt.channel_count).mean(axis=1)
+        powers.append(squares @ weights)
+
+    oversampler.finish()
+
+    power = np.concatenate(powers) if powers else np.zeros(0)
+    momentary = _window_powers(power, MOMENTARY_SEGMENTS)
+    shortterm = _window_powers(power, SHORTTERM_SEGMENTS)
+
+    measured = Loudness(
+        loudness_value=_gated_loudness(momentary, relative_gate=-10.0),
+        loudness_range=_loudness_range(shortterm),
+        max_true_peak=_decibels(oversampler.peak),
+        max_momentary_loudness=_loudness(momentary.max())
+        if len(momentary) else -math.inf,
+        max_shortterm_loudness=_loudness(shortterm.max())
+        if len(shortterm) else -math.inf)
+
+    return LoudnessReport(measured=measured, declared=declared_loudness(reader))
+
+
+def measure_loudness_batch(paths: Iterable[str],
+                           max_workers: Optional[int] = None,
+                           **kwargs) -> Dict[str, LoudnessReport]:
+    """
+    Measure the loudness of many files, in a pool of processes.
+
+    :param paths: The files to read.
+    :param max_workers: The number of processes, by default the number of
+        processors.
+    :param kwargs: Passed to :func:`measure_loudness`.
+    :returns: the report of each file, by path.
+    """
+    paths = list(paths)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(partial(_loudness_of_file, **kwargs), paths)
+        return dict(zip(paths, results))
+
+
+def declared_loudness(reader: 'WavInfoReader') -> Optional[Loudness]:
+    """
+    The loudness declared in a file's Broadcast-WAV extension, or `None` if
+    it has no extension or none of its loudness fields are set.
+    """
+    bext = reader.bext
+    if bext is None or bext.version < 2:
+        return None
+
+    declared = Loudness(*(None if value == BEXT_UNSET else value
+                          for value in (getattr(bext, field)
+                                        for field in Loudness._fields)))
+    if all(value is None for value in declared):
+        return None
+
+    return declared
+
+
+def channel_weights(fmt: 'WavAudioFormat') -> Any:
+    """
+    The BS.1770 weight of each channel: 1.41 for surround channels, 0 for
+    the LFE and 1.0 for the rest. Speakers are taken from the channel mask,
+    or assumed to be L, R, C, LFE, Ls, Rs for a six-channel file without
+    one.
+    """
+    speakers: Sequence[int] = \
+        [1 << bit for bit in range(32) if (fmt.channel_mask or 0) >> bit & 1]
+    if not speakers and fmt.channel_count == 6:
+        speakers = [0x1, 0x2, 0x4, 0x8, 0x10, 0x20]
+
+    weights = np.ones(fmt.channel_count)
+    for channel, speaker in enumerate(speakers[:fmt.channel_count]):
+        if speaker & SURROUND_SPEAKERS:
+            weights[channel] = 1.41
+        elif speaker & LFE_SPEAKER:
+            weights[channel] = 0.0
+
+    return weights
+
+
+@lru_cache(maxsize=8)
+def k_weighting_response(sample_rate: int) -> Any:
+    """
+    The impulse response of the BS.1770 K-weighting filter, the shelving
+    pre-filter followed by the RLB high-pass, until it has decayed far below
+    the precision of the samples.
+    """
+    k = math.tan(math.pi * 1681.974450955533 / sample_rate)
+    q = 0.7071752369554196
+    vh = 10.0 ** (3.999843853973347 / 20.0)
+    vb = vh ** 0.4996667741545416
+    a0 = 1.0 + k / q + k * k
+    shelf = ((vh + vb * k / q + k * k) / a0,
+             2.0 * (k * k - vh) / a0,
+             (vh - vb * k / q + k * k) / a0,
+             2.0 * (k * k - 1.0) / a0,
+             (1.0 - k / q + k * k) / a0)
+
+    k = math.tan(math.pi * 38.13547087602444 / sample_rate)
+    q = 0.5003270373238773
+    a0 = 1.0 + k / q + k * k
+    high_pass = (1.0, -2.0, 1.0,
+                 2.0 * (k * k - 1.0) / a0,
+                 (1.0 - k / q + k * k) / a0)
+
+    length = 1 << math.ceil(math.log2(sample_rate / 8))
+    response = [1.0] + [0.0] * (length - 1)
+    for b0, b1, b2, a1, a2 in (shelf, high_pass):
+        x1 = x2 = y1 = y2 = 0.0
+        for n, x in enumerate(response):
+            y = b0 * x + b1 * x1 + b2 * x2 - a1 * y1 - a2 * y2
+            x2, x1, y2, y1 = x1, x, y1, y
+            response[n] = y
+
+    return np.array(response)
+
+
+class _StreamingFilter:
+    """
+    FIR filtering of consecutive blocks by FFT convolution, keeping the end
+    of each block to filter the start of the next.
+    """
+
+    def __init__(self, response, channel_count: int):
+        self.response = response
+        self.history = np.zeros((len(response) - 1, channel_count))
+        self.spectra: Dict[int, Any] = {}
+
+    def feed(self, block):
+        extended = np.concatenate((self.history, block))
+        size = _fft_size(len(extended))
+        if size not in self.spectra:
+            self.spectra[size] = np.fft.rfft(self.response, size)[:, None]
+
+        filtered = np.fft.irfft(np.fft.rfft(extended, size, axis=0) *
+                                self.spectra[size], size, axis=0)
+        self.history = extended[len(extended) - len(self.history):]
+        return filtered[len(self.history):len(extended)]
+
+
+class _TruePeak:
+    """
+    The highest absolute sample of consecutive blocks after oversampling by
+    a polyphase windowed-sinc interpolator, as in ITU-R BS.1770-4 Annex 2.
+
+    The kernel has an odd length and is centred on an input sample, so the
+    first phase passes the input through unchanged and the true peak is never
+    below the sample peak.
+    """
+
+    TAPS_PER_PHASE = 13
+
+    def __init__(self, factor: int, channel_count: int):
+        taps = (self.TAPS_PER_PHASE - 1) * factor + 1
+        offsets = np.arange(taps) - (taps - 1) // 2
+        kernel = np.sinc(offsets / factor) * np.kaiser(taps, 5.0)
+
+        # The zeros of the sinc are exact, so the first phase is the identity
+        kernel[offsets % factor == 0] = 0.0
+        kernel[(taps - 1) // 2] = 1.0
+
+        # Each column holds the taps of one phase, padded to the same
+        # length, last tap first, so that a window of input frames times the
+        # columns is every interpolated sample in the window's centre.
+        phases = np.concatenate((kernel, np.zeros(factor - 1))) \
+            .reshape(self.TAPS_PER_PHASE, factor)
+        self.phases = (phases / phases.sum(axis=0))[::-1]
+        self.history = np.zeros((self.TAPS_PER_PHASE - 1, channel_count))
+        self.peak = 0.0
+
+    def feed(self, block):
+        extended = np.concatenate((self.history, block))
+        if len(block):
+            windows = sliding_window_view(extended, self.TAPS_PER_PHASE,
+                                          axis=0)
+            self.peak = max(self.peak,
+                            float(np.abs(windows @ self.phases).max()))
+
+        self.history = extended[len(extended) - len(self.history):]
+
+    def finish(self):
+        """
+        Interpolate the last frames, which the filter delays by half its
+        length.
+        """
+        self.feed(np.zeros_like(self.history))
+
+
+def _loudness_of_file(path: str, **kwargs) -> LoudnessReport:
+    from .wave_reader import WavInfoReader
+    with WavInfoReader(path) as reader:
+        return measure_loudness(reader, **kwargs)
+
+
+def _fft_size(length: int) -> int:
+    """
+    The smallest product of powers of 2, 3 and 5 of at least `length`, a
+    fast FFT size.
+    """
+    size = length
+    while True:
+        remainder = size
+        for factor in (2, 3, 5):
+            while remainder % factor == 0:
+                remainder //= factor
+        if remainder == 1:
+            return size
+        size += 1
+
+
+def _window_powers(power, segments: int):
+    """
+    The mean power of each window of `segments`, in steps of one segment.
+    """
+    if len(power) < segments:
+        return np.zeros(0)
+
+    sums = np.cumsum(np.concatenate(([0.0], power)))
+    return (sums[segments:] - sums[:-segments]) / segments
+
+
+def _loudness(power) -> float:
+    return -0.691 + 10.0 * math.log10(power) if power > 0 else -math.inf
+
+
+def _decibels(level: float) -> float:
+    return 20.0 * math.log10(level) if level > 0 else -math.inf
+
+
+def _absolute_gated(powers) -> Any:
+    threshold = 10.0 ** ((ABSOLUTE_GATE + 0.691) / 10.0)
+    return powers[powers > threshold]
+
+
+def _gated_loudness(powers, relative_gate: float) -> float:
+    gated = _absolute_gated(powers)
+    if len(gated) == 0:
+        return -math.inf
+
+    threshold = gated.mean() * 10.0 ** (relative_gate / 10.0)
+    return _loudness(gated[gated > threshold].mean())
+
+
+def _loudness_range(powers) -> float:
+    gated = _absolute_gated(powers)
+    if len(gated) == 0:
+        return 0.0
+
+    gated = gated[gated > gated.mean() * 10.0 ** (-20.0 / 10.0)]
+    low, high = np.percentile(-0.691 + 10.0 * np.log10(gated), (10, 95))
+    return float(high - low)
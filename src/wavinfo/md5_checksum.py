@@ -0,0 +1,192 @@
+"""
+Verification and writing of ``MD5 `` audio checksum chunks.
+
+Some Broadcast-WAV tools store the MD5 digest of the `data` chunk payload in
+an ``MD5 `` chunk, so a file's audio can be checked for fixity. The audio is
+hashed in one streaming pass of large reads. Many files can be verified in a
+pool of processes, and checksums can be written to files that lack them.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from struct import Struct
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from .riff_parser import READ_BLOCK_SIZE, ChunkDescriptor, chunk_ends
+from .wave_reader import WavInfoReader
+
+CHUNK_HEADER = Struct("<4sI")
+
+#: Chunks that only pad a file, whose space a checksum can be written into.
+FILLER_CHUNKS = (b'JUNK', b'junk', b'PAD ', b'FLLR')
+
+#: The default number of bytes read and hashed at once.
+DEFAULT_READ_SIZE = 8 * READ_BLOCK_SIZE
+
+#: The length of an ``MD5 `` chunk, with its header.
+MD5_CHUNK_SIZE = CHUNK_HEADER.size + 16
+
+#: The position of the data of the first chunk after the ``RIFF`` header.
+FIRST_CHUNK_START = 20
+
+
+class Md5Verification(NamedTuple):
+    """
+    The result of checking a file's audio against its ``MD5 `` chunk.
+    """
+
+    #: The digest stored in the file's ``MD5 `` chunk, as a hexadecimal
+    #: string, or `None` if it has none.
+    stored: Optional[str]
+
+    #: The MD5 digest of the file's `data` chunk payload, as a hexadecimal
+    #: string.
+    computed: str
+
+    #: `True` if a missing ``MD5 `` chunk was written to the file.
+    written: bool = False
+
+    @property
+    def valid(self) -> Optional[bool]:
+        """
+        `True` if the stored digest matches the audio, `False` if it does not
+        and `None` if the file has no stored digest.
+        """
+        if self.stored is None:
+            return None
+
+        return self.stored == self.computed
+
+
+def verify_md5(reader: WavInfoReader,
+               read_size: int = DEFAULT_READ_SIZE) -> Md5Verification:
+    """
+    Check a file's audio against its ``MD5 `` chunk.
+
+    :param reader: The reader of the file.
+    :param read_size: The number of bytes read and hashed at once.
+    """
+    return Md5Verification(
+        stored=reader.md5.hexdigest if reader.md5 is not None else None,
+        computed=reader.audio_digest('md5', read_size=read_size))
+
+
+def verify_md5_batch(paths: Iterable[str], max_workers: Optional[int] = None,
+                     read_size: int = DEFAULT_READ_SIZE,
+                     write_missing: bool = False) \
+        -> Dict[str, Md5Verification]:
+    """
+    Check the audio of many files against their ``MD5 `` chunks, in a pool
+    of processes.
+
+    :param paths: The files to check.
+    :param max_workers: The number of processes, by default the number of
+        processors.
+    :param read_size: The number of bytes read and hashed at once.
+    :param write_missing: Write an ``MD5 `` chunk to each file that has none,
+        as with :func:`write_md5`.
+    :returns: the result of each file, by path.
+    """
+    paths = list(paths)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(partial(_verify_file, read_size=read_size,
+                                       write_missing=write_missing), paths)
+        return dict(zip(paths, results))
+
+
+def write_md5(path: str, read_size: int = DEFAULT_READ_SIZE) -> bool:
+    """
+    Write the checksum of a file's audio to an ``MD5 `` chunk, if it has
+    none, in place.
+
+    The chunk is written over the start of the first ``JUNK`` or other
+    filler chunk with room for it, leaving the rest of the filler as a
+    smaller chunk of the same kind. If there is none, the chunk is appended
+    to the end of the file.
+
+    :param path: The file to write to.
+    :param read_size: The number of bytes read and hashed at once.
+    :returns: `True` if a chunk was written, `False` if the file already had
+        one.
+    :raises ValueError: if there is no filler space and the chunk cannot be
+        appended, because the file is RF64 or does not end where its last
+        chunk does.
+    """
+    with WavInfoReader(path) as reader:
+        if reader.md5 is not None:
+            return False
+
+        _insert_md5(reader,
+                    bytes.fromhex(reader.audio_digest('md5', read_size)))
+        return True
+
+
+def _verify_file(path: str, read_size: int,
+                 write_missing: bool) -> Md5Verification:
+    with WavInfoReader(path) as reader:
+        verification = verify_md5(reader, read_size=read_size)
+        if write_missing and verification.stored is None:
+            _insert_md5(reader, bytes.fromhex(verification.computed))
+            verification = verification._replace(written=True)
+
+    return verification
+
+
+def _filler_space(reader: WavInfoReader) -> Optional[ChunkDescriptor]:
+    """
+    The first filler chunk that an ``MD5 `` chunk fits in, either exactly or
+    leaving room for the header of a smaller filler chunk. A filler at the
+    start of the file is kept, as it is reserved for a ``ds64`` chunk should
+    the file become RF64.
+    """
+    for chunk in reader.main_list:
+        if type(chunk) is ChunkDescriptor and chunk.ident in FILLER_CHUNKS \
+                and chunk.start > FIRST_CHUNK_START \
+                and (chunk.length == MD5_CHUNK_SIZE - CHUNK_HEADER.size or
+                     chunk.length >= MD5_CHUNK_SIZE):
+            return chunk
+
+    return None
+
+
+def _insert_md5(reader: WavInfoReader, digest: bytes):
+    md5_chunk = CHUNK_HEADER.pack(b'MD5 ', len(digest)) + digest
+    filler = _filler_space(reader)
+
+    with open(reader.path, 'r+b') as f:
+        if filler is not None:
+            f.seek(filler.start - CHUNK_HEADER.size)
+            f.write(md5_chunk)
+
+            # The remaining filler keeps the parity of its length, and so
+            # its pad byte.
+            remainder = filler.length + CHUNK_HEADER.size - MD5_CHUNK_SIZE
+            if remainder > 0:
+                f.write(CHUNK_HEADER.pack(filler.ident,
+                                          remainder - CHUNK_HEADER.size))
+            return
+
+        form, _ = CHUNK_HEADER.unpack(f.read(CHUNK_HEADER.size))
+        if form != b'RIFF':
+            raise ValueError(f"Cannot append a chunk to a {form!r} file")
+
+        # Some writers get the RIFF length wrong, so the end of the last
+        # chunk is trusted over it.
+        chunks_end = max(chunk_ends(reader.main_list))
+        file_end = f.seek(0, os.SEEK_END)
+        if file_end not in (chunks_end, chunks_end + chunks_end % 2):
+            raise ValueError(f"File ends at {file_end}, not at the end of "
+                             f"its last chunk at {chunks_end}")
+
+        riff_length = file_end + file_end % 2 + len(md5_chunk) - \
+            CHUNK_HEADER.size
+        if riff_length > 0xFFFFFFFF:
+            raise ValueError("File too long to append a chunk to")
+
+        if file_end % 2:
+            f.write(b'\0')
+
+        f.write(md5_chunk)
+        f.seek(0)
+        f.write(CHUNK_HEADER.pack(b'RIFF', riff_length))
@@ -0,0 +1,279 @@
+"""
+Detection of recording failures: truncated `data` chunks, sparse holes and
+runs of zero samples.
+
+A recorder that loses power can leave a file whose `data` chunk length
+disagrees with the size of the file, or whose audio ends in zero-filled
+blocks. :func:`check_recording` compares the `data` chunk with the file,
+finds sparse regions of the file with ``SEEK_HOLE`` and ``SEEK_DATA``
+without reading them, and scans the rest of the audio for runs of zero
+samples in each channel. Samples are compared as raw bytes, so any PCM or
+float format can be scanned. This requires NumPy, installed with
+``wavinfo[numpy]``.
+"""
+
+import errno
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .riff_parser import READ_BLOCK_SIZE, chunk_ends
+from .sample_decoder import np, require_numpy
+
+if TYPE_CHECKING:
+    from .wave_reader import WavInfoReader
+
+
+class SampleRun(NamedTuple):
+    """
+    A run of frames, such as frames whose samples are all zero.
+    """
+
+    #: The first frame of the run.
+    start: int
+
+    #: The frame after the last frame of the run.
+    stop: int
+
+
+class RecordingCheck(NamedTuple):
+    """
+    The recording failures found in a file.
+    """
+
+    #: The size of the file in bytes.
+    file_size: int
+
+    #: The length of the `data` chunk in bytes, as recorded in its header.
+    byte_count: int
+
+    #: The number of bytes of the `data` chunk that are past the end of the
+    #: file.
+    missing_bytes: int
+
+    #: The number of bytes of the file after the end of its last chunk.
+    extra_bytes: int
+
+    #: The frames of the `data` chunk in sparse holes of the file, which
+    #: read as zeros but were never written.
+    holes: List[SampleRun]
+
+    #: For each channel, the runs of zero samples at least as long as the
+    #: minimum, including holes.
+    zero_runs: List[List[SampleRun]]
+
+    #: For each channel, the number of zero samples at the end of the audio.
+    zero_tail: List[int]
+
+    @property
+    def truncated(self) -> bool:
+        """
+        `True` if the file ends before its `data` chunk does.
+        """
+        return self.missing_bytes > 0
+
+
+def check_recording(reader: 'WavInfoReader', min_zero_seconds: float = 0.1,
+                    read_size: int = 8 * READ_BLOCK_SIZE) -> RecordingCheck:
+    """
+    Check a file for a truncated `data` chunk, holes and runs of zeros.
+
+    :param reader: The reader of the file.
+    :param min_zero_seconds: The shortest run of zero samples reported.
+    :param read_size: About the number of bytes read at once.
+    """
+    require_numpy()
+    fmt, data = reader.fmt, reader.data
+    assert fmt is not None and data is not None and fmt.channel_count > 0
+    block_align = fmt.block_align
+    sample_width = block_align // fmt.channel_count
+    data_start = reader._data_chunk().start
+
+    with reader._open_audio() as f:
+        file_size = f.seek(0, os.SEEK_END)
+        data_end = min(data_start + data.byte_count, file_size)
+        # The holes of a stream may not be those of the audio, if it is
+        # compressed
+        holes = _find_holes(f, data_start, data_end) \
+            if reader._stream is None else []
+
+    frame_count = max(0, data_end - data_start) // block_align
+    runs = RunTracker(fmt.channel_count,
+                     max(1, round(min_zero_seconds * fmt.sample_rate)))
+
+    # Frames wholly in a hole are zero without being read
+    hole_frames = [SampleRun(-(-start // block_align), stop // block_align)
+                   for start, stop in holes]
+    hole_frames = [hole for hole in hole_frames if hole.stop > hole.start]
+
+    position = 0
+    for hole in hole_frames + [SampleRun(frame_count, frame_count)]:
+        for block in reader._iter_span(
+                position * block_align, (hole.start - position) * block_align,
+                max(1, read_size // block_align) * block_align, block_align):
+            runs.feed(_zero_samples(block, fmt.channel_count, sample_width),
+                      position)
+            position += len(block) // block_align
+
+        runs.feed_flagged(hole.start, hole.stop)
+        position = hole.stop
+
+    zero_runs, zero_tail = runs.finish(frame_count)
+    return RecordingCheck(
+        file_size=file_size,
+        byte_count=data.byte_count,
+        missing_bytes=max(0, data_start + data.byte_count - file_size),
+        extra_bytes=max(0, file_size - _padded(max(chunk_ends(
+            reader.main_list)))),
+        holes=hole_frames,
+        zero_runs=zero_runs,
+        zero_tail=zero_tail)
+
+
+def check_recording_batch(paths: Iterable[str],
+                          max_workers: Optional[int] = None,
+                          **kwargs) -> Dict[str, RecordingCheck]:
+    """
+    Check many files for recording failures, in a pool of processes.
+
+    :param paths: The files to check.
+    :param max_workers: The number of processes, by default the number of
+        processors.
+    :param kwargs: Passed to :func:`check_recording`.
+    :returns: the check of each file, by path.
+    """
+    paths = list(paths)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(partial(_check_file, **kwargs), paths)
+        return dict(zip(paths, results))
+
+
+def _check_file(path: str, **kwargs) -> RecordingCheck:
+    from .wave_reader import WavInfoReader
+    with WavInfoReader(path) as reader:
+        return check_recording(reader, **kwargs)
+
+
+def _padded(position: int) -> int:
+    return position + position % 2
+
+
+def _find_holes(f, start: int, stop: int) -> List[Tuple[int, int]]:
+    """
+    The sparse holes of the file between `start` and `stop`, as byte ranges
+    relative to `start`. Nothing is found if the file system or platform
+    can't report holes.
+    """
+    if not hasattr(os, 'SEEK_HOLE'):
+        return []
+
+    fd = f.fileno()
+    holes = []
+    position = start
+    try:
+        while position < stop:
+            hole = os.lseek(fd, position, os.SEEK_HOLE)
+            if hole >= stop:
+                break
+
+            try:
+                position = os.lseek(fd, hole, os.SEEK_DATA)
+            except OSError as e:
+                if e.errno != errno.ENXIO:
+                    raise
+
+                # There is no data after the hole
+                position = stop
+
+            holes.append((hole - start, min(position, stop) - start))
+
+    except OSError:
+        return []
+
+    return holes
+
+
+def _zero_samples(block, channel_count: int, sample_width: int):
+    """
+    Which samples of whole frames are all zero bytes, an array of ``bool`` of
+    shape (*frames*, *channels*).
+    """
+    if sample_width in (1, 2, 4, 8):
+        samples = np.frombuffer(block, dtype=f"u{sample_width}")
+        return samples.reshape(-1, channel_count) == 0
+
+    raw = np.frombuffer(block, dtype='u1') \
+        .reshape(-1, channel_count, sample_width)
+    combined = raw[..., 0].copy()
+    for byte in range(1, sample_width):
+        combined |= raw[..., byte]
+
+    return combined == 0
+
+
+class RunTracker:
+    """
+    The runs of flagged samples in each channel, such as zero or clipped
+    samples, over consecutive blocks of frames.
+    """
+
+    def __init__(self, channel_count: int, min_frames: int):
+        self.min_frames = min_frames
+        self.runs: List[List[SampleRun]] = [[] for _ in range(channel_count)]
+
+        # The first frame of the run each channel is in, or -1
+        self.open_starts = np.full(channel_count, -1, dtype='i8')
+
+    def feed(self, flags, offset: int):
+        """
+        Add the runs in a block starting at frame `offset`.
+
+        :param flags: An array of ``bool`` of shape (*frames*, *channels*),
+            `True` for each flagged sample.
+        """
+        if len(flags) == 0:
+            return
+
+        previous = (self.open_starts >= 0).astype('i1')
+        changes = np.diff(flags.astype('i1'), axis=0, prepend=previous[None])
+        for channel, channel_changes in enumerate(changes.T):
+            starts = np.flatnonzero(channel_changes == 1) + offset
+            stops = np.flatnonzero(channel_changes == -1) + offset
+            if self.open_starts[channel] >= 0:
+                starts = np.concatenate(([self.open_starts[channel]], starts))
+
+            self._add(channel, starts[:len(stops)], stops)
+            self.open_starts[channel] = starts[-1] \
+                if len(starts) > len(stops) else -1
+
+    def feed_flagged(self, start: int, stop: int):
+        """
+        Add frames from `start` to `stop` whose samples are all flagged.
+        """
+        if stop > start:
+            self.open_starts[self.open_starts < 0] = start
+
+    def finish(self, frame_count: int) -> Tuple[List[List[SampleRun]],
+                                                List[int]]:
+        """
+        Close the runs at the end of the audio.
+
+        :returns: the runs of each channel, and the number of flagged samples
+            each channel ends with.
+        """
+        tail = []
+        for channel, start in enumerate(self.open_starts.tolist()):
+            if start >= 0:
+                self._add(channel, np.array([start]), np.array([frame_count]))
+                tail.append(frame_count - start)
+            else:
+                tail.append(0)
+
+        return self.runs, tail
+
+    def _add(self, channel: int, starts, stops):
+        long = stops - starts >= self.min_frames
+        self.runs[channel].extend(
+            SampleRun(start, stop) for start, stop
+            in zip(starts[long].tolist(), stops[long].tolist()))
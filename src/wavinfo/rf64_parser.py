@@ -1,47 +1,72 @@
-import struct
+from struct import Struct
 # from collections import namedtuple
 from typing import NamedTuple, Dict
 
 from . import riff_parser
 
+#: The ``WAVE`` signature and the ``ds64`` chunk header
+DS64_HEADER = Struct("<4s4sI")
+
+#: ``ds64`` riff size, data size, sample count and table length
+DS64_LAYOUT = Struct("<QQQI")
+
+#: A ``ds64`` table entry
+CHUNKSIZE64_LAYOUT = Struct("<4sQ")
+
+#: The largest ``ds64`` chunk read, room for thousands of table entries.
+DS64_SIZE_LIMIT = 1 << 16
+
 
 class RF64Context(NamedTuple):
     sample_count: int
-    bigchunk_table: Dict[str, int]
+    bigchunk_table: Dict[bytes, int]
 
 
 def parse_rf64(stream, signature=b'RF64') -> RF64Context:
+    """
+    Read the ``ds64`` chunk of an RF64 or BW64 file.
+
+    :param stream: A stream positioned after the file's 8-byte header.
+    :param signature: The file's RIFF identifier, for the table entry of its
+        64-bit size.
+    :returns: the sample count and the 64-bit size of every chunk in the
+        ``ds64`` table. The stream is left at the end of the ``ds64`` data,
+        before any pad byte.
+    """
     start = stream.tell()
-    assert stream.read(4) == b'WAVE'
+    header = stream.read(DS64_HEADER.size)
+    if len(header) != DS64_HEADER.size:
+        raise riff_parser.WavInfoEOFError(identifier=b'ds64',
+                                          chunk_start=start)
 
-    ds64_chunk = riff_parser.parse_chunk(stream)
-    assert type(ds64_chunk) is riff_parser.ChunkDescriptor, \
-        f"Expected ds64 chunk here, found {type(ds64_chunk)}"
+    wave, ident, ds64_size = DS64_HEADER.unpack(header)
+    if wave != b'WAVE' or ident != b'ds64':
+        raise ValueError(f"Expected WAVE form and ds64 chunk here, found "
+                         f"{wave!r} and {ident!r}")
 
-    ds64_field_spec = "<QQQI"
-    ds64_fields_size = struct.calcsize(ds64_field_spec)
-    assert ds64_chunk.ident == b'ds64'
+    if ds64_size > DS64_SIZE_LIMIT:
+        raise riff_parser.WavInfoChunkSizeError(ident, ds64_size,
+                                                DS64_SIZE_LIMIT)
 
-    ds64_data = ds64_chunk.read_data(stream)
-    assert len(ds64_data) >= ds64_fields_size
+    ds64_data = riff_parser.read_span(stream, stream.tell(), ds64_size)
+    if len(ds64_data) < max(ds64_size, DS64_LAYOUT.size):
+        raise riff_parser.WavInfoEOFError(identifier=ident,
+                                          chunk_start=start + 4)
 
-    riff_size, data_size, sample_count, length_lookup_table = struct.unpack(
-        ds64_field_spec, ds64_data[0:ds64_fields_size]
-        )
+    riff_size, data_size, sample_count, length_lookup_table = \
+        DS64_LAYOUT.unpack_from(ds64_data)
 
-    bigchunk_table = {}
-    chunksize64format = "<4sL"
-    # chunksize64size = struct.calcsize(chunksize64format)
+    table_end = DS64_LAYOUT.size + \
+        length_lookup_table * CHUNKSIZE64_LAYOUT.size
+    if table_end > len(ds64_data):
+        raise ValueError(f"ds64 table of {length_lookup_table} entries "
+                         f"exceeds its chunk of {len(ds64_data)} bytes")
 
-    for _ in range(length_lookup_table):
-        bigname, bigsize = struct.unpack_from(chunksize64format,
-                                              ds64_data,
-                                              offset=ds64_fields_size)
-        bigchunk_table[bigname] = bigsize
+    bigchunk_table = dict(CHUNKSIZE64_LAYOUT.iter_unpack(
+        ds64_data[DS64_LAYOUT.size:table_end]))
 
     bigchunk_table[b'data'] = data_size
     bigchunk_table[signature] = riff_size
 
-    stream.seek(start, 0)
     return RF64Context(sample_count=sample_count,
                        bigchunk_table=bigchunk_table)
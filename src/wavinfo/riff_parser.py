@@ -1,7 +1,16 @@
 # from optparse import Option
-import struct
+from struct import Struct
 from .rf64_parser import parse_rf64, RF64Context
-from typing import NamedTuple, Union, List, Optional
+from typing import NamedTuple, Union, List, Optional, Iterator
+
+
+#: A chunk's size field
+CHUNK_SIZE = Struct('<I')
+
+#: The most read from a stream at once when reading chunk data. Chunk sizes
+#: come from the file and may be corrupt, so larger chunks are read in
+#: blocks and memory only grows with the data that is actually there.
+READ_BLOCK_SIZE = 1 << 20
 
 
 class WavInfoEOFError(EOFError):
@@ -10,6 +19,31 @@ class WavInfoEOFError(EOFError):
         self.chunk_start = chunk_start
 
 
+class WavInfoChunkSizeError(ValueError):
+    """
+    A chunk is larger than the size limit of its scope.
+    """
+
+    def __init__(self, identifier, length, limit):
+        super().__init__(f"{identifier!r} chunk of {length} bytes exceeds "
+                         f"the limit of {limit} bytes")
+        self.identifier = identifier
+        self.length = length
+        self.limit = limit
+
+
+def read_span(stream, start, length) -> bytes:
+    """
+    Read `length` bytes from `start`, or as many as the stream holds.
+
+    The span is read with one call, which file streams fill in place in a
+    buffer of the span's length, so reading it costs no more memory than
+    the span itself.
+    """
+    stream.seek(start)
+    return stream.read(length)
+
+
 class ListChunkDescriptor(NamedTuple):
     signature: bytes
     children: List[Union['ChunkDescriptor', 'ListChunkDescriptor']]
@@ -22,15 +56,34 @@ class ChunkDescriptor(NamedTuple):
     rf64_context: Optional[RF64Context]
 
     def read_data(self, from_stream) -> bytes:
-        from_stream.seek(self.start)
-        return from_stream.read(self.length)
+        return read_span(from_stream, self.start, self.length)
+
+
+def chunk_ends(chunks) -> Iterator[int]:
+    """
+    The position of the end of the data of each chunk in `chunks` and in
+    their lists, without padding.
+    """
+    for chunk in chunks:
+        if type(chunk) is ChunkDescriptor:
+            yield chunk.start + chunk.length
+        else:
+            yield from chunk_ends(chunk.children)
 
 
 def parse_list_chunk(stream, length, rf64_context=None):
     start = stream.tell()
     signature = stream.read(4)
+    return _parse_children(stream, start, length, signature, [],
+                           rf64_context)
 
-    children = []
+
+def _parse_children(stream, start, length, signature, children,
+                    rf64_context):
+    """
+    Parse the chunks of a list from the current position of the stream to
+    its end, after `children` already parsed.
+    """
     while stream.tell() - start + 8 < length:
         child_chunk = parse_chunk(stream, rf64_context=rf64_context)
         children.append(child_chunk)
@@ -40,6 +93,26 @@ def parse_list_chunk(stream, length, rf64_context=None):
     return ListChunkDescriptor(signature=signature, children=children)
 
 
+def _parse_rf64_form(stream, ident):
+    """
+    Parse an RF64 or BW64 form. Its ``ds64`` chunk is read first for the
+    64-bit sizes of the form and its chunks, and parsing continues after it.
+    """
+    start = stream.tell()
+    rf64_context = parse_rf64(stream=stream, signature=ident)
+
+    # The WAVE signature and the ds64 chunk header
+    ds64_start = start + 12
+    ds64 = ChunkDescriptor(ident=b'ds64', start=ds64_start,
+                           length=stream.tell() - ds64_start,
+                           rf64_context=rf64_context)
+    if ds64.length % 2:
+        stream.seek(1, 1)
+
+    return _parse_children(stream, start, rf64_context.bigchunk_table[ident],
+                           b'WAVE', [ds64], rf64_context)
+
+
 def parse_chunk(stream, rf64_context=None):
     header_start = stream.tell()
     ident = stream.read(4)
@@ -48,11 +121,11 @@ def parse_chunk(stream, rf64_context=None):
     if len(ident) != 4 or len(size_bytes) != 4:
         raise WavInfoEOFError(identifier=ident, chunk_start=header_start)
 
-    data_size = struct.unpack('<I', size_bytes)[0]
+    data_size = CHUNK_SIZE.unpack(size_bytes)[0]
 
     if data_size == 0xFFFFFFFF:
         if rf64_context is None and ident in {b'RF64', b'BW64'}:
-            rf64_context = parse_rf64(stream=stream, signature=ident)
+            return _parse_rf64_form(stream, ident)
 
         assert rf64_context is not None, \
             "Sentinel data size 0xFFFFFFFF found outside of RF64 context"
@@ -0,0 +1,121 @@
+"""
+Decoding of `data` chunk audio into `NumPy`_ arrays.
+
+NumPy is an optional dependency, installed with ``wavinfo[numpy]``. Only the
+audio-reading methods of
+:class:`WavInfoReader<wavinfo.wave_reader.WavInfoReader>` import this
+module, so reading metadata never loads it.
+
+.. _NumPy: https://numpy.org
+"""
+
+from typing import TYPE_CHECKING, Any, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+if TYPE_CHECKING:
+    from .wave_reader import WavAudioFormat
+
+#: A channel index, a slice of channels or a sequence of channel indexes.
+Channels = Optional[Union[int, slice, Sequence[int]]]
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("Reading audio requires NumPy, install "
+                          "'wavinfo[numpy]'")
+
+
+def decode_frames(buffer, fmt: 'WavAudioFormat', channels: Channels = None,
+                  as_float: bool = False) -> Any:
+    """
+    Decode whole frames of interleaved samples.
+
+    Integer samples of 8, 16, 32 or 64 bits and float samples are returned
+    as a view on `buffer` without copying, as long as `channels` is `None`
+    or a slice and `as_float` is `False`. 24-bit samples are unpacked into a
+    new array of ``int32``.
+
+    :param buffer: An object supporting the buffer protocol holding the
+        frames. A partial frame at the end is ignored.
+    :param fmt: The format of the samples.
+    :param channels: The channels to decode, an index, slice or sequence of
+        indexes. `None` decodes every channel.
+    :param as_float: Scale integer samples to ``float32`` in the range
+        [-1.0, 1.0).
+    :returns: an array of shape (*frames*, *channels*).
+    :raises ValueError: if the samples are compressed or companded.
+    """
+    require_numpy()
+    assert np is not None
+    sample_format = fmt.sample_format
+    if sample_format is None or sample_format.encoding in ('alaw', 'mulaw'):
+        raise ValueError(f"Cannot decode samples of format {fmt.format_tag}")
+
+    if isinstance(channels, int):
+        channels = [channels]
+
+    width = sample_format.sample_width
+    frame_count = len(memoryview(buffer)) // fmt.block_align
+
+    if sample_format.dtype is not None:
+        samples = np.ndarray(shape=(frame_count, fmt.channel_count),
+                             dtype=sample_format.dtype, buffer=buffer,
+                             strides=(fmt.block_align, width))
+        if channels is not None:
+            samples = samples[:, channels]
+
+    elif sample_format.encoding == 'int' and width == 3:
+        raw = np.ndarray(shape=(frame_count, fmt.channel_count, 3),
+                         dtype='u1', buffer=buffer,
+                         strides=(fmt.block_align, 3, 1))
+        if channels is not None:
+            raw = raw[:, channels]
+
+        samples = unpack_int24(raw)
+
+    else:
+        raise ValueError(f"Cannot decode {width}-byte "
+                         f"{sample_format.encoding} samples")
+
+    if as_float:
+        return to_float(samples, sample_format.encoding, width)
+    else:
+        return samples
+
+
+def unpack_int24(raw) -> Any:
+    """
+    Unpack 24-bit little-endian samples.
+
+    :param raw: An array of ``uint8`` with the three bytes of each sample on
+        its last axis.
+    :returns: an array of ``int32`` with the shape of `raw` less its last
+        axis.
+    """
+    assert np is not None
+    padded = np.zeros(raw.shape[:-1] + (4,), dtype='u1')
+    padded[..., 1:] = raw
+
+    # The sample is in the upper three bytes, an arithmetic shift moves it
+    # down and extends the sign.
+    return padded.view('<i4')[..., 0] >> 8
+
+
+def to_float(samples, encoding: str, sample_width: int) -> Any:
+    """
+    Scale decoded integer samples to ``float32`` in the range [-1.0, 1.0).
+    Float samples are returned unchanged.
+    """
+    if encoding == 'float':
+        return samples
+
+    scaled = samples.astype('f4')
+    if encoding == 'uint':
+        scaled -= 128.0
+
+    scaled *= 2.0 ** (1 - 8 * sample_width)
+    return scaled
@@ -2,74 +2,333 @@
 ADM Reader
 """
 
-from struct import unpack, unpack_from, calcsize
+from struct import Struct
+from array import array
 from io import BytesIO
 from collections import namedtuple
-from typing import Optional
+from typing import Optional, Dict, Tuple, Generator, NamedTuple, Iterator, \
+    Any, Callable, List, Sequence, overload
 
-from lxml import etree as ET
+from .xml_backend import ET, IterParser, parse, tostring, namespaces
 
 
 ChannelEntry = namedtuple('ChannelEntry', "track_index uid track_ref pack_ref")
 
 
+class ChannelTable(Sequence[ChannelEntry]):
+    """
+    The ``chna`` track table, decoded in bulk into columns.
+
+    Each text column is held as a single string, and :class:`ChannelEntry`
+    records are only created when an entry is accessed. The table is a
+    read-only sequence of :class:`ChannelEntry`, and compares equal to any
+    sequence of the same entries.
+    """
+
+    Header = Struct("<HH")
+    Entry = Struct("<H12s14s11sx")
+
+    UID_LENGTH = 12
+    TRACK_REF_LENGTH = 14
+    PACK_REF_LENGTH = 11
+
+    def __init__(self, chna_data: bytes):
+        _, uid_count = self.Header.unpack_from(chna_data, 0)
+
+        # uid_count is not trusted past the end of the chunk
+        body_start = self.Header.size
+        uid_count = min(uid_count,
+                        (len(chna_data) - body_start) // self.Entry.size)
+        body = chna_data[body_start:body_start + uid_count * self.Entry.size]
+
+        columns = tuple(zip(*self.Entry.iter_unpack(body))) or \
+            ((), (), (), ())
+
+        #: The zero-based track index of each entry
+        self.track_indexes = array('i', (i - 1 for i in columns[0]))
+
+        # these values are either ascii or all null
+        self._uids = b''.join(columns[1]).decode('ascii')
+        self._track_refs = b''.join(columns[2]).decode('ascii')
+        self._pack_refs = b''.join(columns[3]).decode('ascii')
+
+        # The first entry of a track is the one found, as a list search would
+        self._rows_by_track: Dict[int, int] = {}
+        for row, track_index in enumerate(self.track_indexes):
+            self._rows_by_track.setdefault(track_index, row)
+
+    def __len__(self) -> int:
+        return len(self.track_indexes)
+
+    @overload
+    def __getitem__(self, row: int) -> ChannelEntry: ...
+
+    @overload
+    def __getitem__(self, row: slice) -> List[ChannelEntry]: ...
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(len(self))[row]]
+
+        track_index = self.track_indexes[row]
+        row = row % len(self)
+        return ChannelEntry(
+            track_index,
+            self._column(self._uids, self.UID_LENGTH, row),
+            self._column(self._track_refs, self.TRACK_REF_LENGTH, row),
+            self._column(self._pack_refs, self.PACK_REF_LENGTH, row))
+
+    def __iter__(self) -> Iterator[ChannelEntry]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (str, bytes)) or \
+                not isinstance(other, Sequence):
+            return NotImplemented
+
+        return len(self) == len(other) and \
+            all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"ChannelTable({list(self)!r})"
+
+    @staticmethod
+    def _column(text: str, width: int, row: int) -> str:
+        return text[row * width:(row + 1) * width]
+
+    def find(self, track_index: int) -> Optional[ChannelEntry]:
+        """
+        Get the entry for a track.
+
+        :param track_index: index of audio track (indexed from zero)
+        :returns: the track's :class:`ChannelEntry`, or `None` if the track
+            has no entry.
+        """
+        row = self._rows_by_track.get(track_index)
+        return self[row] if row is not None else None
+
+
+#: Ways :class:`WavADMReader` can treat ``audioBlockFormat`` elements.
+BLOCK_FORMAT_MODES = ('keep', 'skip', 'summarize', 'stream')
+
+BLOCK_FORMAT_NAME = 'audioBlockFormat'
+
+
+class BlockFormatSummary(NamedTuple):
+    """
+    A summary of the ``audioBlockFormat`` elements of one
+    ``audioChannelFormat``.
+    """
+    #: Number of block formats in the channel format
+    count: int
+    #: Earliest ``rtime`` of any block, in seconds, if the blocks are timed
+    start: Optional[float]
+    #: Latest ``rtime`` + ``duration`` of any block, in seconds, if the blocks
+    #: are timed
+    end: Optional[float]
+
+
+def parse_adm_time(value: Optional[str]) -> Optional[float]:
+    """
+    Convert an ADM time string to seconds.
+
+    ADM times are either in the form ``hh:mm:ss.fffff`` or, with a fractional
+    sample count, ``hh:mm:ss.nnnnnSdddd``.
+    """
+    if value is None:
+        return None
+
+    hours, minutes, seconds = value.split(":")
+    if "S" in seconds:
+        whole, fraction = seconds.split(".")
+        numerator, denominator = fraction.split("S")
+        secs = int(whole) + int(numerator) / int(denominator)
+    else:
+        secs = float(seconds)
+
+    return int(hours) * 3600 + int(minutes) * 60 + secs
+
+
 class WavADMReader:
     """
     Reads XML data from an EBU ADM (Audio Definiton Model) WAV File.
 
     """
 
-    def __init__(self, axml_data: bytes, chna_data: bytes):
-        header_fmt = "<HH"
-        uid_fmt = "<H12s14s11sx"
+    def __init__(self, axml_data: bytes, chna_data: bytes,
+                 block_formats: str = 'keep',
+                 axml_loader: Optional[Callable[[], bytes]] = None):
+        """
+        Read ADM metadata.
+
+        :param axml_data: The bytes of the ``axml`` chunk.
+        :param chna_data: The bytes of the ``chna`` chunk.
+        :param block_formats: How to treat the time-varying
+            ``audioBlockFormat`` elements of the document, which can make up
+            nearly all of a large ``axml`` chunk. One of:
+
+            - ``'keep'``: parse the whole document into :attr:`axml`.
+            - ``'skip'``: leave block formats out of :attr:`axml`.
+            - ``'summarize'``: leave block formats out of :attr:`axml` and
+              record their count and time span in
+              :attr:`block_format_summary`.
+            - ``'stream'``: leave block formats out of :attr:`axml`, they
+              may be read incrementally with :meth:`block_formats`.
+
+            In every mode but ``'keep'`` the document is parsed
+            incrementally and each block format is discarded after it is
+            read, so memory use does not grow with the block count.
+        :param axml_loader: A function that reads the ``axml`` chunk again,
+            for :meth:`block_formats` in every mode but ``'keep'``. Without
+            one, ``'stream'`` mode holds on to `axml_data` and the other
+            modes can't read block formats.
+        """
+        if block_formats not in BLOCK_FORMAT_MODES:
+            raise ValueError(f"Unrecognized block_formats mode "
+                             f"{block_formats!r}, expected one of "
+                             f"{BLOCK_FORMAT_MODES}")
+
+        # The document is only parsed again for its block formats, which
+        # 'keep' mode holds in the tree. The data is read again for that,
+        # rather than kept for the reader's lifetime.
+        self._axml_loader: Optional[Callable[[], bytes]] = None
+        if block_formats == 'stream' and axml_loader is None:
+            self._axml_loader = lambda: axml_data
+        elif block_formats != 'keep':
+            self._axml_loader = axml_loader
+
+        #: The ``block_formats`` mode this reader was created with
+        self.block_format_mode = block_formats
+
+        #: A :class:`BlockFormatSummary` for each ``audioChannelFormatID``,
+        #: if this reader was created in ``'summarize'`` mode.
+        self.block_format_summary: Optional[Dict[str, BlockFormatSummary]] \
+            = None
+
+        if block_formats == 'keep':
+            axml = parse(BytesIO(axml_data))
+        else:
+            axml = self._parse_structure(
+                axml_data, summarize=(block_formats == 'summarize'))
+
+        #: An ElementTree of the ADM XML document, from :mod:`lxml.etree` if
+        #: it is installed, otherwise :mod:`xml.etree.ElementTree`.
+        self.axml = axml
+
+        #: Every ``chna`` entry in the file
+        self.channel_uids = ChannelTable(chna_data)
+
+    def _parse_structure(self, axml_data: bytes,
+                         summarize: bool) -> ET.ElementTree:
+        """
+        Parse the ADM document without its block formats.
+        """
+        counts: Dict[str, int] = {}
+        starts: Dict[str, float] = {}
+        ends: Dict[str, float] = {}
+
+        context = IterParser(BytesIO(axml_data), BLOCK_FORMAT_NAME)
+        for parent, elem in context:
+            if summarize:
+                cf_id = parent.get("audioChannelFormatID")
+                counts[cf_id] = counts.get(cf_id, 0) + 1
+                rtime = parse_adm_time(elem.get("rtime"))
+                if rtime is not None:
+                    duration = parse_adm_time(elem.get("duration")) or 0.
+                    starts[cf_id] = min(starts.get(cf_id, rtime), rtime)
+                    ends[cf_id] = max(ends.get(cf_id, rtime + duration),
+                                      rtime + duration)
+
+            elem.clear()
+            parent.remove(elem)
+
+        if summarize:
+            self.block_format_summary = {
+                cf_id: BlockFormatSummary(count=count,
+                                          start=starts.get(cf_id),
+                                          end=ends.get(cf_id))
+                for cf_id, count in counts.items()}
+
+        return ET.ElementTree(context.root)
+
+    def block_formats(self) -> Generator[Tuple[str, ET.Element], None, None]:
+        """
+        Iterate through every ``audioBlockFormat`` in the document.
 
-        #: An :mod:`lxml.etree` of the ADM XML document
-        self.axml = ET.parse(BytesIO(axml_data))
+        Unless this reader was created in ``'keep'`` mode, the ``axml`` data
+        is read and parsed again incrementally and each element is cleared
+        once the consumer moves on to the next one, so an element must not
+        be used after the iteration advances.
 
-        _, uid_count = unpack(header_fmt, chna_data[0:4])
+        :yields: the ``audioChannelFormatID`` of the block's channel format
+            and the ``audioBlockFormat`` element.
+        :raises ValueError: if the block formats were left out and the
+            reader has no `axml_loader` to read them again.
+        """
+        if self.block_format_mode == 'keep':
+            for parent in self.axml.iterfind(".//{*}audioChannelFormat"):
+                for elem in parent.iterfind("{*}" + BLOCK_FORMAT_NAME):
+                    yield parent.get("audioChannelFormatID"), elem
 
-        self.channel_uids = []
+            return
 
-        offset = calcsize(header_fmt)
-        for _ in range(uid_count):
+        if self._axml_loader is None:
+            raise ValueError(f"Block formats were left out in "
+                             f"{self.block_format_mode!r} mode and can't "
+                             f"be read again without an axml_loader")
 
-            track_index, uid, track_ref, pack_ref = unpack_from(uid_fmt,
-                                                                chna_data,
-                                                                offset)
+        context = IterParser(BytesIO(self._axml_loader()), BLOCK_FORMAT_NAME)
+        for parent, elem in context:
+            yield parent.get("audioChannelFormatID"), elem
+            elem.clear()
+            parent.remove(elem)
 
-            # these values are either ascii or all null
+    def xml_str(self) -> str:
+        """
+        ADM XML as a string. Block formats are omitted unless this reader
+        was created in ``'keep'`` mode.
+        """
+        return tostring(self.axml)
 
-            self.channel_uids.append(
-                ChannelEntry(track_index - 1,
-                             uid.decode('ascii'),
-                             track_ref.decode('ascii'),
-                             pack_ref.decode('ascii')
-                             )
-            )
+    def _programme_elements(self):
+        nsmap = namespaces(self.axml)
 
-            offset += calcsize(uid_fmt)
+        afext = self.axml.find(".//audioFormatExtended", namespaces=nsmap)
 
-    def xml_str(self) -> str:
-        """ADM XML as a string"""
-        return ET.tostring(self.axml).decode("utf-8")
+        program = afext.find("audioProgramme", namespaces=nsmap)
+        return nsmap, afext, program
 
     def programme(self) -> dict:
         """
         Read the ADM `audioProgramme` data structure and some of its reference
         properties.
         """
-        ret_dict = dict()
+        ret_dict = self._programme_header()
+        ret_dict['contents'] = list(self.iter_contents())
 
-        nsmap = self.axml.getroot().nsmap
+        return ret_dict
 
-        afext = self.axml.find(".//audioFormatExtended", namespaces=nsmap)
+    def _programme_header(self) -> dict:
+        ret_dict = dict()
 
-        program = afext.find("audioProgramme", namespaces=nsmap)
+        _, _, program = self._programme_elements()
         ret_dict['programme_id'] = program.get("audioProgrammeID")
         ret_dict['programme_name'] = program.get("audioProgrammeName")
         ret_dict['programme_start'] = program.get("start")
         ret_dict['programme_end'] = program.get("end")
-        ret_dict['contents'] = []
+
+        return ret_dict
+
+    def iter_contents(self) -> Generator[dict, None, None]:
+        """
+        Read the `audioContent` elements of the `audioProgramme` one at a
+        time.
+
+        :yields: a dictionary for each content, as they appear in the
+            *contents* of :meth:`programme`.
+        """
+        nsmap, afext, program = self._programme_elements()
 
         for content_ref in program.findall("audioContentIDRef",
                                            namespaces=nsmap):
@@ -98,9 +357,7 @@ class WavADMReader:
                 object_dict['track_uids'] = track_uid_list
                 content_dict['objects'].append(object_dict)
 
-            ret_dict['contents'].append(content_dict)
-
-        return ret_dict
+            yield content_dict
 
     def track_info(self, index) -> Optional[dict]:
         """
@@ -111,15 +368,14 @@ class WavADMReader:
             *object_name*, *object_id*,
             *pack_format_name*, *pack_type*, *channel_format_name*
         """
-        channel_info = next((x for x in self.channel_uids
-                             if x.track_index == index), None)
+        channel_info = self.channel_uids.find(index)
 
         if channel_info is None:
             return None
 
         ret_dict = {}
 
-        nsmap = self.axml.getroot().nsmap
+        nsmap = namespaces(self.axml)
 
         afext = self.axml.find(".//audioFormatExtended",
                                namespaces=nsmap)
@@ -157,7 +413,7 @@ class WavADMReader:
         ret_dict['pack_format_name'] = packformat_elem.get(
             "audioPackFormatName")
 
-        object_elem = afext.find("audioObject[audioPackFormatIDRef = '%s']"
+        object_elem = afext.find("audioObject[audioPackFormatIDRef='%s']"
                                  % packformat_id,
                                  namespaces=nsmap)
 
@@ -165,7 +421,7 @@ class WavADMReader:
         object_id = object_elem.get("audioObjectID")
         ret_dict['object_id'] = object_id
 
-        content_elem = afext.find("audioContent/[audioObjectIDRef = '%s']"
+        content_elem = afext.find("audioContent[audioObjectIDRef='%s']"
                                   % object_id,
                                   namespaces=nsmap)
 
@@ -174,16 +430,37 @@ class WavADMReader:
 
         return ret_dict
 
-    def to_dict(self) -> dict:  # FIXME should be "asdict"
-        """
-        Get ADM metadata as a dictionary.
+    def iter_channel_entries(self) -> Generator[dict, None, None]:
         """
+        Read each ``chna`` entry and its track information one at a time.
 
-        def make_entry(channel_uid_rec):
+        :yields: a dictionary for each entry, as they appear in the
+            *channel_entries* of :meth:`to_dict`.
+        """
+        for channel_uid_rec in self.channel_uids:
             rd = channel_uid_rec._asdict()
-            rd.update(self.track_info(channel_uid_rec.track_index))
-            return rd
+            track_info = self.track_info(channel_uid_rec.track_index)
+            if track_info is not None:
+                rd.update(track_info)
+            yield rd
 
-        return dict(channel_entries=list(map(lambda z: make_entry(z),
-                                             self.channel_uids)),
+    def iter_dict(self) -> Generator[Tuple[str, Any], None, None]:
+        """
+        Get ADM metadata incrementally.
+
+        :yields: the same keys and values as :meth:`to_dict`, except that the
+            *channel_entries* and the programme *contents* are generators
+            that read each entry only when it is requested.
+        """
+        yield 'channel_entries', self.iter_channel_entries()
+
+        programme = self._programme_header()
+        programme['contents'] = self.iter_contents()
+        yield 'programme', programme
+
+    def to_dict(self) -> dict:  # FIXME should be "asdict"
+        """
+        Get ADM metadata as a dictionary.
+        """
+        return dict(channel_entries=list(self.iter_channel_entries()),
                     programme=self.programme())
@@ -1,8 +1,13 @@
-import struct
+from struct import Struct
 # from .umid_parser import UMIDParser
 
 from typing import Optional
 
+#: The fixed-length fields of the ``bext`` chunk, the coding history
+#: follows them.
+BEXT_LAYOUT = Struct("<256s" + "32s" + "32s" + "10s" + "8s" + "QH" + "64s" +
+                     "hhhhh" + "180s")
+
 
 class WavBextReader:
     def __init__(self, bext_data, encoding):
@@ -13,17 +18,13 @@ class WavBextReader:
             the BEXT metadata scope. According to EBU Rec 3285 this shall be
             ASCII.
         """
-        packstring = "<256s" + "32s" + "32s" + "10s" + "8s" + "QH" + "64s" + \
-            "hhhhh" + "180s"
-
-        rest_starts = struct.calcsize(packstring)
-        unpacked = struct.unpack(packstring, bext_data[:rest_starts])
+        rest_starts = BEXT_LAYOUT.size
+        unpacked = BEXT_LAYOUT.unpack(bext_data[:rest_starts])
 
         def sanitize_bytes(b: bytes) -> str:
             # honestly can't remember why I'm stripping nulls this way
-            first_null = next((index for index, byte in enumerate(b)
-                               if byte == 0), None)
-            trimmed = b if first_null is None else b[:first_null]
+            first_null = b.find(b'\0')
+            trimmed = b if first_null == -1 else b[:first_null]
             decoded = trimmed.decode(encoding)
             return decoded
 
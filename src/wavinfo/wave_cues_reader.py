@@ -7,11 +7,15 @@ IBM Corporation and Microsoft Corporation
 
 https://www.aelius.com/njh/wavemetatools/doc/riffmci.pdf
 """
-from dataclasses import dataclass
-from .riff_parser import ChunkDescriptor
+from dataclasses import dataclass, field
+from .riff_parser import ChunkDescriptor, read_span
 
-from struct import unpack, calcsize
-from typing import Optional, Tuple,  NamedTuple, List, Dict, Any, Generator
+import sys
+from array import array
+from bisect import bisect_left
+from struct import Struct, unpack, pack
+from typing import Optional, Tuple,  NamedTuple, List, Dict, Any, Generator, \
+    Sequence, Iterator, Iterable, overload
 
 #: Country Codes used in the RIFF standard to resolve locale. These codes
 #: appear in CSET and LTXT metadata.
@@ -112,24 +116,117 @@ class CueEntry(NamedTuple):
     sample_offset: int
 
     Format = "<II4sIII"
+    Layout = Struct(Format)
 
     @classmethod
     def format_size(cls) -> int:
-        return calcsize(cls.Format)
+        return cls.Layout.size
 
     @classmethod
     def read(cls, data: bytes) -> 'CueEntry':
-        assert len(data) == cls.format_size(), \
-            (f"cue data size incorrect, expected {calcsize(cls.Format)} "
-             "found {len(data)}")
+        assert len(data) == cls.Layout.size, \
+            (f"cue data size incorrect, expected {cls.Layout.size} "
+             f"found {len(data)}")
 
-        parsed = unpack(cls.Format, data)
+        parsed = cls.Layout.unpack(data)
 
         return cls(name=parsed[0], position=parsed[1], chunk_id=parsed[2],
                    chunk_start=parsed[3], block_start=parsed[4],
                    sample_offset=parsed[5])
 
 
+class CueTable(Sequence[CueEntry]):
+    """
+    The ``cue`` table, decoded in bulk into columns.
+
+    Every field of a cue entry is a 32-bit little-endian word, so the whole
+    table is read into one :class:`array.array` and each column is a strided
+    slice of it. :class:`CueEntry` records are only created when an entry is
+    accessed. The table is a read-only sequence of :class:`CueEntry`, and
+    compares equal to any sequence of the same entries.
+    """
+
+    FIELD_COUNT = 6
+
+    #: The entry count that precedes the table
+    Count = Struct("<I")
+
+    def __init__(self, words: array):
+        """
+        :param words: the cue table's fields, six words per entry.
+        """
+        self._words = words
+
+        #: The ``name`` of each entry
+        self.names = words[0::self.FIELD_COUNT]
+
+        #: The ``position`` of each entry
+        self.positions = words[1::self.FIELD_COUNT]
+
+        #: The ``sample_offset`` of each entry
+        self.sample_offsets = words[5::self.FIELD_COUNT]
+
+    @classmethod
+    def read(cls, data: bytes, count: int) -> 'CueTable':
+        """
+        Decode `count` entries from the body of a ``cue`` chunk.
+        """
+        words = array('I')
+        words.frombytes(data[0:count * CueEntry.format_size()])
+        if sys.byteorder == 'big':
+            words.byteswap()
+
+        return cls(words)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[CueEntry]) -> 'CueTable':
+        words = array('I')
+        for entry in entries:
+            words.extend((entry.name, entry.position,
+                          unpack("<I", entry.chunk_id)[0], entry.chunk_start,
+                          entry.block_start, entry.sample_offset))
+
+        return cls(words)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @overload
+    def __getitem__(self, row: int) -> CueEntry: ...
+
+    @overload
+    def __getitem__(self, row: slice) -> List[CueEntry]: ...
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(len(self))[row]]
+
+        start = range(len(self))[row] * self.FIELD_COUNT
+        fields = self._words[start:start + self.FIELD_COUNT]
+        return CueEntry(name=fields[0], position=fields[1],
+                        chunk_id=pack("<I", fields[2]),
+                        chunk_start=fields[3], block_start=fields[4],
+                        sample_offset=fields[5])
+
+    def __iter__(self) -> Iterator[CueEntry]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CueTable):
+            return self._words == other._words
+
+        if isinstance(other, (str, bytes)) or \
+                not isinstance(other, Sequence):
+            return NotImplemented
+
+        return len(self) == len(other) and \
+            all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"CueTable({list(self)!r})"
+
+
 class LabelEntry(NamedTuple):
     """
     A ``labl`` structure.
@@ -137,9 +234,11 @@ class LabelEntry(NamedTuple):
     name: int
     text: str
 
+    NameLayout = Struct("<I")
+
     @classmethod
     def read(cls, data: bytes, encoding: str):
-        return cls(name=unpack("<I", data[0:4])[0],
+        return cls(name=cls.NameLayout.unpack_from(data)[0],
                    text=data[4:].decode(encoding).rstrip("\0"))
 
 
@@ -159,11 +258,12 @@ class RangeLabel(NamedTuple):
     codepage: int
     text: str
 
+    Leader = Struct("<II4sHHHH")
+
     @classmethod
     def read(cls, data: bytes, fallback_encoding: str):
-        leader_struct_fmt = "<II4sHHHH"
-        parsed = unpack(leader_struct_fmt, data[0:calcsize(leader_struct_fmt)])
-        text_data = data[calcsize(leader_struct_fmt):]
+        parsed = cls.Leader.unpack_from(data)
+        text_data = data[cls.Leader.size:]
 
         if data[6] != 0:
             fallback_encoding = f"cp{data[6]}"
@@ -177,8 +277,8 @@ class RangeLabel(NamedTuple):
 @dataclass
 class WavCuesReader:
 
-    #: Every ``cue`` entry in the file
-    cues: List[CueEntry]
+    #: Every ``cue`` entry in the file, as a :class:`CueTable`
+    cues: Sequence[CueEntry]
 
     #: Every ``labl`` in the file
     labels: List[LabelEntry]
@@ -189,6 +289,40 @@ class WavCuesReader:
     #: Every ``note`` in the file
     notes: List[NoteEntry]
 
+    _labels_by_name: Dict[int, LabelEntry] = field(init=False, repr=False)
+    _notes_by_name: Dict[int, NoteEntry] = field(init=False, repr=False)
+    _ranges_by_name: Dict[int, RangeLabel] = field(init=False, repr=False)
+
+    # Built on the first time query, see _time_index()
+    _cue_order: Optional[List[Tuple[int, int]]] = field(
+        init=False, repr=False, default=None)
+    _cue_offsets: Optional[List[int]] = field(
+        init=False, repr=False, default=None)
+    _region_order: Optional[List[Tuple[int, int, int]]] = field(
+        init=False, repr=False, default=None)
+    _region_starts: Optional[List[int]] = field(
+        init=False, repr=False, default=None)
+    _region_max_ends: List[int] = field(init=False, repr=False,
+                                        default_factory=list)
+
+    def __post_init__(self):
+        if not isinstance(self.cues, CueTable):
+            self.cues = CueTable.from_entries(self.cues)
+
+        # Index the adtl entries by cue name, keeping the first entry for
+        # each name.
+        self._labels_by_name = {}
+        for label in self.labels:
+            self._labels_by_name.setdefault(label.name, label)
+
+        self._notes_by_name = {}
+        for note in self.notes:
+            self._notes_by_name.setdefault(note.name, note)
+
+        self._ranges_by_name = {}
+        for r in self.ranges:
+            self._ranges_by_name.setdefault(r.name, r)
+
     @classmethod
     def read_all(cls, f,
                  cues: Optional[ChunkDescriptor],
@@ -197,40 +331,56 @@ class WavCuesReader:
                  notes: List[ChunkDescriptor],
                  fallback_encoding: str) -> 'WavCuesReader':
 
-        cue_list = []
+        cue_table = CueTable(array('I'))
         if cues is not None:
             cues_data = cues.read_data(f)
-            assert len(cues_data) >= 4, "cue metadata too short"
-            offset = calcsize("<I")
-            cues_count = unpack("<I", cues_data[0:offset])
-
-            for _ in range(cues_count[0]):
-                cue_bytes = cues_data[offset: offset + CueEntry.format_size()]
-                cue_list.append(CueEntry.read(cue_bytes))
-                offset += CueEntry.format_size()
+            offset = CueTable.Count.size
+            if len(cues_data) < offset:
+                raise ValueError("cue metadata too short")
+
+            cues_count = CueTable.Count.unpack_from(cues_data)[0]
+            if len(cues_data) < offset + cues_count * CueEntry.format_size():
+                raise ValueError(f"cue data size incorrect, expected "
+                                 f"{cues_count} entries found "
+                                 f"{len(cues_data)} bytes")
+
+            cue_table = CueTable.read(cues_data[offset:], cues_count)
+
+        # The adtl sub-chunks are contiguous, so read them all at once and
+        # decode each from its offset in the buffer
+        adtl_chunks = labls + ltxts + notes
+        adtl_start = min((c.start for c in adtl_chunks), default=0)
+        adtl_end = max((c.start + c.length for c in adtl_chunks), default=0)
+        adtl_data = b''
+        if adtl_chunks:
+            adtl_data = read_span(f, adtl_start, adtl_end - adtl_start)
+
+        def sub_chunk_data(chunk: ChunkDescriptor) -> bytes:
+            offset = chunk.start - adtl_start
+            return adtl_data[offset:offset + chunk.length]
 
         label_list = []
         for labl in labls:
             label_list.append(
-                LabelEntry.read(labl.read_data(f),
+                LabelEntry.read(sub_chunk_data(labl),
                                 encoding=fallback_encoding)
             )
 
         range_list = []
         for r in ltxts:
             range_list.append(
-                RangeLabel.read(r.read_data(f),
+                RangeLabel.read(sub_chunk_data(r),
                                 fallback_encoding=fallback_encoding)
             )
 
         note_list = []
         for note in notes:
             note_list.append(
-                NoteEntry.read(note.read_data(f),
+                NoteEntry.read(sub_chunk_data(note),
                                encoding=fallback_encoding)
             )
 
-        return WavCuesReader(cues=cue_list, labels=label_list,
+        return WavCuesReader(cues=cue_table, labels=label_list,
                              ranges=range_list, notes=note_list)
 
     def each_cue(self) -> Generator[Tuple[int, int], None, None]:
@@ -239,8 +389,8 @@ class WavCuesReader:
 
         :yields: the cue's ``name`` and ``sample_offset``
         """
-        for cue in self.cues:
-            yield (cue.name, cue.sample_offset)
+        assert isinstance(self.cues, CueTable)
+        yield from zip(self.cues.names, self.cues.sample_offsets)
 
     def label_and_note(self, cue_ident: int) -> Tuple[Optional[str],
                                                       Optional[str]]:
@@ -251,11 +401,10 @@ class WavCuesReader:
         :returns: a tuple of the the cue's label (if present) and note (if
             present)
         """
-        label = next((label.text for label in self.labels
-                      if label.name == cue_ident), None)
-        note = next((n.text for n in self.notes
-                     if n.name == cue_ident), None)
-        return (label, note)
+        label = self._labels_by_name.get(cue_ident)
+        note = self._notes_by_name.get(cue_ident)
+        return (label.text if label is not None else None,
+                note.text if note is not None else None)
 
     def range(self, cue_ident: int) -> Optional[int]:
         """
@@ -264,8 +413,101 @@ class WavCuesReader:
         :param cue_ident: the cue's name, its unique identifying number
         :returns: the length of the marker's range, or `None`
         """
-        return next((r.length for r in self.ranges
-                     if r.name == cue_ident), None)
+        r = self._ranges_by_name.get(cue_ident)
+        return r.length if r is not None else None
+
+    def _time_index(self):
+        """
+        Sort the cues, and the cues that have ranges, by sample offset.
+        """
+        if self._cue_order is not None:
+            return
+
+        self._cue_order = sorted(self.each_cue(), key=lambda c: c[1])
+        self._cue_offsets = [offset for _, offset in self._cue_order]
+
+        offsets_by_name: Dict[int, int] = {}
+        for name, offset in self.each_cue():
+            offsets_by_name.setdefault(name, offset)
+
+        self._region_order = sorted(
+            ((name, offsets_by_name[name], r.length)
+             for name, r in self._ranges_by_name.items()
+             if name in offsets_by_name),
+            key=lambda r: r[1])
+        self._region_starts = [offset for _, offset, _ in self._region_order]
+
+        # A binary tree over the sorted ranges, in an array with the root at
+        # 1 and the ranges at the leaves, of the latest end of the ranges
+        # under each node.
+        leaves = 1
+        while leaves < len(self._region_order):
+            leaves *= 2
+        max_ends = [-sys.maxsize] * (2 * leaves)
+        for i, (_, offset, length) in enumerate(self._region_order):
+            max_ends[leaves + i] = offset + length
+        for node in range(leaves - 1, 0, -1):
+            max_ends[node] = max(max_ends[2 * node], max_ends[2 * node + 1])
+        self._region_max_ends = max_ends
+
+    def cues_between(self, start_frame: int,
+                     end_frame: int) -> List[Tuple[int, int]]:
+        """
+        Get the cues that fall within a span of time.
+
+        :param start_frame: the first frame of the span
+        :param end_frame: the frame after the last frame of the span
+        :returns: the ``name`` and ``sample_offset`` of every cue with a
+            ``sample_offset`` from `start_frame` up to but not including
+            `end_frame`, in order of ``sample_offset``.
+        """
+        self._time_index()
+        assert self._cue_order is not None and self._cue_offsets is not None
+
+        first = bisect_left(self._cue_offsets, start_frame)
+        last = bisect_left(self._cue_offsets, end_frame, lo=first)
+        return self._cue_order[first:last]
+
+    def regions_overlapping(self, start_frame: int,
+                            end_frame: int) -> List[Tuple[int, int, int]]:
+        """
+        Get the cues with time ranges that overlap a span of time.
+
+        A cue's range runs from its ``sample_offset`` for the ``length`` of
+        its ``ltxt``. A range of zero length overlaps the span if its
+        ``sample_offset`` is in it.
+
+        :param start_frame: the first frame of the span
+        :param end_frame: the frame after the last frame of the span
+        :returns: the ``name``, ``sample_offset`` and ``length`` of each
+            overlapping range, in order of ``sample_offset``.
+        """
+        self._time_index()
+        assert self._region_order is not None and \
+            self._region_starts is not None
+
+        # Every range starting within the span overlaps it. Of those starting
+        # before it, descend the tree only into nodes holding a range that
+        # ends inside the span.
+        first = bisect_left(self._region_starts, start_frame)
+        last = bisect_left(self._region_starts, end_frame, lo=first)
+
+        leaves = len(self._region_max_ends) // 2
+        before = []
+        stack = [(1, 0, leaves)] if first > 0 else []
+        while stack:
+            node, lo, hi = stack.pop()
+            if lo >= first or self._region_max_ends[node] <= start_frame:
+                continue
+            elif hi - lo == 1:
+                before.append(lo)
+            else:
+                mid = (lo + hi) // 2
+                stack.append((2 * node + 1, mid, hi))
+                stack.append((2 * node, lo, mid))
+
+        return [self._region_order[i] for i in before] + \
+            self._region_order[first:last]
 
     def to_dict(self) -> Dict[str, Any]:
         retval = dict()
@@ -8,11 +8,15 @@ Unless otherwise stated, all § references here are to
 """
 
 from enum import IntEnum, Enum
-from struct import unpack
+from struct import Struct
 from dataclasses import dataclass, asdict
-from typing import List, Tuple, Any, Union
+from typing import List, Tuple, Any, Union, Dict, Callable, ClassVar
 
-from io import BytesIO
+#: Dolby Digital Plus `datarate` field
+DATARATE = Struct("<H")
+
+#: Segment size, following the segment type byte
+SEGMENT_SIZE = Struct("<H")
 
 
 class SegmentType(IntEnum):
@@ -334,8 +338,8 @@ class DolbyDigitalPlusMetadata:
 
     @staticmethod
     def load(buffer: bytes):
-        assert len(buffer) == 96, "Dolby Digital Plus segment incorrect size, "
-        "expected 96 got %i" % len(buffer)
+        assert len(buffer) == 96, "Dolby Digital Plus segment incorrect " \
+            "size, expected 96 got %i" % len(buffer)
 
         def program_id(b) -> int:
             return b
@@ -392,7 +396,7 @@ class DolbyDigitalPlusMetadata:
             return DolbyDigitalPlusMetadata.RFCompressionProfile(b)
 
         def dynrng1(b):
-            DolbyDigitalPlusMetadata.RFCompressionProfile(b)
+            return DolbyDigitalPlusMetadata.RFCompressionProfile(b)
 
         def ddplus_reserved3(_):
             pass
@@ -404,7 +408,7 @@ class DolbyDigitalPlusMetadata:
             pass
 
         def datarate(b) -> int:
-            return unpack("<H", b)[0]
+            return DATARATE.unpack(b)[0]
 
         def reserved(_):
             pass
@@ -486,6 +490,10 @@ class DolbyAtmosMetadata:
     SEGMENT_LENGTH = 248
     TOOL_NAME_LENGTH = 64
 
+    # 32 bytes skipped, tool name, version major/minor/fix, 53 bytes
+    # skipped, warp mode
+    Layout = Struct("<32x%isBBB53xB" % TOOL_NAME_LENGTH)
+
     @classmethod
     def load(cls, data: bytes):
 
@@ -493,19 +501,9 @@ class DolbyAtmosMetadata:
         # (f"DolbyAtmosMetadata segment is incorrect length, "
         #  f"expected {cls.SEGMENT_LENGTH} actual was {len(data)}")
 
-        h = BytesIO(data)
-
-        h.seek(32, 1)
-        toolname = h.read(cls.TOOL_NAME_LENGTH)
-        toolname = unpack("%is" % cls.TOOL_NAME_LENGTH, toolname)[0]
+        toolname, major, minor, fix, a_val = cls.Layout.unpack_from(data)
         toolname = toolname.decode('utf-8').strip('\0')
 
-        vers = h.read(3)
-        major, minor, fix = unpack("BBB", vers)
-
-        h.seek(53, 1)
-
-        a_val = unpack("B", h.read(1))[0]
         warp_mode = a_val & 0x7
 
         return DolbyAtmosMetadata(tool_name=toolname,
@@ -537,32 +535,27 @@ class DolbyAtmosSupplementalMetadata:
     MAGIC = 0xf8726fbd
     TRIM_CONFIG_COUNT = 9
 
+    # magic, object count, 1 byte skipped
+    Header = Struct("<IHx")
+
+    # auto trim, 14 bytes skipped
+    TRIM_CONFIG_SIZE = 15
+
     @classmethod
     def load(cls, data: bytes):
 
-        trim_modes = []
-        render_modes = []
-
-        h = BytesIO(data)
-        magic = unpack("<I", h.read(4))[0]
+        magic, object_count = cls.Header.unpack_from(data)
         assert magic == cls.MAGIC, "Magic value was not found"
 
-        object_count = unpack("<H", h.read(2))[0]
-
-        h.read(1)  # skip 1
-
-        for _ in range(cls.TRIM_CONFIG_COUNT):
-            auto_trim = unpack("B", h.read(1))
-            trim_modes.append(auto_trim)
-
-            h.read(14)  # skip 14
+        offset = cls.Header.size
+        trim_modes = [data[offset + i * cls.TRIM_CONFIG_SIZE]
+                      for i in range(cls.TRIM_CONFIG_COUNT)]
 
-        h.read(object_count)  # skip object_count bytes
+        offset += cls.TRIM_CONFIG_COUNT * cls.TRIM_CONFIG_SIZE
+        offset += object_count  # skip object_count bytes
 
-        for _ in range(object_count):
-            binaural_mode = unpack("B", h.read(1))[0]
-            binaural_mode &= 0x7
-            render_modes.append(binaural_mode)
+        render_modes: List[Any] = [b & 0x7 for b in
+                                   data[offset:offset + object_count]]
 
         return DolbyAtmosSupplementalMetadata(object_count=object_count,
                                               render_modes=render_modes,
@@ -572,83 +565,102 @@ class DolbyAtmosSupplementalMetadata:
 class WavDolbyMetadataReader:
     """
     Reads Dolby bitstream metadata.
-    """
 
-    #: List of the Dolby Metadata Segments.
-    #:
-    #: Each list entry is a tuple of `SegmentType`, a `bool`
-    #: indicating if the segment's checksum was valid, and the
-    #: segment's parsed dataclass (or a `bytes` array if it was
-    #: not recognized).
-    segment_list: List[Tuple[Union[SegmentType, int], bool, Any]]
+    Segment payloads are located when the reader is created, and each is
+    only decoded the first time it is requested.
+    """
 
     version: Tuple[int, int, int, int]
 
+    #: Segment decoders by segment type
+    Loaders: ClassVar[Dict[int, Callable[[Any], Any]]] = {
+        SegmentType.DolbyDigitalPlus: DolbyDigitalPlusMetadata.load,
+        SegmentType.DolbyAtmos: DolbyAtmosMetadata.load,
+        SegmentType.DolbyAtmosSupplemental:
+            DolbyAtmosSupplementalMetadata.load,
+    }
+
     @staticmethod
-    def segment_checksum(bs: bytes, size: int):
-        retval = size
-        for b in bs:
-            retval += int(b)
-            retval &= 0xff
+    def segment_checksum(bs: Union[bytes, memoryview], size: int):
+        retval = (size + sum(bs)) & 0xff
 
         retval = ((~retval) + 1) & 0xff
 
         return retval
 
     def __init__(self, dbmd_data):
-        self.segment_list = []
+        data = memoryview(dbmd_data)
 
-        h = BytesIO(dbmd_data)
+        self.version = (data[3], data[2], data[1], data[0])
 
-        v_vec = []
-        for _ in range(4):
-            b = h.read(1)
-            v_vec.insert(0, unpack("B", b)[0])
+        # The type, checksum validity and payload of each segment
+        self._segments: List[Tuple[Union[SegmentType, int], bool,
+                                   memoryview]] = []
+        self._decoded: Dict[int, Any] = {}
 
-        self.version = tuple(v_vec)
-
-        while True:
-            stype = SegmentType(unpack("B", h.read(1))[0])
+        offset = 4
+        while offset < len(data):
+            stype = SegmentType(data[offset])
             if stype == SegmentType.EndMarker:
                 break
             else:
-                seg_size = unpack("<H", h.read(2))[0]
-                seg_payload = h.read(seg_size)
+                seg_size = SEGMENT_SIZE.unpack_from(data, offset + 1)[0]
+                payload_start = offset + 1 + SEGMENT_SIZE.size
+                seg_payload = data[payload_start:payload_start + seg_size]
                 expected_checksum = WavDolbyMetadataReader\
                     .segment_checksum(seg_payload, seg_size)
-                checksum = unpack("B", h.read(1))[0]
+                checksum = data[payload_start + seg_size]
+
+                self._segments\
+                    .append((stype, checksum == expected_checksum,
+                             seg_payload))
+
+                offset = payload_start + seg_size + 1
 
-                segment = seg_payload
-                if stype == SegmentType.DolbyDigitalPlus:
-                    segment = DolbyDigitalPlusMetadata.load(segment)
-                elif stype == SegmentType.DolbyAtmos:
-                    segment = DolbyAtmosMetadata.load(segment)
-                elif stype == SegmentType.DolbyAtmosSupplemental:
-                    segment = DolbyAtmosSupplementalMetadata.load(segment)
+    def _segment(self, index: int) -> Any:
+        if index not in self._decoded:
+            stype, _, payload = self._segments[index]
+            loader = self.Loaders.get(stype)
+            self._decoded[index] = loader(payload) if loader \
+                else bytes(payload)
 
-                self.segment_list\
-                    .append((stype, checksum == expected_checksum, segment))
+        return self._decoded[index]
+
+    def _valid_segments(self, stype: SegmentType) -> List[Any]:
+        return [self._segment(i) for i, (t, valid, _)
+                in enumerate(self._segments) if t == stype and valid]
+
+    @property
+    def segment_list(self) -> List[Tuple[Union[SegmentType, int], bool,
+                                         Any]]:
+        """
+        List of the Dolby Metadata Segments.
+
+        Each list entry is a tuple of `SegmentType`, a `bool`
+        indicating if the segment's checksum was valid, and the
+        segment's parsed dataclass (or a `bytes` array if it was
+        not recognized).
+        """
+        return [(stype, valid, self._segment(i)) for i, (stype, valid, _)
+                in enumerate(self._segments)]
 
     def dolby_digital_plus(self) -> List[DolbyDigitalPlusMetadata]:
         """
         Every valid Dolby Digital Plus metadata segment in the file.
         """
-        return [x[2] for x in self.segment_list
-                if x[0] == SegmentType.DolbyDigitalPlus and x[1]]
+        return self._valid_segments(SegmentType.DolbyDigitalPlus)
 
     def dolby_atmos(self) -> List[DolbyAtmosMetadata]:
         """
         Every valid Dolby Atmos metadata segment in the file.
         """
-        return [x[2] for x in self.segment_list
-                if x[0] == SegmentType.DolbyAtmos and x[1]]
+        return self._valid_segments(SegmentType.DolbyAtmos)
 
     def dolby_atmos_supplemental(self) -> List[DolbyAtmosSupplementalMetadata]:
         """
         Every valid Dolby Atmos Supplemental metadata segment in the file.
         """
-        return [x[2] for x in self.segment_list
-                if x[0] == SegmentType.DolbyAtmosSupplemental and x[1]]
+        return self._valid_segments(SegmentType.DolbyAtmosSupplemental)
 
     def to_dict(self) -> dict:
 
@@ -1,74 +1,124 @@
-from .riff_parser import parse_chunk, ListChunkDescriptor
+from .riff_parser import parse_chunk, ListChunkDescriptor, ChunkDescriptor, \
+    read_span
 
-from typing import Optional
+from typing import Optional, Dict
+
+#: The fields read into the attributes of :class:`WavInfoChunkReader`. Other
+#: fields are decoded leniently, so an unexpected vendor field can't make
+#: the file unreadable.
+NAMED_FIELDS = frozenset((b'ICOP', b'IPRD', b'IGNR', b'ISBJ', b'IART',
+                          b'ICMT', b'ISFT', b'ICRD', b'IENG', b'ITCH',
+                          b'IKEY', b'INAM', b'ISRC', b'TAPE', b'IARL',
+                          b'ICMS'))
 
 
 class WavInfoChunkReader:
 
-    def __init__(self, f, encoding):
+    def __init__(self, f, encoding,
+                 info_chunk: Optional[ListChunkDescriptor] = None):
+        """
+        Read RIFF INFO metadata.
+
+        :param f: The file handle.
+        :param encoding: The text encoding of the INFO fields.
+        :param info_chunk: The ``LIST/INFO`` chunk descriptor. If this is not
+            given the file will be parsed to find it.
+        """
         self.encoding = encoding
 
-        f.seek(0)
-        parsed_chunks = parse_chunk(f)
-        assert type(parsed_chunks) is ListChunkDescriptor
+        if info_chunk is None:
+            f.seek(0)
+            parsed_chunks = parse_chunk(f)
+            assert type(parsed_chunks) is ListChunkDescriptor
 
-        list_chunks = [chunk for chunk in parsed_chunks.children
-                       if type(chunk) is ListChunkDescriptor]
+            list_chunks = [chunk for chunk in parsed_chunks.children
+                           if type(chunk) is ListChunkDescriptor]
 
-        self.info_chunk = next((chunk for chunk in list_chunks
-                                if chunk.signature == b'INFO'), None)
+            info_chunk = next((chunk for chunk in list_chunks
+                               if chunk.signature == b'INFO'), None)
+
+        self.info_chunk = info_chunk
+
+        #: Every field in the INFO list, keyed by its FourCC, including
+        #: any not named by the attributes of this class.
+        self.fields: Dict[bytes, str] = self._read_fields(f)
 
         #: 'ICOP' Copyright
-        self.copyright: Optional[str] = self._get_field(f, b'ICOP')
+        self.copyright: Optional[str] = self._get_field(b'ICOP')
         #: 'IPRD' Product
-        self.product: Optional[str] = self._get_field(f, b'IPRD')
+        self.product: Optional[str] = self._get_field(b'IPRD')
         self.album: Optional[str] = self.product
         #: 'IGNR' Genre
-        self.genre: Optional[str] = self._get_field(f, b'IGNR')
+        self.genre: Optional[str] = self._get_field(b'IGNR')
         #: 'ISBJ' Subject
-        self.subject: Optional[str] = self._get_field(f, b'ISBJ')
+        self.subject: Optional[str] = self._get_field(b'ISBJ')
         #: 'IART' Artist, composer, author
-        self.artist: Optional[str] = self._get_field(f, b'IART')
+        self.artist: Optional[str] = self._get_field(b'IART')
         #: 'ICMT' Comment
-        self.comment: Optional[str] = self._get_field(f, b'ICMT')
+        self.comment: Optional[str] = self._get_field(b'ICMT')
         #: 'ISFT' Software, encoding application
-        self.software: Optional[str] = self._get_field(f, b'ISFT')
+        self.software: Optional[str] = self._get_field(b'ISFT')
         #: 'ICRD' Created date
-        self.created_date: Optional[str] = self._get_field(f, b'ICRD')
+        self.created_date: Optional[str] = self._get_field(b'ICRD')
         #: 'IENG' Engineer
-        self.engineer: Optional[str] = self._get_field(f, b'IENG')
+        self.engineer: Optional[str] = self._get_field(b'IENG')
         #: 'ITCH' Technician
-        self.technician: Optional[str] = self._get_field(f, b'ITCH')
+        self.technician: Optional[str] = self._get_field(b'ITCH')
         #: 'IKEY' Keywords, keyword list
-        self.keywords: Optional[str] = self._get_field(f, b'IKEY')
+        self.keywords: Optional[str] = self._get_field(b'IKEY')
         #: 'INAM' Name, title
-        self.title: Optional[str] = self._get_field(f, b'INAM')
+        self.title: Optional[str] = self._get_field(b'INAM')
         #: 'ISRC' Source
-        self.source: Optional[str] = self._get_field(f, b'ISRC')
+        self.source: Optional[str] = self._get_field(b'ISRC')
         #: 'TAPE' Tape
-        self.tape: Optional[str] = self._get_field(f, b'TAPE')
+        self.tape: Optional[str] = self._get_field(b'TAPE')
         #: 'IARL' Archival Location
-        self.archival_location: Optional[str] = self._get_field(f, b'IARL')
+        self.archival_location: Optional[str] = self._get_field(b'IARL')
         #: 'ICSM' Commissioned
-        self.commissioned: Optional[str] = self._get_field(f, b'ICMS')
+        self.commissioned: Optional[str] = self._get_field(b'ICMS')
 
-    def _get_field(self, f, field_ident) -> Optional[str]:
-        search = next(((chunk.start, chunk.length)
-                       for chunk in self.info_chunk.children
-                       if chunk.ident == field_ident),
-                      None)
+    def _read_fields(self, f) -> Dict[bytes, str]:
+        """
+        Read the INFO list at once and decode each of its fields. Fields
+        not in :data:`NAMED_FIELDS` have undecodable bytes replaced.
+        """
+        fields: Dict[bytes, str] = {}
+        if self.info_chunk is None:
+            return fields
+
+        children = [chunk for chunk in self.info_chunk.children
+                    if type(chunk) is ChunkDescriptor]
+        if not children:
+            return fields
+
+        list_start = min(chunk.start for chunk in children)
+        list_end = max(chunk.start + chunk.length for chunk in children)
+        list_data = read_span(f, list_start, list_end - list_start)
 
-        if search is not None:
-            f.seek(search[0])
-            data = f.read(search[1])
-            return data.decode(self.encoding).rstrip('\0')
-        else:
-            return None
+        for chunk in children:
+            offset = chunk.start - list_start
+            data = list_data[offset:offset + chunk.length]
+            if chunk.ident not in fields:
+                errors = 'strict' if chunk.ident in NAMED_FIELDS \
+                    else 'replace'
+                fields[chunk.ident] = \
+                    data.decode(self.encoding, errors).rstrip('\0')
+
+        return fields
+
+    def _get_field(self, field_ident) -> Optional[str]:
+        return self.fields.get(field_ident)
 
     def to_dict(self) -> dict:  # FIXME should be asdict
         """
         A dictionary with all of the key/values read from the INFO scope.
+        Fields not in :data:`NAMED_FIELDS` are under ``'extra'``, keyed by
+        their four-character identifiers.
         """
+        extra = {ident.decode('latin_1'): value
+                 for ident, value in self.fields.items()
+                 if ident not in NAMED_FIELDS}
+
         return {'copyright': self.copyright,
                 'product': self.product,
                 'album': self.album,
@@ -85,7 +135,8 @@ class WavInfoChunkReader:
                 'commissioned': self.commissioned,
                 'archival_location': self.archival_location,
                 'subject': self.subject,
-                'technician': self.technician
+                'technician': self.technician,
+                'extra': extra
                 }
 
     def __repr__(self):
@@ -1,4 +1,4 @@
-from lxml import etree as ET
+from .xml_backend import ET, parse, tostring
 import io
 # from collections import namedtuple
 from typing import Optional
@@ -79,7 +79,7 @@ class SteinbergMetadata:
         `AudioSpeakerArrangement` property
         """
         val = self.parsed.find(
-            "./ATTR_LIST/ATTR[NAME = 'AudioSpeakerArrangement']/VALUE")
+            "./ATTR_LIST/ATTR[NAME='AudioSpeakerArrangement']/VALUE")
         if val is not None:
             return type(self).AudioSpeakerArrangement(int(val.text))
 
@@ -89,7 +89,7 @@ class SteinbergMetadata:
         AudioSampleFormatSize
         """
         val = self.parsed.find(
-            "./ATTR_LIST/ATTR[NAME = 'AudioSampleFormatSize']/VALUE")
+            "./ATTR_LIST/ATTR[NAME='AudioSampleFormatSize']/VALUE")
         if val is not None:
             return int(val.text)
 
@@ -99,7 +99,7 @@ class SteinbergMetadata:
         MediaCompany
         """
         val = self.parsed.find(
-            "./ATTR_LIST/ATTR[NAME = 'MediaCompany']/VALUE")
+            "./ATTR_LIST/ATTR[NAME='MediaCompany']/VALUE")
         if val is not None:
             return val.text
 
@@ -109,7 +109,7 @@ class SteinbergMetadata:
         MediaDropFrames
         """
         val = self.parsed.find(
-            "./ATTR_LIST/ATTR[NAME = 'MediaDropFrames']/VALUE")
+            "./ATTR_LIST/ATTR[NAME='MediaDropFrames']/VALUE")
         if val is not None:
             return val.text == "1"
 
@@ -119,7 +119,7 @@ class SteinbergMetadata:
         MediaDuration
         """
         val = self.parsed.find(
-            "./ATTR_LIST/ATTR[NAME = 'MediaDuration']/VALUE")
+            "./ATTR_LIST/ATTR[NAME='MediaDuration']/VALUE")
         if val is not None:
             return float(val.text)
 
@@ -164,8 +164,7 @@ class WavIXMLFormat:
         """
         self.source = xml
         xml_bytes = io.BytesIO(xml)
-        parser = ET.XMLParser(recover=True)
-        self.parsed: ET.ElementTree = ET.parse(xml_bytes, parser=parser)
+        self.parsed: ET.ElementTree = parse(xml_bytes, recover=True)
 
     def _get_text_value(self, xpath) -> Optional[str]:
         e = self.parsed.find("./" + xpath)
@@ -175,7 +174,7 @@ class WavIXMLFormat:
             return None
 
     def xml_str(self) -> str:
-        return ET.tostring(self.parsed).decode("utf-8")
+        return tostring(self.parsed)
 
     @property
     def raw_xml(self) -> ET.ElementTree:
@@ -194,11 +193,10 @@ class WavIXMLFormat:
         for track in self.parsed.find("./TRACK_LIST").iter():
             if track.tag == 'TRACK':
                 yield IXMLTrack(
-                    channel_index=track.xpath('string(CHANNEL_INDEX/text())'),
-                    interleave_index=track.xpath(
-                        'string(INTERLEAVE_INDEX/text())'),
-                    name=track.xpath('string(NAME/text())'),
-                    function=track.xpath('string(FUNCTION/text())')
+                    channel_index=track.findtext('CHANNEL_INDEX', ''),
+                    interleave_index=track.findtext('INTERLEAVE_INDEX', ''),
+                    name=track.findtext('NAME', ''),
+                    function=track.findtext('FUNCTION', '')
                 )
 
     @property
@@ -0,0 +1,107 @@
+import sys
+from array import array
+from struct import Struct
+from typing import Optional, Union
+
+#: The ``levl`` chunk header
+LEVL_HEADER = Struct("<IIIIIIII28s60x")
+
+#: Peak points are unsigned chars
+LEVL_FORMAT_UCHAR = 1
+
+#: Peak points are unsigned shorts
+LEVL_FORMAT_USHORT = 2
+
+
+class WavLevlReader:
+    """
+    EBU Tech 3285 Supplement 3 peak envelope (``levl``) metadata.
+    """
+
+    def __init__(self, levl_data: bytes):
+        """
+        Read the peak envelope from a ``levl`` chunk.
+        """
+        unpacked = LEVL_HEADER.unpack_from(levl_data)
+
+        #: Version of the peak envelope format
+        self.version: int = unpacked[0]
+
+        #: The format of each peak point, :data:`LEVL_FORMAT_UCHAR` or
+        #: :data:`LEVL_FORMAT_USHORT`.
+        self.format: int = unpacked[1]
+
+        #: 1 if only the positive peak of each block is recorded, 2 if the
+        #: positive and negative peaks are.
+        self.points_per_value: int = unpacked[2]
+
+        #: The number of audio frames in each peak block.
+        self.block_size: int = unpacked[3]
+
+        #: The number of channels.
+        self.channel_count: int = unpacked[4]
+
+        #: The number of peak frames, each holding a peak value for every
+        #: channel.
+        self.peak_frame_count: int = unpacked[5]
+
+        #: The audio frame of the highest peak, or `None` if unknown.
+        self.peak_of_peaks_position: Optional[int] = \
+            unpacked[6] if unpacked[6] != 0xFFFFFFFF else None
+
+        #: The offset of the peak points from the start of the chunk data.
+        self.peaks_offset: int = max(unpacked[7], LEVL_HEADER.size)
+
+        #: When the peak data was made, as "YYYY:MM:DD:hh:mm:ss:uuu".
+        self.timestamp: str = \
+            unpacked[8].rstrip(b'\0').decode('ascii', errors='replace')
+
+        point_size = 2 if self.format == LEVL_FORMAT_USHORT else 1
+        length = self.peak_frame_count * self.channel_count * \
+            self.points_per_value * point_size
+        length = min(length, len(levl_data) - self.peaks_offset)
+        length -= length % point_size
+
+        #: The peak points as they are stored in the chunk, without copying.
+        #: For each peak frame, each channel has its positive peak and then,
+        #: if :attr:`points_per_value` is 2, the magnitude of its negative
+        #: peak. Points are scaled so the full range of their format is full
+        #: scale.
+        self.peak_data: memoryview = \
+            memoryview(levl_data)[self.peaks_offset:self.peaks_offset + length]
+
+    @property
+    def peaks(self) -> Union[memoryview, array]:
+        """
+        The peak points as integers, in the order of :attr:`peak_data`.
+        This is a view of the chunk unless the points must be byte-swapped
+        for this platform.
+        """
+        if self.format != LEVL_FORMAT_USHORT:
+            return self.peak_data
+
+        if sys.byteorder == 'little':
+            return self.peak_data.cast('H')
+
+        swapped = array('H', self.peak_data.tobytes())
+        swapped.byteswap()
+        return swapped
+
+    @property
+    def full_scale(self) -> int:
+        """
+        The value of a peak point at full scale.
+        """
+        return 0xFFFF if self.format == LEVL_FORMAT_USHORT else 0xFF
+
+    def to_dict(self):
+        return {
+            'version': self.version,
+            'format': self.format,
+            'points_per_value': self.points_per_value,
+            'block_size': self.block_size,
+            'channel_count': self.channel_count,
+            'peak_frame_count': self.peak_frame_count,
+            'peak_of_peaks_position': self.peak_of_peaks_position,
+            'timestamp': self.timestamp,
+        }
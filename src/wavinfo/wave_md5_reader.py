@@ -0,0 +1,24 @@
+class WavMD5Reader:
+    """
+    The checksum of a file's audio, from an ``MD5 `` chunk.
+    """
+
+    def __init__(self, md5_data: bytes):
+        """
+        Read the checksum from an ``MD5 `` chunk.
+        """
+
+        #: The MD5 digest of the `data` chunk payload.
+        self.digest: bytes = bytes(md5_data[:16])
+
+    @property
+    def hexdigest(self) -> str:
+        """
+        :attr:`digest` as a hexadecimal string.
+        """
+        return self.digest.hex()
+
+    def to_dict(self):
+        return {
+            'digest': self.hexdigest,
+        }
@@ -1,19 +1,79 @@
 # -*- coding: utf-8 -*-
-import struct
+from struct import Struct
+from uuid import UUID
+from contextlib import contextmanager
+import hashlib
+import mmap
 import os
-from typing import Optional, Generator, Any, NamedTuple
+from typing import Optional, Generator, Any, NamedTuple, Dict, List, \
+    Sequence, TYPE_CHECKING
 
 import pathlib
 
 
-from .riff_parser import parse_chunk, ChunkDescriptor, ListChunkDescriptor
-from .wave_ixml_reader import WavIXMLFormat
+from .riff_parser import parse_chunk, ChunkDescriptor, ListChunkDescriptor, \
+    WavInfoChunkSizeError, read_span, READ_BLOCK_SIZE
 from .wave_bext_reader import WavBextReader
 from .wave_info_reader import WavInfoChunkReader
-from .wave_adm_reader import WavADMReader
 from .wave_dbmd_reader import WavDolbyMetadataReader
 from .wave_cues_reader import WavCuesReader
 from .wave_smpl_reader import WavSmplReader
+from .wave_levl_reader import WavLevlReader
+from .wave_md5_reader import WavMD5Reader
+
+# The iXML and ADM readers load an XML library, so they are only imported
+# when a file has those chunks.
+if TYPE_CHECKING:
+    from .wave_ixml_reader import WavIXMLFormat
+    from .wave_adm_reader import WavADMReader
+    from .sample_decoder import Channels
+
+#: The ``fmt`` chunk fields common to every wave format.
+FMT_LAYOUT = Struct("<HHIIHH")
+
+#: The ``WAVE_FORMAT_EXTENSIBLE`` extension of the ``fmt`` chunk: cbSize,
+#: valid bits per sample, channel mask and SubFormat GUID.
+FMT_EXTENSIBLE_LAYOUT = Struct("<HHI16s")
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_ALAW = 0x0006
+WAVE_FORMAT_MULAW = 0x0007
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+#: SubFormat GUIDs are a format tag in the first field of one of these,
+#: the ``KSDATAFORMAT_SUBTYPE`` base or the ambisonic B-format base.
+SUBFORMAT_BASES = (UUID('00000000-0000-0010-8000-00aa00389b71'),
+                   UUID('00000000-0721-11d3-8644-c8c1ca000000'))
+
+#: The ``fact`` chunk sample length.
+FACT_LAYOUT = Struct("<I")
+
+#: The scope each metadata chunk is read for.
+CHUNK_SCOPES = {b'fmt ': 'fmt', b'fact': 'data', b'bext': 'bext',
+                b'iXML': 'ixml', b'axml': 'adm', b'chna': 'adm',
+                b'dbmd': 'dolby', b'cue ': 'cues', b'adtl': 'cues',
+                b'INFO': 'info', b'smpl': 'smpl', b'levl': 'levl',
+                b'MD5 ': 'md5'}
+
+#: The default size limit in bytes of the chunks read for each scope. A
+#: scope that is not listed, or is `None`, has no limit. A chunk is read
+#: whole into memory, so a limit is about the most memory one chunk can
+#: cost. The ``adm`` limit of 64 MiB holds the ``axml`` of long object-based
+#: programmes; raise it through `size_limits` for larger ones.
+DEFAULT_SIZE_LIMITS: Dict[str, Optional[int]] = {
+    'fmt': 1 << 16,
+    'data': 1 << 16,
+    'bext': 1 << 24,
+    'ixml': 1 << 26,
+    'adm': 1 << 26,
+    'dolby': 1 << 24,
+    'cues': 1 << 26,
+    'info': 1 << 24,
+    'smpl': 1 << 24,
+    'levl': 1 << 28,
+    'md5': 1 << 16,
+}
 
 #: Calculated statistics about the audio data.
 
@@ -22,6 +82,43 @@ class WavDataDescriptor(NamedTuple):
     byte_count: int
     frame_count: int
 
+    #: The number of sample frames recorded in the ``ds64`` chunk of an RF64
+    #: file or the ``fact`` chunk of any other, or `None` if there is no
+    #: such chunk.
+    sample_count: Optional[int] = None
+
+
+class WavSampleFormat(NamedTuple):
+    """
+    The encoding of the samples in the `data` chunk, for choosing a decoder.
+    """
+
+    #: One of ``'int'`` (signed integer PCM), ``'uint'`` (8-bit PCM),
+    #: ``'float'``, ``'alaw'`` or ``'mulaw'``.
+    encoding: str
+
+    #: The size of each sample in bytes, including any padding.
+    sample_width: int
+
+    #: The number of significant bits in each sample.
+    valid_bits: int
+
+    @property
+    def dtype(self) -> Optional[str]:
+        """
+        The NumPy-style type string of one sample, e.g. ``'<i2'`` or
+        ``'<f4'``, or `None` if the samples have no native type and must be
+        unpacked, as with 24-bit integer PCM.
+        """
+        if self.encoding in ('alaw', 'mulaw', 'uint'):
+            return 'u1' if self.sample_width == 1 else None
+        elif self.encoding == 'int' and self.sample_width in (2, 4, 8):
+            return f"<i{self.sample_width}"
+        elif self.encoding == 'float' and self.sample_width in (4, 8):
+            return f"<f{self.sample_width}"
+        else:
+            return None
+
 
 #: The format of the audio samples.
 class WavAudioFormat(NamedTuple):
@@ -32,13 +129,71 @@ class WavAudioFormat(NamedTuple):
     block_align: int
     bits_per_sample: int
 
+    #: ``WAVE_FORMAT_EXTENSIBLE`` valid bits per sample, or `None`.
+    valid_bits_per_sample: Optional[int] = None
+
+    #: ``WAVE_FORMAT_EXTENSIBLE`` speaker position mask, or `None`.
+    channel_mask: Optional[int] = None
+
+    #: ``WAVE_FORMAT_EXTENSIBLE`` SubFormat GUID, or `None`.
+    sub_format: Optional[UUID] = None
+
+    @property
+    def format_tag(self) -> Optional[int]:
+        """
+        The format tag of the samples, resolved from :attr:`sub_format` if the
+        format is ``WAVE_FORMAT_EXTENSIBLE``, or `None` if the SubFormat is not
+        one with a format tag.
+        """
+        if self.audio_format != WAVE_FORMAT_EXTENSIBLE:
+            return self.audio_format
+
+        if self.sub_format is not None:
+            fields = self.sub_format.fields
+            for base in SUBFORMAT_BASES:
+                if fields[1:] == base.fields[1:] and fields[0] <= 0xFFFF:
+                    return fields[0]
+
+        return None
+
+    @property
+    def sample_format(self) -> Optional[WavSampleFormat]:
+        """
+        The encoding of the samples, or `None` if the format is compressed or
+        unknown.
+        """
+        encodings = {WAVE_FORMAT_PCM: 'int',
+                     WAVE_FORMAT_IEEE_FLOAT: 'float',
+                     WAVE_FORMAT_ALAW: 'alaw',
+                     WAVE_FORMAT_MULAW: 'mulaw'}
+
+        format_tag = self.format_tag
+        if format_tag is None or self.channel_count == 0:
+            return None
+
+        encoding = encodings.get(format_tag)
+        if encoding is None:
+            return None
+
+        sample_width = self.block_align // self.channel_count
+        if encoding == 'int' and sample_width == 1:
+            encoding = 'uint'
+
+        valid_bits = self.valid_bits_per_sample or self.bits_per_sample
+        return WavSampleFormat(encoding=encoding,
+                               sample_width=sample_width,
+                               valid_bits=valid_bits)
+
 
 class WavInfoReader:
     """
     Parse a WAV audio file for metadata.
     """
 
-    def __init__(self, path, info_encoding='latin_1', bext_encoding='ascii'):
+    def __init__(self, path, info_encoding='latin_1', bext_encoding='ascii',
+                 adm_block_formats='keep',
+                 size_limits: Optional[Dict[str, Optional[int]]] = None,
+                 oversize='raise'):
         """
         Create a new reader object.
 
@@ -54,10 +209,32 @@ class WavInfoReader:
             The text encoding to use when decoding the string
             fields of the Broadcast-WAV extension. Per EBU 3285 this is ASCII
             but this parameter is available to you if you encounter a weirdo.
+
+        :param adm_block_formats:
+            How ADM ``audioBlockFormat`` elements are read, one of ``'keep'``,
+            ``'skip'``, ``'summarize'`` or ``'stream'``. See
+            :class:`WavADMReader<wavinfo.wave_adm_reader.WavADMReader>`.
+
+        :param size_limits:
+            The size limit in bytes of the chunks read for each scope, or
+            `None` for no limit. Scopes that are not given keep their limits
+            from :data:`DEFAULT_SIZE_LIMITS`.
+
+        :param oversize:
+            What to do with a chunk larger than its scope's limit. ``'raise'``
+            raises a :class:`WavInfoChunkSizeError
+            <wavinfo.riff_parser.WavInfoChunkSizeError>`, ``'skip'`` leaves
+            the scope `None` without reading the chunk. An oversize ``fmt``
+            chunk always raises.
         """
+        assert oversize in ('raise', 'skip'), \
+            f"Unknown oversize option {oversize!r}"
 
         self.info_encoding = info_encoding
         self.bext_encoding = bext_encoding
+        self.adm_block_formats = adm_block_formats
+        self.size_limits = dict(DEFAULT_SIZE_LIMITS, **(size_limits or {}))
+        self.oversize = oversize
 
         #: Wave audio data format.
         self.fmt: Optional[WavAudioFormat] = None
@@ -69,10 +246,10 @@ class WavInfoReader:
         self.bext: Optional[WavBextReader] = None
 
         #: iXML metadata.
-        self.ixml: Optional[WavIXMLFormat] = None
+        self.ixml: Optional['WavIXMLFormat'] = None
 
         #: ADM Audio Definiton Model metadata.
-        self.adm: Optional[WavADMReader] = None
+        self.adm: Optional['WavADMReader'] = None
 
         #: Dolby bitstream metadata.
         self.dolby: Optional[WavDolbyMetadataReader] = None
@@ -86,7 +263,19 @@ class WavInfoReader:
         #: Sampler `smpl` metadata
         self.smpl: Optional[WavSmplReader] = None
 
+        #: EBU `levl` peak envelope
+        self.levl: Optional[WavLevlReader] = None
+
+        #: ``MD5 `` audio checksum
+        self.md5: Optional[WavMD5Reader] = None
+
+        # Audio is read from the stream the reader was created with, or else
+        # from a memory map of the file at `path`.
+        self._stream = None
+        self._audio_map: Optional[mmap.mmap] = None
+
         if hasattr(path, 'read'):
+            self._stream = path
             self.get_wav_info(path)
             self.url = 'about:blank'
             self.path = repr(path)
@@ -117,7 +306,9 @@ class WavInfoReader:
         self.dolby = self._get_dbmd(wavfile)
         self.cues = self._get_cue(wavfile)
         self.smpl = self._get_sampler_loops(wavfile)
-        self.data = self._describe_data()
+        self.levl = self._get_levl(wavfile)
+        self.md5 = self._get_md5(wavfile)
+        self.data = self._describe_data(wavfile)
 
     def _find_chunk_data(self, ident, from_stream,
                          default_none=False) -> Optional[bytes]:
@@ -128,8 +319,38 @@ class WavInfoReader:
         chunk_descriptor = next(top_chunks, None) \
             if default_none else next(top_chunks)
 
-        return chunk_descriptor.read_data(from_stream) \
-            if chunk_descriptor else None
+        if chunk_descriptor is None or \
+                not self._within_limit(ident, chunk_descriptor.length,
+                                       required=not default_none):
+            return None
+
+        return chunk_descriptor.read_data(from_stream)
+
+    def _within_limit(self, ident, length, required=False) -> bool:
+        """
+        Check a chunk's length against the size limit of its scope.
+
+        :returns: `False` if the chunk is oversize and should be skipped.
+        :raises WavInfoChunkSizeError: if the chunk is oversize and is
+            `required` or the reader doesn't skip oversize chunks.
+        """
+        limit = self.size_limits.get(CHUNK_SCOPES.get(ident, ''))
+        if limit is None or length <= limit:
+            return True
+        elif self.oversize == 'skip' and not required:
+            return False
+        else:
+            raise WavInfoChunkSizeError(ident, length, limit)
+
+    @staticmethod
+    def _list_length(list_chunk: ListChunkDescriptor) -> int:
+        children = [c for c in list_chunk.children
+                    if type(c) is ChunkDescriptor]
+        if not children:
+            return 0
+
+        return max(c.start + c.length for c in children) - \
+            min(c.start for c in children)
 
     def _find_list_chunk(self, signature) -> Optional[ListChunkDescriptor]:
         top_chunks = (chunk for chunk in self.main_list
@@ -138,38 +359,58 @@ class WavInfoReader:
 
         return next(top_chunks, None)
 
-    def _describe_data(self):
-        data_chunk = next(c for c in self.main_list
-                          if type(c) is ChunkDescriptor and c.ident == b'data')
+    def _data_chunk(self) -> ChunkDescriptor:
+        return next(c for c in self.main_list
+                    if type(c) is ChunkDescriptor and c.ident == b'data')
+
+    def _describe_data(self, f):
+        data_chunk = self._data_chunk()
+
+        if data_chunk.rf64_context is not None:
+            sample_count = data_chunk.rf64_context.sample_count
+        else:
+            fact_data = self._find_chunk_data(b'fact', f, default_none=True)
+            sample_count = FACT_LAYOUT.unpack_from(fact_data)[0] \
+                if fact_data and len(fact_data) >= FACT_LAYOUT.size else None
 
         assert isinstance(self.fmt, WavAudioFormat)
         return WavDataDescriptor(
             byte_count=data_chunk.length,
-            frame_count=int(data_chunk.length / self.fmt.block_align))
+            frame_count=data_chunk.length // self.fmt.block_align,
+            sample_count=sample_count)
 
     def _get_format(self, f):
         fmt_data = self._find_chunk_data(b'fmt ', f)
         assert fmt_data is not None, "Fmt data not found, not a valid wav file"
 
-        packstring = "<HHIIHH"
-        rest_starts = struct.calcsize(packstring)
+        unpacked = FMT_LAYOUT.unpack(fmt_data[:FMT_LAYOUT.size])
+        extensible = (None, None, None)
 
-        unpacked = struct.unpack(packstring, fmt_data[:rest_starts])
+        if unpacked[0] == WAVE_FORMAT_EXTENSIBLE and \
+                len(fmt_data) >= FMT_LAYOUT.size + FMT_EXTENSIBLE_LAYOUT.size:
+            cb_size, valid_bits, channel_mask, sub_format = \
+                FMT_EXTENSIBLE_LAYOUT.unpack_from(fmt_data, FMT_LAYOUT.size)
+            if cb_size >= FMT_EXTENSIBLE_LAYOUT.size - 2:
+                extensible = (valid_bits, channel_mask,
+                              UUID(bytes_le=sub_format))
 
         return WavAudioFormat(audio_format=unpacked[0],
                               channel_count=unpacked[1],
                               sample_rate=unpacked[2],
                               byte_rate=unpacked[3],
                               block_align=unpacked[4],
-                              bits_per_sample=unpacked[5]
+                              bits_per_sample=unpacked[5],
+                              valid_bits_per_sample=extensible[0],
+                              channel_mask=extensible[1],
+                              sub_format=extensible[2]
                               )
 
     def _get_info(self, f, encoding):
-        finder = (chunk.signature for chunk in self.main_list
-                  if type(chunk) is ListChunkDescriptor)
+        info_chunk = self._find_list_chunk(b'INFO')
 
-        if b'INFO' in finder:
-            return WavInfoChunkReader(f, encoding)
+        if info_chunk is not None and \
+                self._within_limit(b'INFO', self._list_length(info_chunk)):
+            return WavInfoChunkReader(f, encoding, info_chunk=info_chunk)
 
     def _get_bext(self, f, encoding):
         bext_data = self._find_chunk_data(b'bext', f, default_none=True)
@@ -178,8 +419,24 @@ class WavInfoReader:
     def _get_adm(self, f):
         axml = self._find_chunk_data(b'axml', f, default_none=True)
         chna = self._find_chunk_data(b'chna', f, default_none=True)
-        return WavADMReader(axml_data=axml, chna_data=chna) \
-            if axml and chna else None
+        if not (axml and chna):
+            return None
+
+        from .wave_adm_reader import WavADMReader
+        return WavADMReader(axml_data=axml, chna_data=chna,
+                            block_formats=self.adm_block_formats,
+                            axml_loader=self._read_axml)
+
+    def _read_axml(self) -> bytes:
+        """
+        Read the ``axml`` chunk again, for the block formats the ADM reader
+        leaves out.
+        """
+        with self._open_audio() as f:
+            axml = self._find_chunk_data(b'axml', f)
+
+        assert axml is not None
+        return axml
 
     def _get_dbmd(self, f):
         dbmd_data = self._find_chunk_data(b'dbmd', f, default_none=True)
@@ -188,7 +445,11 @@ class WavInfoReader:
 
     def _get_ixml(self, f):
         ixml_data = self._find_chunk_data(b'iXML', f, default_none=True)
-        return WavIXMLFormat(ixml_data.rstrip(b'\0')) if ixml_data else None
+        if not ixml_data:
+            return None
+
+        from .wave_ixml_reader import WavIXMLFormat
+        return WavIXMLFormat(ixml_data.rstrip(b'\0'))
 
     def _get_cue(self, f):
         cue = next((cue_chunk for cue_chunk in self.main_list if
@@ -196,6 +457,12 @@ class WavInfoReader:
                     cue_chunk.ident == b'cue '), None)
 
         adtl = self._find_list_chunk(b'adtl')
+        if cue is not None and not self._within_limit(b'cue ', cue.length):
+            return None
+        if adtl is not None and \
+                not self._within_limit(b'adtl', self._list_length(adtl)):
+            return None
+
         labls = []
         ltxts = []
         notes = []
@@ -214,19 +481,279 @@ class WavInfoReader:
         sampler_data = self._find_chunk_data(b'smpl', f, default_none=True)
         return WavSmplReader(sampler_data) if sampler_data else None
 
+    def _get_levl(self, f):
+        levl_data = self._find_chunk_data(b'levl', f, default_none=True)
+        return WavLevlReader(levl_data) if levl_data else None
+
+    def _get_md5(self, f):
+        md5_data = self._find_chunk_data(b'MD5 ', f, default_none=True)
+        return WavMD5Reader(md5_data) if md5_data else None
+
+    def frames(self, start: int = 0, stop: Optional[int] = None,
+               channels: 'Channels' = None, as_float: bool = False) -> Any:
+        """
+        Read audio frames from the `data` chunk into a NumPy array. This
+        requires NumPy, installed with ``wavinfo[numpy]``.
+
+        If the reader was created with a path the file is memory-mapped, and
+        for samples with a native NumPy type the array is a read-only view on
+        the map, so samples are only read from disk when they are used. If
+        the reader was created with a stream the frames are read from it.
+
+        :param start: The index of the first frame.
+        :param stop: The index of the frame to stop before, or `None` to read
+            to the end of the data. Like a slice, negative indexes count back
+            from the end.
+        :param channels: The channels to read, an index, slice or sequence of
+            indexes, or `None` for every channel.
+        :param as_float: Scale integer samples to ``float32`` in the range
+            [-1.0, 1.0).
+        :returns: an array of shape (*frames*, *channels*), see
+            :func:`decode_frames()<wavinfo.sample_decoder.decode_frames>`.
+        """
+        from .sample_decoder import decode_frames, require_numpy
+        require_numpy()
+
+        assert self.fmt is not None and self.data is not None
+        start, stop, _ = slice(start, stop).indices(self.data.frame_count)
+        block_align = self.fmt.block_align
+        buffer = self._data_span(start * block_align,
+                                 max(0, stop - start) * block_align)
+
+        return decode_frames(buffer, self.fmt, channels, as_float)
+
+    def iter_blocks(self, block_frames: int, channels: 'Channels' = None,
+                    as_float: bool = False, start: int = 0,
+                    stop: Optional[int] = None) -> Generator[Any, None, None]:
+        """
+        Read audio frames from the `data` chunk in blocks, with sequential
+        reads into a single buffer, so the memory used is the same for any
+        length of file. This requires NumPy, installed with
+        ``wavinfo[numpy]``.
+
+        Blocks may be views on the buffer, which is overwritten by the next
+        block. Copy a block to keep it.
+
+        :param block_frames: The number of frames in each block. The last
+            block has the frames that remain.
+        :param channels: The channels to read, an index, slice or sequence of
+            indexes, or `None` for every channel.
+        :param as_float: Scale integer samples to ``float32`` in the range
+            [-1.0, 1.0).
+        :param start: The index of the first frame.
+        :param stop: The index of the frame to stop before, or `None` to read
+            to the end of the data.
+        :yields: arrays of shape (*frames*, *channels*), see
+            :func:`decode_frames()<wavinfo.sample_decoder.decode_frames>`.
+        """
+        from .sample_decoder import decode_frames, require_numpy
+        require_numpy()
+
+        assert self.fmt is not None
+        for block in self._iter_data(block_frames, start, stop):
+            yield decode_frames(block, self.fmt, channels, as_float)
+
+    def _iter_data(self, block_frames: int, start: int = 0,
+                   stop: Optional[int] = None) \
+            -> Generator[memoryview, None, None]:
+        """
+        Read whole frames of the `data` chunk in blocks, into one buffer that
+        is reused for every block.
+        """
+        assert block_frames > 0, "block_frames must be positive"
+        assert self.fmt is not None and self.data is not None
+        start, stop, _ = slice(start, stop).indices(self.data.frame_count)
+        block_align = self.fmt.block_align
+        yield from self._iter_span(start * block_align,
+                                   max(0, stop - start) * block_align,
+                                   block_frames * block_align, block_align)
+
+    def _iter_span(self, offset: int, length: int, block_size: int,
+                   align: int = 1) -> Generator[memoryview, None, None]:
+        """
+        Read `length` bytes of the `data` chunk from `offset` in blocks of
+        whole multiples of `align`, into one buffer that is reused for every
+        block. Reading stops early if the file ends.
+        """
+        buffer = memoryview(bytearray(block_size))
+        remaining = length
+
+        with self._open_audio() as f:
+            f.seek(self._data_chunk().start + offset)
+            while remaining > 0:
+                read = _read_into(f, buffer[:min(remaining, len(buffer))])
+                read -= read % align
+                if read == 0:
+                    break
+
+                remaining -= read
+                yield buffer[:read]
+
+    def audio_digest(self, algo: str = 'blake2b',
+                     read_size: int = 8 * READ_BLOCK_SIZE) -> str:
+        """
+        Hash the `data` chunk payload alone, so files whose audio is the same
+        have the same digest however their metadata differs.
+
+        :param algo: The name of a :mod:`hashlib` algorithm.
+        :param read_size: The number of bytes read and hashed at once.
+        :returns: the digest, as a hexadecimal string.
+        """
+        digest = hashlib.new(algo)
+        for block in self._iter_span(0, self._data_chunk().length,
+                                     read_size):
+            digest.update(block)
+
+        return digest.hexdigest()
+
+    def extract_channels(self, out_dir: str, naming: str = 'ixml',
+                         stem: Optional[str] = None) -> List[str]:
+        """
+        Write each channel to a mono file, in a single pass over the audio.
+        This requires NumPy, installed with ``wavinfo[numpy]``.
+
+        :param out_dir: The directory to write the mono files to.
+        :param naming: ``'ixml'`` to name files after their iXML track names,
+            or ``'index'`` to name them after their channel numbers.
+        :param stem: The start of each file name, by default the name of this
+            file.
+        :returns: the paths of the mono files, in channel order. See
+            :func:`extract_channels()
+            <wavinfo.channel_extractor.extract_channels>`.
+        """
+        from .channel_extractor import extract_channels
+        return extract_channels(self, out_dir, naming=naming, stem=stem)
+
+    def overviews(self, levels: Sequence[int] = (256, 4096, 65536),
+                  use_levl: bool = True) -> List[Any]:
+        """
+        Build waveform overviews of the audio at several zoom levels. This
+        requires NumPy, installed with ``wavinfo[numpy]``.
+
+        :param levels: The number of frames per point of each level, finest
+            first.
+        :param use_levl: Make the overviews from the file's ``levl`` peak
+            envelope chunk, if it has a suitable one, without reading the
+            audio.
+        :returns: a :class:`WaveformOverview
+            <wavinfo.waveform_overview.WaveformOverview>` for each level.
+        """
+        from .waveform_overview import build_overviews
+        return build_overviews(self, levels=levels, use_levl=use_levl)
+
+    def measure_loudness(self) -> Any:
+        """
+        Measure the EBU R128 loudness and true peak of the audio, and compare
+        them with the loudness declared in the ``bext`` metadata. This
+        requires NumPy, installed with ``wavinfo[numpy]``.
+
+        :returns: a :class:`LoudnessReport
+            <wavinfo.loudness_meter.LoudnessReport>`.
+        """
+        from .loudness_meter import measure_loudness
+        return measure_loudness(self)
+
+    def verify_md5(self, read_size: int = 8 * READ_BLOCK_SIZE) -> Any:
+        """
+        Check the audio against the checksum in the ``MD5 `` chunk.
+
+        :param read_size: The number of bytes read and hashed at once.
+        :returns: an :class:`Md5Verification
+            <wavinfo.md5_checksum.Md5Verification>`.
+        """
+        from .md5_checksum import verify_md5
+        return verify_md5(self, read_size=read_size)
+
+    def check_recording(self, min_zero_seconds: float = 0.1) -> Any:
+        """
+        Check for a truncated `data` chunk, sparse holes and runs of zero
+        samples in each channel, as a recorder that loses power can leave.
+        This requires NumPy, installed with ``wavinfo[numpy]``.
+
+        :param min_zero_seconds: The shortest run of zero samples reported.
+        :returns: a :class:`RecordingCheck
+            <wavinfo.recording_check.RecordingCheck>`.
+        """
+        from .recording_check import check_recording
+        return check_recording(self, min_zero_seconds=min_zero_seconds)
+
+    def check_channels(self, silence_level: float = -60.0) -> List[Any]:
+        """
+        Check each channel for clipping, DC offset, leading and trailing
+        silence and whether it is dead, in one pass over the audio. This
+        requires NumPy, installed with ``wavinfo[numpy]``.
+
+        :param silence_level: The level at or below which a sample is silent,
+            in dBFS.
+        :returns: a :class:`ChannelCheck
+            <wavinfo.channel_check.ChannelCheck>` for each channel.
+        """
+        from .channel_check import check_channels
+        return check_channels(self, silence_level=silence_level)
+
+    @contextmanager
+    def _open_audio(self):
+        """
+        The stream to read audio from, the reader's stream or the file at
+        `path` opened unbuffered.
+        """
+        if self._stream is not None:
+            yield self._stream
+        else:
+            with open(self.path, 'rb', buffering=0) as f:
+                yield f
+
+    def _data_span(self, offset: int, length: int):
+        """
+        `length` bytes of the `data` chunk from `offset`, as a memoryview on
+        the file's memory map or as bytes read from the stream.
+        """
+        start = self._data_chunk().start + offset
+        if self._stream is not None:
+            return read_span(self._stream, start, length)
+
+        if self._audio_map is None:
+            with open(self.path, 'rb') as f:
+                self._audio_map = mmap.mmap(f.fileno(), 0,
+                                            access=mmap.ACCESS_READ)
+
+        return memoryview(self._audio_map)[start:start + length]
+
+    def close(self) -> None:
+        """
+        Release the memory map that :meth:`frames` reads a file's audio
+        from. The file is unmapped once no array from :meth:`frames` still
+        views it, and reading frames after closing maps it again. The reader
+        can also be used as a context manager, which closes it on exit.
+        """
+        # Arrays hold the map itself rather than a buffer export, so closing
+        # it explicitly would pull the memory from under them. Dropping the
+        # reference unmaps it as soon as the last of them goes.
+        self._audio_map = None
+
+    def __enter__(self) -> 'WavInfoReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     # FIXME: this should probably be named "iter()"
-    def walk(self) -> Generator[str, str, Any]:
+    def walk(self, lazy=False) -> Generator[str, str, Any]:
         """
         Walk all of the available metadata fields.
 
+        :param lazy: If `True`, scopes that can be read incrementally
+            (currently "adm") yield generators in place of their larger
+            lists, so the complete metadata is never held in memory at once.
+
         :yields: tuples of the *scope*, *key*, and *value* of
             each metadatum. The *scope* value will be one of
-            "fmt", "data", "ixml", "bext", "info", "dolby", "cues", "adm" or
-            "smpl".
+            "fmt", "data", "ixml", "bext", "info", "dolby", "cues", "adm",
+            "smpl", "levl" or "md5".
         """
 
         scopes = ('fmt', 'data', 'ixml', 'bext', 'info', 'adm', 'cues',
-                  'dolby', 'smpl')
+                  'dolby', 'smpl', 'levl', 'md5')
 
         for scope in scopes:
             if scope in ['fmt', 'data']:
@@ -234,6 +761,11 @@ class WavInfoReader:
                 for field in attr._fields:
                     yield scope, field, attr.__getattribute__(field)
 
+            elif lazy and scope == 'adm':
+                if self.adm:
+                    for key, value in self.adm.iter_dict():
+                        yield scope, key, value
+
             else:
                 mdict = self.__getattribute__(scope).to_dict(
                 ) if self.__getattribute__(scope) else {}
@@ -244,3 +776,20 @@ class WavInfoReader:
         return 'WavInfoReader({}, {}, {})'.format(self.path,
                                                   self.info_encoding,
                                                   self.bext_encoding)
+
+
+def _read_into(f, buffer: memoryview) -> int:
+    """
+    Fill `buffer` from `f`, unless the stream ends first.
+
+    :returns: the number of bytes read.
+    """
+    filled = 0
+    while filled < len(buffer):
+        length = f.readinto(buffer[filled:])
+        if not length:
+            break
+
+        filled += length
+
+    return filled
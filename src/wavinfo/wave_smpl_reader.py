@@ -1,7 +1,13 @@
-import struct
+from struct import Struct
 
 from typing import Tuple, NamedTuple, List
 
+#: The ``smpl`` chunk header
+SMPL_HEADER = Struct("<IIIIiIbbbbII")
+
+#: A sample loop
+SMPL_LOOP = Struct("<IIIIiI")
+
 
 class WaveSmplLoop(NamedTuple):
     ident: int
@@ -42,13 +48,10 @@ class WavSmplReader:
         Read sampler metadata from smpl chunk.
         """
 
-        header_field_fmt = "<IIIIiIbbbbII"
-        loop_field_fmt = "<IIIIiI"
-        header_size = struct.calcsize(header_field_fmt)
-        loop_size = struct.calcsize(loop_field_fmt)
+        header_size = SMPL_HEADER.size
+        loop_size = SMPL_LOOP.size
 
-        unpacked_data = struct.unpack(header_field_fmt,
-                                      smpl_data[0:header_size])
+        unpacked_data = SMPL_HEADER.unpack(smpl_data[0:header_size])
 
         #: The MIDI Manufacturer's Association code for the sampler
         #: manufactuer, or 0 if not specific.
@@ -83,7 +86,7 @@ class WavSmplReader:
         loop_buffer = smpl_data[header_size:
                                 header_size + loop_size * loop_count]
 
-        for unpacked_loop in struct.iter_unpack(loop_field_fmt, loop_buffer):
+        for unpacked_loop in SMPL_LOOP.iter_unpack(loop_buffer):
             self.sample_loops.append(WaveSmplLoop(
                 ident=unpacked_loop[0],
                 loop_type=unpacked_loop[1],
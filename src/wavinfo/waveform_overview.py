@@ -0,0 +1,266 @@
+"""
+Waveform overviews, the minimum, maximum and RMS level of each channel over
+runs of frames, for drawing waveforms at several zoom levels.
+
+The `data` chunk is read once, in blocks, and only the finest level is
+measured from the audio. Each coarser level is reduced from the one before.
+If a file has an EBU ``levl`` peak envelope chunk, overviews can be reduced
+from its peaks instead, without reading the audio at all. This requires
+NumPy, installed with ``wavinfo[numpy]``.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+from .sample_decoder import np, require_numpy
+from .wave_levl_reader import LEVL_FORMAT_UCHAR, LEVL_FORMAT_USHORT
+
+if TYPE_CHECKING:
+    from .wave_reader import WavInfoReader
+
+#: The default number of frames summarized by each point of each level.
+DEFAULT_LEVELS = (256, 4096, 65536)
+
+
+class WaveformOverview(NamedTuple):
+    """
+    One level of a waveform overview.
+    """
+
+    #: The number of frames summarized by each point. The last point may
+    #: summarize fewer.
+    frames_per_point: int
+
+    #: The number of frames summarized by all the points.
+    frame_count: int
+
+    #: The lowest sample of each point, an array of ``float32`` of shape
+    #: (*points*, *channels*) in the range [-1.0, 1.0].
+    minimum: Any
+
+    #: The highest sample of each point, like :attr:`minimum`.
+    maximum: Any
+
+    #: The RMS level of each point, like :attr:`minimum`, or `None` if the
+    #: overview was made from a ``levl`` chunk.
+    rms: Optional[Any]
+
+
+def build_overviews(reader: 'WavInfoReader',
+                    levels: Sequence[int] = DEFAULT_LEVELS,
+                    use_levl: bool = True,
+                    block_frames: int = 1 << 18) -> List[WaveformOverview]:
+    """
+    Build a waveform overview at each of several zoom levels.
+
+    :param reader: The reader of the file.
+    :param levels: The number of frames per point of each level, finest
+        first. Each must be a multiple of the one before.
+    :param use_levl: Reduce the overviews from the file's ``levl`` peak
+        envelope chunk, if it has one with a block size that divides the
+        finest level, in place of reading the audio.
+    :param block_frames: The number of frames read at once. This is rounded
+        down to a multiple of the finest level.
+    :returns: one overview for each level.
+    """
+    require_numpy()
+    assert len(levels) > 0 and levels[0] > 0
+    assert all(coarse % fine == 0 for fine, coarse
+               in zip(levels, levels[1:])), \
+        "Each level must be a multiple of the one before"
+
+    base = _levl_overview(reader, levels[0]) if use_levl else None
+    if base is None:
+        base = _scan_overview(reader, levels[0], block_frames)
+
+    overviews = [base]
+    for frames_per_point in levels[1:]:
+        overviews.append(reduce_overview(overviews[-1], frames_per_point))
+
+    return overviews
+
+
+def reduce_overview(overview: WaveformOverview,
+                    frames_per_point: int) -> WaveformOverview:
+    """
+    Reduce an overview to a coarser level.
+
+    :param frames_per_point: The number of frames per point of the new
+        level, a multiple of `overview`'s.
+    """
+    factor = frames_per_point // overview.frames_per_point
+    assert factor * overview.frames_per_point == frames_per_point
+
+    rms = None
+    if overview.rms is not None:
+        counts = _point_counts(overview.frame_count,
+                               overview.frames_per_point)[:, None]
+        squares = np.square(overview.rms, dtype='f8') * counts
+        rms = np.sqrt(
+            _reduce(np.add, squares, factor) /
+            _point_counts(overview.frame_count, frames_per_point)[:, None]
+        ).astype('f4')
+
+    return WaveformOverview(
+        frames_per_point=frames_per_point,
+        frame_count=overview.frame_count,
+        minimum=_reduce(np.minimum, overview.minimum, factor),
+        maximum=_reduce(np.maximum, overview.maximum, factor),
+        rms=rms)
+
+
+def build_overview_batch(paths: Iterable[str],
+                         max_workers: Optional[int] = None,
+                         **kwargs) -> Dict[str, List[WaveformOverview]]:
+    """
+    Build the waveform overviews of many files, in a pool of processes.
+
+    :param paths: The files to read.
+    :param max_workers: The number of processes, by default the number of
+        processors.
+    :param kwargs: Passed to :func:`build_overviews`.
+    :returns: the overviews of each file, by path.
+    """
+    paths = list(paths)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(partial(_overviews_of_file, **kwargs), paths)
+        return dict(zip(paths, results))
+
+
+def save_overviews(path: str, overviews: Sequence[WaveformOverview]):
+    """
+    Write overviews to a NumPy ``.npz`` sidecar file.
+    """
+    require_numpy()
+    arrays: Dict[str, Any] = {
+        "frame_count": np.array(overviews[0].frame_count)}
+    for overview in overviews:
+        level = overview.frames_per_point
+        arrays[f"minimum_{level}"] = overview.minimum
+        arrays[f"maximum_{level}"] = overview.maximum
+        if overview.rms is not None:
+            arrays[f"rms_{level}"] = overview.rms
+
+    with open(path, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+
+
+def load_overviews(path: str) -> List[WaveformOverview]:
+    """
+    Read overviews written by :func:`save_overviews`.
+    """
+    require_numpy()
+    with np.load(path) as arrays:
+        levels = sorted(int(name.partition('_')[2]) for name in arrays.files
+                        if name.startswith('minimum_'))
+        frame_count = int(arrays["frame_count"])
+        return [WaveformOverview(
+                    frames_per_point=level,
+                    frame_count=frame_count,
+                    minimum=arrays[f"minimum_{level}"],
+                    maximum=arrays[f"maximum_{level}"],
+                    rms=arrays[f"rms_{level}"]
+                    if f"rms_{level}" in arrays.files else None)
+                for level in levels]
+
+
+def _overviews_of_file(path: str, **kwargs) -> List[WaveformOverview]:
+    from .wave_reader import WavInfoReader
+    with WavInfoReader(path) as reader:
+        return build_overviews(reader, **kwargs)
+
+
+def _point_counts(frame_count: int, frames_per_point: int):
+    """
+    The number of frames summarized by each point of a level.
+    """
+    counts = np.full(-(-frame_count // frames_per_point), frames_per_point)
+    if len(counts):
+        counts[-1] = frame_count - (len(counts) - 1) * frames_per_point
+
+    return counts
+
+
+def _reduce(ufunc, values, factor: int):
+    """
+    Reduce each run of `factor` rows of `values` with `ufunc`.
+    """
+    starts = np.arange(0, len(values), factor)
+    if len(starts) == 0:
+        return values[:0]
+
+    return ufunc.reduceat(values, starts, axis=0)
+
+
+def _scan_overview(reader: 'WavInfoReader', frames_per_point: int,
+                   block_frames: int) -> WaveformOverview:
+    assert reader.fmt is not None
+    block_frames = max(1, block_frames // frames_per_point) * frames_per_point
+
+    minimums, maximums, squares = [], [], []
+    frame_count = 0
+    for block in reader.iter_blocks(block_frames, as_float=True):
+        starts = np.arange(0, len(block), frames_per_point)
+        minimums.append(np.minimum.reduceat(block, starts, axis=0))
+        maximums.append(np.maximum.reduceat(block, starts, axis=0))
+        squares.append(np.add.reduceat(np.square(block, dtype='f8'), starts,
+                                       axis=0))
+        frame_count += len(block)
+
+    if not minimums:
+        empty = np.zeros((0, reader.fmt.channel_count), dtype='f4')
+        return WaveformOverview(frames_per_point, 0, empty, empty, empty)
+
+    counts = _point_counts(frame_count, frames_per_point)[:, None]
+    return WaveformOverview(
+        frames_per_point=frames_per_point,
+        frame_count=frame_count,
+        minimum=np.concatenate(minimums).astype('f4', copy=False),
+        maximum=np.concatenate(maximums).astype('f4', copy=False),
+        rms=np.sqrt(np.concatenate(squares) / counts).astype('f4'))
+
+
+def _levl_overview(reader: 'WavInfoReader',
+                   frames_per_point: int) -> Optional[WaveformOverview]:
+    """
+    An overview from the file's ``levl`` chunk, or `None` if it has no
+    ``levl`` chunk that can make one at `frames_per_point`.
+    """
+    levl = reader.levl
+    formats = {LEVL_FORMAT_UCHAR: 'u1', LEVL_FORMAT_USHORT: '<u2'}
+    if levl is None or levl.format not in formats or \
+            levl.points_per_value not in (1, 2) or levl.block_size == 0 or \
+            frames_per_point % levl.block_size:
+        return None
+
+    dtype = np.dtype(formats[levl.format])
+    shape = (levl.peak_frame_count, levl.channel_count, levl.points_per_value)
+    count = shape[0] * shape[1] * shape[2]
+    if len(levl.peak_data) < count * dtype.itemsize:
+        return None
+
+    peaks = np.frombuffer(levl.peak_data, dtype=dtype, count=count) \
+        .reshape(shape)
+
+    # Peaks are magnitudes, the negative peak is stored as a positive value
+    levels = peaks.astype('f4') / levl.full_scale
+    maximum = levels[:, :, 0]
+    minimum = -levels[:, :, -1]
+
+    assert reader.data is not None
+    frame_count = min(reader.data.frame_count,
+                      levl.peak_frame_count * levl.block_size)
+    return reduce_overview(
+        WaveformOverview(levl.block_size, frame_count, minimum, maximum,
+                         None),
+        frames_per_point)
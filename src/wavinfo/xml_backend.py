@@ -0,0 +1,118 @@
+"""
+XML parsing for the iXML and ADM scopes.
+
+`lxml`_ is used if it is installed, otherwise the standard library's
+:mod:`xml.etree.ElementTree`. Only the iXML and ADM readers import this
+module, so files without those chunks never load an XML library.
+
+.. _lxml: https://lxml.de
+"""
+
+from typing import Any, Dict, Generator, Optional, Tuple, cast
+
+try:
+    from lxml import etree as ET
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET  # type: ignore
+    HAS_LXML = False
+
+
+def _lxml() -> Any:
+    """
+    :mod:`lxml.etree`, when :data:`HAS_LXML` is `True`, for calls that the
+    standard library's type stubs don't allow.
+    """
+    return cast(Any, ET)
+
+
+def parse(source, recover: bool = False) -> Any:
+    """
+    Parse a document into an ElementTree.
+
+    :param source: A file-like object to read.
+    :param recover: Try to read past errors in a malformed document. Without
+        `lxml` this can only discard trailing garbage after the last tag.
+    """
+    if HAS_LXML:
+        parser = _lxml().XMLParser(recover=True) if recover else None
+        return _lxml().parse(source, parser=parser)
+
+    if not recover:
+        return ET.parse(source)
+
+    data = source.read()
+    try:
+        return ET.ElementTree(ET.fromstring(data))
+    except ET.ParseError:
+        return ET.ElementTree(ET.fromstring(data[:data.rfind(b'>') + 1]))
+
+
+def tostring(tree) -> str:
+    """
+    Serialize an ElementTree.
+    """
+    if HAS_LXML:
+        return ET.tostring(tree).decode("utf-8")
+    else:
+        return ET.tostring(tree.getroot(), encoding="unicode")
+
+
+def namespaces(tree) -> Dict[Optional[str], str]:
+    """
+    The namespace map for ``find()`` on `tree`, with the document's default
+    namespace in the form each backend expects.
+    """
+    root = tree.getroot()
+    if HAS_LXML:
+        return root.nsmap
+
+    if root.tag.startswith("{"):
+        return {'': root.tag[1:root.tag.index("}")]}
+    else:
+        return {}
+
+
+class IterParser:
+    """
+    Incrementally parse a document, yielding each element with a certain
+    local name when it is complete.
+
+    The parser keeps every other element, once the iteration is exhausted the
+    document's root element is available as :attr:`root`.
+    """
+
+    def __init__(self, source, local_name: str):
+        self.source = source
+        self.local_name = local_name
+
+        #: The root element, after the iteration is exhausted.
+        self.root = None
+
+    def __iter__(self) -> Generator[Tuple[Any, Any], None, None]:
+        """
+        :yields: the parent of each matching element, or `None` for the
+            root element, and the element. The caller may clear the element
+            and remove it from its parent.
+        """
+        if HAS_LXML:
+            context = _lxml().iterparse(self.source, events=('end',),
+                                        tag='{*}' + self.local_name)
+            for _, elem in context:
+                yield elem.getparent(), elem
+
+            self.root = context.root
+            return
+
+        stack = []
+        for event, elem in ET.iterparse(self.source,
+                                        events=('start', 'end')):
+            if event == 'start':
+                if self.root is None:
+                    self.root = elem
+
+                stack.append(elem)
+            else:
+                stack.pop()
+                if elem.tag.rpartition("}")[2] == self.local_name:
+                    yield (stack[-1] if stack else None), elem
@@ -1,6 +1,7 @@
 from unittest import TestCase
 
 import wavinfo
+from wavinfo.wave_adm_reader import ChannelTable, WavADMReader
 
 class TestADMWave(TestCase):
 
@@ -18,6 +19,47 @@ class TestADMWave(TestCase):
         assert adm is not None
         self.assertEqual(len(adm.channel_uids), 14)
 
+    def test_chna_lookup(self):
+        info = wavinfo.WavInfoReader(self.protools_adm_wav)
+        adm = info.adm
+        assert adm is not None
+
+        entry = adm.channel_uids.find(13)
+        assert entry is not None
+        self.assertEqual(entry, adm.channel_uids[13])
+        self.assertEqual(entry.uid, 'ATU_0000000e')
+        self.assertEqual(entry.track_ref, 'AT_00031004_01')
+        self.assertEqual(entry.pack_ref, 'AP_00031004')
+        self.assertIsNone(adm.channel_uids.find(14))
+        self.assertEqual([e.track_index for e in adm.channel_uids],
+                         list(range(14)))
+        self.assertEqual(adm.channel_uids[-2:], list(adm.channel_uids)[-2:])
+        self.assertEqual(adm.channel_uids[::5],
+                         [adm.channel_uids[i] for i in (0, 5, 10)])
+
+    def test_chna_equality(self):
+        first = wavinfo.WavInfoReader(self.protools_adm_wav).adm
+        second = wavinfo.WavInfoReader(self.protools_adm_wav).adm
+        assert first is not None and second is not None
+
+        self.assertEqual(first.channel_uids, second.channel_uids)
+        self.assertEqual(first.channel_uids, list(first.channel_uids))
+        self.assertNotEqual(first.channel_uids, first.channel_uids[1:])
+        self.assertEqual(repr(first.channel_uids),
+                         f"ChannelTable({list(first.channel_uids)!r})")
+
+    def test_chna_duplicate_track(self):
+        chna = ChannelTable.Header.pack(2, 2) + \
+            ChannelTable.Entry.pack(1, b'ATU_00000001', b'AT_00010001_01',
+                                    b'AP_00010001') + \
+            ChannelTable.Entry.pack(1, b'ATU_00000002', b'AT_00010002_01',
+                                    b'AP_00010002')
+        table = ChannelTable(chna)
+
+        entry = table.find(0)
+        assert entry is not None
+        self.assertEqual(entry.uid, 'ATU_00000001')
+
     def test_to_dict(self):
         info = wavinfo.WavInfoReader(self.protools_adm_wav)
         adm = info.adm
@@ -52,3 +94,57 @@ class TestADMWave(TestCase):
         self.assertTrue("content_name" in t10.keys())
         self.assertEqual("Dialog", t10["content_name"])
         
+
+    def test_block_format_modes(self):
+        keep = wavinfo.WavInfoReader(self.protools_adm_wav)
+        assert keep.adm is not None
+        block_count = len(list(keep.adm.block_formats()))
+        self.assertEqual(block_count, 374)
+
+        for mode in ('skip', 'summarize', 'stream'):
+            info = wavinfo.WavInfoReader(self.protools_adm_wav,
+                                         adm_block_formats=mode)
+            adm = info.adm
+            assert adm is not None
+            self.assertNotIn("audioBlockFormat", adm.xml_str())
+            self.assertEqual(adm.to_dict(), keep.adm.to_dict())
+            self.assertEqual(len(list(adm.block_formats())), block_count)
+
+    def test_block_format_data_released(self):
+        info = wavinfo.WavInfoReader(self.protools_adm_wav)
+        with open(self.protools_adm_wav, 'rb') as f:
+            axml = info._find_chunk_data(b'axml', f)
+            chna = info._find_chunk_data(b'chna', f)
+
+        for mode in ('skip', 'summarize'):
+            adm = WavADMReader(axml, chna, block_formats=mode)
+            self.assertFalse(any(type(value) is bytes
+                                 for value in vars(adm).values()))
+            with self.assertRaises(ValueError):
+                next(adm.block_formats())
+
+        adm = WavADMReader(axml, chna, block_formats='stream')
+        self.assertEqual(len(list(adm.block_formats())), 374)
+
+    def test_block_format_summary(self):
+        info = wavinfo.WavInfoReader(self.protools_adm_wav,
+                                     adm_block_formats='summarize')
+        adm = info.adm
+        assert adm is not None
+        summary = adm.block_format_summary
+        assert summary is not None
+        self.assertEqual(sum(s.count for s in summary.values()), 374)
+        self.assertEqual(summary['AC_00011001'].count, 1)
+        self.assertIsNone(summary['AC_00011001'].start)
+        self.assertEqual(summary['AC_00031001'].count, 95)
+        self.assertEqual(summary['AC_00031001'].start, 0.0)
+        self.assertAlmostEqual(summary['AC_00031001'].end, 1.001)
+
+    def test_iter_dict(self):
+        info = wavinfo.WavInfoReader(self.protools_adm_wav)
+        adm = info.adm
+        assert adm is not None
+        lazy = dict(adm.iter_dict())
+        lazy['channel_entries'] = list(lazy['channel_entries'])
+        lazy['programme']['contents'] = list(lazy['programme']['contents'])
+        self.assertEqual(lazy, adm.to_dict())
@@ -0,0 +1,63 @@
+import os
+import tempfile
+from unittest import TestCase, skipUnless
+
+import wavinfo
+from wavinfo.channel_check import check_channels_batch
+from wavinfo.recording_check import SampleRun
+from wavinfo.sample_decoder import np
+
+from .utils import write_wave
+
+
+@skipUnless(np is not None, "requires NumPy")
+class TestChannelCheck(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'test.wav')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_checks(self):
+        samples = np.zeros((48000, 3))
+        tone = 16384 * np.sin(np.arange(48000) * 0.1)
+
+        # Clipped runs of five and two samples, and a negative run of four
+        samples[:, 0] = tone
+        samples[1000:1005, 0] = 32767
+        samples[2000:2002, 0] = 32767
+        samples[47996:, 0] = -32768
+
+        # Channel 1 is dead, channel 2 is offset and silent at either end
+        samples[100:40000, 2] = 3000 + tone[100:40000] / 4
+
+        write_wave(self.path, samples.astype('<i2').tobytes(),
+                   channels=samples.shape[1])
+        checks = check_channels_batch([self.path], max_workers=1,
+                                      block_frames=1000)[self.path]
+
+        self.assertEqual(checks[0].clipped_samples, 11)
+        self.assertEqual(checks[0].clipped_runs,
+                         [SampleRun(1000, 1005), SampleRun(47996, 48000)])
+        self.assertEqual(checks[0].peak, 1.0)
+        self.assertFalse(checks[0].dead)
+        self.assertEqual(checks[0].leading_silence, 1)
+
+        self.assertTrue(checks[1].dead)
+        self.assertEqual(checks[1].peak, 0.0)
+        self.assertEqual(checks[1].leading_silence, 48000)
+
+        self.assertEqual(checks[2].leading_silence, 100)
+        self.assertEqual(checks[2].trailing_silence, 8000)
+        self.assertAlmostEqual(checks[2].dc_offset,
+                               3000 / 32768 * 39900 / 48000, delta=1e-3)
+        self.assertEqual(checks[2].clipped_samples, 0)
+
+    def test_dead_file(self):
+        info = wavinfo.WavInfoReader(
+            'tests/test_files/sounddevices/A101_1.WAV')
+        self.assertTrue(all(check.dead for check in info.check_channels()))
+        self.assertFalse(any(check.dead for check
+                             in info.check_channels(silence_level=-100)))
@@ -0,0 +1,80 @@
+import os
+import tempfile
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+import wavinfo
+from wavinfo.sample_decoder import np
+
+
+@skipUnless(np is not None, "requires NumPy")
+class TestChannelExtractor(TestCase):
+
+    def test_extract_channels(self):
+        info = wavinfo.WavInfoReader(
+            'tests/test_files/sounddevices/A101_1.WAV')
+        frames = info.frames()
+
+        with tempfile.TemporaryDirectory() as out_dir:
+            paths = info.extract_channels(out_dir)
+            self.assertEqual([os.path.basename(p) for p in paths],
+                             ['A101_1_MKH516 A.wav', 'A101_1_Boom.wav'])
+
+            for channel, path in enumerate(paths):
+                mono = wavinfo.WavInfoReader(path)
+                assert mono.fmt is not None and mono.ixml is not None
+                assert mono.bext is not None and info.bext is not None
+                self.assertEqual(mono.fmt.channel_count, 1)
+                self.assertEqual(mono.fmt.bits_per_sample, 24)
+                self.assertTrue(np.array_equal(mono.frames()[:, 0],
+                                               frames[:, channel]))
+                self.assertEqual(mono.bext.time_reference,
+                                 info.bext.time_reference)
+                self.assertEqual(mono.ixml.family_uid, info.ixml.family_uid)
+                tracks = list(mono.ixml.track_list)
+                self.assertEqual(len(tracks), 1)
+                self.assertEqual(tracks[0].interleave_index, '1')
+
+    def test_extract_extensible(self):
+        info = wavinfo.WavInfoReader(
+            'tests/test_files/nuendo/wavinfo Test Project - Audio - 5.1.wav')
+
+        with tempfile.TemporaryDirectory() as out_dir:
+            paths = info.extract_channels(out_dir, naming='index',
+                                          stem='mix')
+            self.assertEqual([os.path.basename(p) for p in paths],
+                             [f"mix_{n}.wav" for n in range(1, 7)])
+
+            masks = []
+            for path in paths:
+                mono = wavinfo.WavInfoReader(path)
+                assert mono.fmt is not None
+                self.assertEqual(mono.fmt.format_tag, 1)
+                masks.append(mono.fmt.channel_mask)
+
+        self.assertEqual(masks, [1, 2, 4, 8, 16, 32])
+
+    def test_extensible_without_sub_format(self):
+        info = wavinfo.WavInfoReader(
+            'tests/test_files/nuendo/wavinfo Test Project - Audio - 5.1.wav')
+        assert info.fmt is not None
+        info.fmt = info.fmt._replace(sub_format=None)
+
+        with tempfile.TemporaryDirectory() as out_dir:
+            with self.assertRaises(ValueError):
+                info.extract_channels(out_dir)
+            self.assertEqual(os.listdir(out_dir), [])
+
+    def test_failure_leaves_no_files(self):
+        info = wavinfo.WavInfoReader(
+            'tests/test_files/sounddevices/A101_1.WAV')
+
+        def failing_blocks(block_frames):
+            yield b'\0' * info.fmt.block_align * 16
+            raise OSError("read failed")
+
+        with tempfile.TemporaryDirectory() as out_dir:
+            with patch.object(info, '_iter_data', failing_blocks), \
+                    self.assertRaises(OSError):
+                info.extract_channels(out_dir)
+            self.assertEqual(os.listdir(out_dir), [])
@@ -2,6 +2,11 @@ from unittest import TestCase
 from glob import glob
 
 import wavinfo
+from wavinfo.wave_cues_reader import WavCuesReader, CueEntry, LabelEntry, \
+    RangeLabel, CueTable
+
+from struct import pack
+from io import BytesIO
 
 class TestCue(TestCase):
     def setUp(self) -> None:
@@ -70,6 +75,159 @@ class TestCue(TestCase):
             elif label.name == 3:
                 self.assertEqual(label.text, "Marker 3")
 
+    def test_join_many(self):
+        count = 5000
+        cues = [CueEntry(name=n, position=0, chunk_id=b'data', chunk_start=0,
+                         block_start=0, sample_offset=n * 10)
+                for n in range(count)]
+        labels = [LabelEntry(name=n, text=f"Marker {n}")
+                  for n in range(count)]
+        labels.append(LabelEntry(name=0, text="Duplicate"))
+        ranges = [RangeLabel(name=n, length=n, purpose=b'rgn ', country=0,
+                             language=0, dialect=0, codepage=0, text="")
+                  for n in range(0, count, 2)]
+        reader = WavCuesReader(cues=cues, labels=labels, ranges=ranges,
+                               notes=[])
+
+        self.assertEqual(reader.label_and_note(0), ("Marker 0", None))
+        d = reader.to_dict()
+        self.assertEqual(len(d), count)
+        self.assertEqual(d[4], {'frame': 40, 'label': 'Marker 4',
+                                'length': 4})
+        self.assertEqual(d[5], {'frame': 50, 'label': 'Marker 5'})
+
+    def test_cue_table(self):
+        entries = [CueEntry(name=n, position=n * 2, chunk_id=b'data',
+                            chunk_start=0, block_start=0,
+                            sample_offset=n * 3)
+                   for n in range(1, 1001)]
+        data = b''.join(pack(CueEntry.Format, *e) for e in entries)
+
+        table = CueTable.read(data, len(entries))
+        self.assertEqual(len(table), 1000)
+        self.assertEqual(list(table), entries)
+        self.assertEqual(table[-1], entries[-1])
+        self.assertEqual(table[10:20:3], entries[10:20:3])
+        self.assertIn(entries[500], table)
+        self.assertEqual(table.index(entries[500]), 500)
+        self.assertEqual(list(table.sample_offsets),
+                         [e.sample_offset for e in entries])
+        self.assertEqual(list(CueTable.from_entries(entries)), entries)
+        self.assertEqual(CueTable.from_entries(entries), table)
+        self.assertEqual(table, entries)
+        self.assertNotEqual(table, entries[1:])
+        self.assertEqual(repr(CueTable.from_entries(entries[:2])),
+                         f"CueTable({entries[:2]!r})")
+
+    def test_reader_equality(self):
+        file1 = "tests/test_files/cue_chunks/STE-000.wav"
+        w1 = wavinfo.WavInfoReader(file1)
+        w2 = wavinfo.WavInfoReader(file1)
+        assert w1.cues is not None and w2.cues is not None
+
+        self.assertEqual(w1.cues, w2.cues)
+        self.assertEqual(w1.cues.cues, list(w1.cues.cues))
+        self.assertIn("CueEntry(", repr(w1.cues))
+
+    def test_time_queries(self):
+        file = "tests/test_files/cue_chunks/izotoperx_cues_test.wav"
+        w = wavinfo.WavInfoReader(file)
+        assert w.cues is not None
+
+        self.assertEqual(w.cues.cues_between(0, 5000), [(1, 1000)])
+        self.assertEqual(w.cues.cues_between(1000, 10001),
+                         [(1, 1000), (2, 5000), (3, 10000)])
+        self.assertEqual(w.cues.cues_between(10001, 20000), [])
 
+        self.assertEqual(w.cues.regions_overlapping(0, 5000), [])
+        self.assertEqual(w.cues.regions_overlapping(9000, 9500),
+                         [(2, 5000, 5000)])
+        self.assertEqual(w.cues.regions_overlapping(9999, 10001),
+                         [(2, 5000, 5000), (3, 10000, 10000)])
+        self.assertEqual(w.cues.regions_overlapping(10000, 10001),
+                         [(3, 10000, 10000)])
+        self.assertEqual(w.cues.regions_overlapping(0, 100000),
+                         [(2, 5000, 5000), (3, 10000, 10000)])
 
+    def test_time_queries_brute_force(self):
+        cues = [CueEntry(name=n, position=0, chunk_id=b'data', chunk_start=0,
+                         block_start=0, sample_offset=(n * 7919) % 1000)
+                for n in range(200)]
+        ranges = [RangeLabel(name=n, length=(n * 31) % 50, purpose=b'rgn ',
+                             country=0, language=0, dialect=0, codepage=0,
+                             text="")
+                  for n in range(0, 200, 3)]
+        reader = WavCuesReader(cues=cues, labels=[], ranges=ranges, notes=[])
+
+        for start, end in [(0, 10), (100, 250), (995, 1100), (500, 501)]:
+            expected = sorted(((c.name, c.sample_offset) for c in cues
+                               if start <= c.sample_offset < end),
+                              key=lambda c: c[1])
+            self.assertEqual(sorted(reader.cues_between(start, end)),
+                             sorted(expected))
+
+            expected_regions = [
+                (r.name, cues[r.name].sample_offset, r.length)
+                for r in ranges
+                if cues[r.name].sample_offset < end and
+                (cues[r.name].sample_offset + r.length > start or
+                 cues[r.name].sample_offset >= start)]
+            self.assertEqual(sorted(reader.regions_overlapping(start, end)),
+                             sorted(expected_regions))
+
+    def test_long_region_among_short(self):
+        # A marker over the whole file, then many short regions
+        count = 5000
+        cues = [CueEntry(name=n, position=0, chunk_id=b'data', chunk_start=0,
+                         block_start=0, sample_offset=n * 100)
+                for n in range(count)]
+        ranges = [RangeLabel(name=n, length=count * 100 if n == 0 else 50,
+                             purpose=b'rgn ', country=0, language=0,
+                             dialect=0, codepage=0, text="")
+                  for n in range(count)]
+        reader = WavCuesReader(cues=cues, labels=[], ranges=ranges, notes=[])
+
+        self.assertEqual(reader.regions_overlapping(250_040, 250_140),
+                         [(0, 0, 500_000), (2500, 250_000, 50),
+                          (2501, 250_100, 50)])
+        self.assertEqual(reader.regions_overlapping(250_060, 250_090),
+                         [(0, 0, 500_000)])
+        self.assertEqual(reader.regions_overlapping(500_000, 600_000), [])
+        self.assertEqual(len(reader.regions_overlapping(0, 500_000)), count)
+
+    def test_adtl_single_read(self):
+        file = "tests/test_files/cue_chunks/izotoperx_cues_test.wav"
+        w = wavinfo.WavInfoReader(file)
+        adtl = w._find_list_chunk(b'adtl')
+        assert adtl is not None
+
+        def children(ident):
+            return [c for c in adtl.children if c.ident == ident]
+
+        class CountingIO(BytesIO):
+            reads = 0
+
+            def read(self, *args):
+                CountingIO.reads += 1
+                return super().read(*args)
+
+        with open(file, 'rb') as f:
+            stream = CountingIO(f.read())
+
+        cues = WavCuesReader.read_all(stream, None, children(b'labl'),
+                                      children(b'ltxt'), children(b'note'),
+                                      fallback_encoding='latin_1')
+        self.assertEqual(CountingIO.reads, 1)
+        assert w.cues is not None
+        self.assertEqual(cues.labels, w.cues.labels)
+        self.assertEqual(cues.notes, w.cues.notes)
+        self.assertEqual(cues.ranges, w.cues.ranges)
 
+    def test_cue_count_past_chunk(self):
+        from wavinfo.riff_parser import ChunkDescriptor
+        data = pack("<I", 1000) + bytes(CueEntry.format_size())
+        cues = ChunkDescriptor(ident=b'cue ', start=0, length=len(data),
+                               rf64_context=None)
+        with self.assertRaises(ValueError):
+            WavCuesReader.read_all(BytesIO(data), cues, [], [], [],
+                                   fallback_encoding='latin_1')
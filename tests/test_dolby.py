@@ -1,7 +1,9 @@
 from unittest import TestCase
+from unittest.mock import patch
 
 import wavinfo
-from wavinfo.wave_dbmd_reader import SegmentType, DolbyDigitalPlusMetadata
+from wavinfo.wave_dbmd_reader import SegmentType, DolbyDigitalPlusMetadata, \
+    WavDolbyMetadataReader
 
 class TestDolby(TestCase):
     def setUp(self):
@@ -58,3 +60,41 @@ class TestDolby(TestCase):
                          "Failed to find exactly one Atmos metadata segment")
 
     
+    def test_lazy_segments(self):
+        loads = []
+        original_load = WavDolbyMetadataReader.Loaders[SegmentType.DolbyAtmos]
+
+        def counting_load(payload):
+            loads.append(payload)
+            return original_load(payload)
+
+        with patch.dict(WavDolbyMetadataReader.Loaders,
+                        {SegmentType.DolbyAtmos: counting_load}):
+            t1 = wavinfo.WavInfoReader(self.test_file)
+            d = t1.dolby
+            assert d is not None
+            self.assertEqual(loads, [])
+
+            first = d.dolby_atmos()
+            self.assertEqual(len(loads), 1)
+            self.assertEqual(d.dolby_atmos(), first)
+            self.assertEqual(len(loads), 1)
+
+    def test_supplemental(self):
+        t1 = wavinfo.WavInfoReader(self.test_file)
+        d = t1.dolby
+        assert d is not None
+        sup = d.dolby_atmos_supplemental()
+        self.assertEqual(len(sup), 1)
+        self.assertEqual(sup[0].object_count, 14)
+        self.assertEqual(sup[0].trim_modes, [1] * 9)
+
+    def test_segment_checksum(self):
+        payload = bytes(range(256)) * 3
+        expected = len(payload)
+        for b in payload:
+            expected = (expected + b) & 0xff
+        expected = ((~expected) + 1) & 0xff
+
+        self.assertEqual(WavDolbyMetadataReader.segment_checksum(
+            payload, len(payload)), expected)
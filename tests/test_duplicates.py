@@ -0,0 +1,66 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import wavinfo
+from wavinfo.duplicate_finder import HEADER_SIZE_LIMITS, find_duplicates
+
+
+class TestDuplicates(TestCase):
+
+    def test_audio_digest(self):
+        path = 'tests/test_files/sounddevices/A101_4.WAV'
+        info = wavinfo.WavInfoReader(path)
+        assert info.data is not None
+
+        with open(path, 'rb') as f:
+            f.seek(info._data_chunk().start)
+            expected = hashlib.sha256(f.read(info.data.byte_count))
+
+        self.assertEqual(info.audio_digest('sha256', read_size=1000),
+                         expected.hexdigest())
+        self.assertEqual(info.audio_digest(),
+                         wavinfo.WavInfoReader(
+                             'tests/test_files/protools/PT A101_4.A1.wav')
+                         .audio_digest())
+
+    def test_find_duplicates(self):
+        with tempfile.TemporaryDirectory() as dir:
+            copy = os.path.join(dir, 'copy.wav')
+            shutil.copyfile('tests/test_files/sounddevices/A101_4.WAV', copy)
+
+            # Same format and length as the original, different audio
+            altered = os.path.join(dir, 'altered.wav')
+            shutil.copyfile(copy, altered)
+            with open(altered, 'r+b') as f:
+                f.seek(-1, os.SEEK_END)
+                f.write(b'\x01')
+
+            groups = find_duplicates(
+                ['tests/test_files/sounddevices/A101_1.WAV',
+                 'tests/test_files/protools/PT A101_4.A1.wav',
+                 altered,
+                 'tests/test_files/sounddevices/A101_4.WAV',
+                 copy], max_workers=2)
+
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(groups[0].paths,
+                         ['tests/test_files/protools/PT A101_4.A1.wav',
+                          'tests/test_files/sounddevices/A101_4.WAV',
+                          copy])
+        self.assertEqual(groups[0].byte_count, 864840)
+
+    def test_no_candidates(self):
+        paths = ['tests/test_files/sounddevices/A101_1.WAV',
+                 'tests/test_files/sounddevices/A101_4.WAV']
+        with patch('wavinfo.duplicate_finder.ProcessPoolExecutor') as pool:
+            self.assertEqual(find_duplicates(paths), [])
+        pool.assert_not_called()
+
+    def test_header_limits(self):
+        self.assertEqual(HEADER_SIZE_LIMITS['md5'], 0)
+        self.assertNotIn('fmt', HEADER_SIZE_LIMITS)
+        self.assertNotIn('data', HEADER_SIZE_LIMITS)
@@ -0,0 +1,74 @@
+from glob import glob
+from unittest import TestCase
+from unittest.mock import patch
+
+from wavinfo.family_scanner import scan_families
+from wavinfo.wave_ixml_reader import WavIXMLFormat
+
+
+class TestFamily(TestCase):
+    def test_metacorder_families(self):
+        paths = sorted(glob("tests/test_files/metacorder/*.WAV"))
+        families = scan_families(paths)
+
+        self.assertEqual(len(families), 2)
+        self.assertEqual([f.family_uid for f in families],
+                         ['1360855064', '1360855285'])
+
+        family = families[0]
+        self.assertEqual(len(family.deltas), 5)
+        self.assertEqual(family.common['ixml']['scene'], '001')
+        self.assertEqual(family.deltas[paths[0]], {})
+
+        second = family.deltas[paths[1]]
+        self.assertEqual(list(second.keys()), ['ixml'])
+        self.assertEqual(second['ixml']['track_list'][0]['name'],
+                         'Lav Georgie')
+
+    def test_identical_ixml_parsed_once(self):
+        path = "tests/test_files/sounddevices/A101_1.WAV"
+        parsed = []
+        original_init = WavIXMLFormat.__init__
+
+        def counting_init(ixml, xml):
+            parsed.append(xml)
+            original_init(ixml, xml)
+
+        with patch.object(WavIXMLFormat, '__init__', counting_init):
+            families = scan_families([path, path])
+
+        self.assertEqual(len(parsed), 1)
+        self.assertEqual(len(families), 1)
+        self.assertEqual(families[0].deltas, {path: {}})
+
+    def test_bounded_ixml_cache(self):
+        from wavinfo import family_scanner
+
+        paths = sorted(glob("tests/test_files/metacorder/*.WAV"))
+        interleaved = paths[::2] + paths[1::2]
+        expected = scan_families(interleaved)
+
+        sizes = []
+        original_get = family_scanner._IXMLCache.get
+
+        def recording_get(cache, ixml_data):
+            retval = original_get(cache, ixml_data)
+            sizes.append(len(cache.entries))
+            return retval
+
+        with patch.object(family_scanner, 'IXML_CACHE_SIZE', 2), \
+                patch.object(family_scanner._IXMLCache, 'get', recording_get):
+            families = scan_families(interleaved)
+
+        self.assertEqual(len(sizes), len(paths))
+        self.assertLessEqual(max(sizes), 2)
+        self.assertEqual(families, expected)
+
+    def test_no_family(self):
+        paths = glob("tests/test_files/smpl/*.wav")
+        families = scan_families(paths)
+
+        self.assertEqual(len(families), len(paths))
+        for family in families:
+            self.assertIsNone(family.family_uid)
+            self.assertIsNone(family.common['ixml'])
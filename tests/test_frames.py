@@ -0,0 +1,120 @@
+import struct
+import weakref
+from unittest import TestCase, skipUnless
+
+import wavinfo
+from wavinfo.sample_decoder import np
+
+
+@skipUnless(np is not None, "requires NumPy")
+class TestFrames(TestCase):
+
+    def raw_data(self, info, start, stop):
+        assert info.fmt is not None
+        block_align = info.fmt.block_align
+        chunk = info._data_chunk()
+        with open(info.path, 'rb') as f:
+            f.seek(chunk.start + start * block_align)
+            return f.read((stop - start) * block_align)
+
+    def test_int16_view(self):
+        info = wavinfo.WavInfoReader('tests/test_files/cue_chunks/STE-000.wav')
+        assert info.fmt is not None and info.data is not None
+        self.assertEqual(info.fmt.bits_per_sample, 16)
+
+        frames = info.frames(1000, 1100)
+        self.assertEqual(frames.shape, (100, 2))
+        self.assertEqual(frames.dtype, np.dtype('<i2'))
+        self.assertFalse(frames.flags.owndata)
+        self.assertFalse(frames.flags.writeable)
+
+        raw = self.raw_data(info, 1000, 1100)
+        self.assertEqual(frames.ravel().tolist(),
+                         list(struct.unpack("<200h", raw)))
+
+        self.assertEqual(len(info.frames()), info.data.frame_count)
+        self.assertEqual(info.frames(-10).shape, (10, 2))
+        self.assertEqual(info.frames(10, 5).shape, (0, 2))
+        self.assertEqual(info.frames(1000, 1100, channels=1).tolist(),
+                         frames[:, 1:].tolist())
+
+    def test_close(self):
+        path = 'tests/test_files/cue_chunks/STE-000.wav'
+        with wavinfo.WavInfoReader(path) as info:
+            first = info.frames(0, 100).copy()
+            audio_map = weakref.ref(info._audio_map)
+
+        self.assertIsNone(info._audio_map)
+        self.assertIsNone(audio_map())
+
+        # a view on the map keeps it until the view goes
+        frames = info.frames(0, 100)
+        audio_map = weakref.ref(info._audio_map)
+        info.close()
+        self.assertEqual(frames.tolist(), first.tolist())
+        del frames
+        self.assertIsNone(audio_map())
+
+    def test_int24_unpack(self):
+        info = wavinfo.WavInfoReader(
+            'tests/test_files/sounddevices/A101_1.WAV')
+        assert info.fmt is not None
+        self.assertEqual(info.fmt.block_align // info.fmt.channel_count, 3)
+
+        frames = info.frames(0, 500)
+        self.assertEqual(frames.dtype, np.dtype('int32'))
+
+        raw = self.raw_data(info, 0, 500)
+        expected = [int.from_bytes(raw[i:i + 3], 'little', signed=True)
+                    for i in range(0, len(raw), 3)]
+        self.assertEqual(frames.ravel().tolist(), expected)
+
+        right = info.frames(0, 500, channels=[1])
+        self.assertEqual(right[:, 0].tolist(), frames[:, 1].tolist())
+
+        scaled = info.frames(0, 500, as_float=True)
+        self.assertEqual(scaled.dtype, np.dtype('float32'))
+        self.assertTrue(np.allclose(scaled, frames / 2.0 ** 23))
+
+    def test_float_stream(self):
+        path = 'tests/test_files/cue_chunks/izotoperx_cues_test.wav'
+        with open(path, 'rb') as f:
+            info = wavinfo.WavInfoReader(f)
+            frames = info.frames(0, 64)
+
+        self.assertEqual(frames.dtype, np.dtype('<f4'))
+        with open(path, 'rb') as f:
+            chunk = info._data_chunk()
+            f.seek(chunk.start)
+            raw = f.read(64 * 4)
+
+        self.assertEqual(frames[:, 0].tolist(),
+                         list(struct.unpack("<64f", raw)))
+
+    def test_iter_blocks(self):
+        info = wavinfo.WavInfoReader(
+            'tests/test_files/sounddevices/A101_1.WAV')
+        assert info.data is not None
+
+        blocks = [block.copy() for block in info.iter_blocks(10000)]
+        self.assertTrue(all(len(block) == 10000 for block in blocks[:-1]))
+        self.assertEqual(sum(len(block) for block in blocks),
+                         info.data.frame_count)
+        self.assertTrue(np.array_equal(np.concatenate(blocks),
+                                       info.frames()))
+
+        blocks = list(info.iter_blocks(300, channels=1, as_float=True,
+                                       start=100, stop=1000))
+        self.assertEqual([len(block) for block in blocks], [300, 300, 300])
+        self.assertTrue(np.array_equal(
+            np.concatenate(blocks),
+            info.frames(100, 1000, channels=1, as_float=True)))
+
+    def test_iter_blocks_stream(self):
+        path = 'tests/test_files/cue_chunks/STE-000.wav'
+        with open(path, 'rb') as f:
+            info = wavinfo.WavInfoReader(f)
+            blocks = [block.copy() for block in info.iter_blocks(4096)]
+
+        self.assertTrue(np.array_equal(np.concatenate(blocks),
+                                       wavinfo.WavInfoReader(path).frames()))
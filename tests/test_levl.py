@@ -0,0 +1,57 @@
+import struct
+from io import BytesIO
+from unittest import TestCase
+
+import wavinfo
+from wavinfo.wave_levl_reader import LEVL_FORMAT_USHORT, WavLevlReader
+
+from .utils import wave_file
+
+
+def levl_chunk(peaks, format=LEVL_FORMAT_USHORT, points_per_value=2,
+               channels=2, block_size=256, position=0xFFFFFFFF):
+    point = 'H' if format == LEVL_FORMAT_USHORT else 'B'
+    header = struct.pack("<IIIIIIII28s60x", 1, format, points_per_value,
+                         block_size, channels,
+                         len(peaks) // (channels * points_per_value),
+                         position, 120, b'2024:05:06:07:08:09:010')
+    return header + struct.pack(f"<{len(peaks)}{point}", *peaks)
+
+
+class TestLevl(TestCase):
+
+    def test_read_levl(self):
+        peaks = [100, 200, 300, 400, 65535, 0, 7, 8]
+        levl = WavLevlReader(levl_chunk(peaks, position=12))
+
+        self.assertEqual(levl.version, 1)
+        self.assertEqual(levl.format, LEVL_FORMAT_USHORT)
+        self.assertEqual(levl.points_per_value, 2)
+        self.assertEqual(levl.block_size, 256)
+        self.assertEqual(levl.channel_count, 2)
+        self.assertEqual(levl.peak_frame_count, 2)
+        self.assertEqual(levl.peak_of_peaks_position, 12)
+        self.assertEqual(levl.timestamp, '2024:05:06:07:08:09:010')
+        self.assertEqual(levl.full_scale, 65535)
+        self.assertEqual(len(levl.peak_data), 16)
+        self.assertEqual(list(levl.peaks), peaks)
+
+    def test_uchar_and_truncated(self):
+        levl = WavLevlReader(levl_chunk([1, 2, 3, 4], format=1,
+                                        points_per_value=1)[:-1])
+        self.assertEqual(levl.peak_of_peaks_position, None)
+        self.assertEqual(levl.full_scale, 255)
+        self.assertEqual(list(levl.peaks), [1, 2, 3])
+
+    def test_levl_scope(self):
+        levl = levl_chunk([10, 20, 30, 40])
+        info = wavinfo.WavInfoReader(
+            BytesIO(wave_file(b'\0' * 1024, chunks=[(b'levl', levl)])))
+
+        assert info.levl is not None
+        self.assertEqual(list(info.levl.peaks), [10, 20, 30, 40])
+
+        scope = {key: value for scope, key, value in info.walk()
+                 if scope == 'levl'}
+        self.assertEqual(scope['block_size'], 256)
+        self.assertEqual(scope['peak_frame_count'], 1)
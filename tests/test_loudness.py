@@ -0,0 +1,148 @@
+import os
+import struct
+import tempfile
+from unittest import TestCase, skipUnless
+
+import wavinfo
+from wavinfo.loudness_meter import measure_loudness_batch
+from wavinfo.sample_decoder import np
+
+from .utils import write_wave
+
+
+def write_float_wave(path, samples, sample_rate=48000, loudness=None):
+    """
+    Write float `samples`, optionally with a version 2 ``bext`` chunk
+    declaring `loudness`, in hundredths.
+    """
+    chunks = []
+    if loudness is not None:
+        chunks.append((b'bext', struct.pack(
+            "<256s32s32s10s8sQH64s5h180s", b'', b'', b'', b'', b'', 0, 2,
+            b'', *loudness, b'')))
+
+    write_wave(path, samples.astype('<f4').tobytes(), chunks,
+               channels=samples.shape[1], sample_rate=sample_rate, bits=32,
+               format_tag=3)
+
+
+def sine(seconds, level, frequency=1000.0, phase=0.0, sample_rate=48000):
+    t = np.arange(round(seconds * sample_rate)) / sample_rate
+    return 10.0 ** (level / 20.0) * \
+        np.sin(2 * np.pi * frequency * t + phase)
+
+
+def faded(samples, seconds=0.1, sample_rate=48000):
+    """
+    `samples` faded in and out, so their ends don't overshoot when
+    oversampled.
+    """
+    length = round(seconds * sample_rate)
+    ramp = np.sin(np.linspace(0.0, np.pi / 2, length)) ** 2
+    envelope = np.concatenate((ramp, np.ones(len(samples) - 2 * length),
+                               ramp[::-1]))
+    return samples * envelope
+
+
+@skipUnless(np is not None, "requires NumPy")
+class TestLoudness(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'test.wav')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_stereo_sine(self):
+        # EBU Tech 3341 case 1: a 1 kHz sine at -23 dBFS in both channels
+        # reads -23 LUFS.
+        tone = sine(20.0, -23.0)
+        write_float_wave(self.path, np.stack((tone, tone), axis=1))
+
+        measured = wavinfo.WavInfoReader(self.path).measure_loudness().measured
+        self.assertAlmostEqual(measured.loudness_value, -23.0, delta=0.1)
+        self.assertAlmostEqual(measured.max_momentary_loudness, -23.0,
+                               delta=0.1)
+        self.assertAlmostEqual(measured.max_shortterm_loudness, -23.0,
+                               delta=0.1)
+        self.assertAlmostEqual(measured.loudness_range, 0.0, delta=0.1)
+        self.assertAlmostEqual(measured.max_true_peak, -23.0, delta=0.1)
+
+    def test_loudness_range(self):
+        # EBU Tech 3342 case 1: 20 s at -20 dBFS then 20 s at -30 dBFS has a
+        # range of 10 LU.
+        tone = np.concatenate((sine(20.0, -20.0), sine(20.0, -30.0)))
+        write_float_wave(self.path, np.stack((tone, tone), axis=1))
+
+        measured = wavinfo.WavInfoReader(self.path).measure_loudness().measured
+        self.assertAlmostEqual(measured.loudness_range, 10.0, delta=1.0)
+
+    def test_true_peak(self):
+        # A sine at a quarter of the sample rate, sampled 45 degrees from its
+        # peaks, peaks 3 dB above its samples.
+        tone = faded(sine(2.0, 0.0, frequency=12000.0, phase=np.pi / 4))
+        write_float_wave(self.path, tone[:, None])
+
+        measured = wavinfo.WavInfoReader(self.path).measure_loudness().measured
+        self.assertAlmostEqual(20 * np.log10(np.abs(tone).max()), -3.01,
+                               delta=0.01)
+        self.assertAlmostEqual(measured.max_true_peak, 0.0, delta=0.05)
+
+    def test_true_peak_not_below_sample_peak(self):
+        impulse = np.zeros((48000, 1))
+        impulse[24000] = 1.0
+        noise = np.random.default_rng(1).uniform(-0.5, 0.5, (48000, 2))
+        noise[-1] = 0.9
+        for samples in (impulse, noise):
+            write_float_wave(self.path, samples)
+            measured = wavinfo.WavInfoReader(self.path) \
+                .measure_loudness().measured
+            sample_peak = 20 * np.log10(
+                np.abs(samples.astype('f4')).max())
+            self.assertGreaterEqual(measured.max_true_peak, sample_peak)
+
+    def test_true_peak_at_half_scale(self):
+        tone = faded(sine(2.0, -6.0206, frequency=12000.0,
+                          phase=np.pi / 4))
+        write_float_wave(self.path, tone[:, None])
+
+        measured = wavinfo.WavInfoReader(self.path).measure_loudness().measured
+        self.assertAlmostEqual(measured.max_true_peak, -6.02, delta=0.02)
+
+    def test_surround_weighting(self):
+        tone = sine(5.0, -23.0)
+        samples = np.zeros((len(tone), 6))
+        samples[:, 3] = tone
+        write_float_wave(self.path, samples)
+        measured = wavinfo.WavInfoReader(self.path).measure_loudness().measured
+        self.assertEqual(measured.loudness_value, float('-inf'))
+
+        samples[:, 3] = 0.0
+        samples[:, 4] = tone
+        write_float_wave(self.path, samples)
+        measured = wavinfo.WavInfoReader(self.path).measure_loudness().measured
+        self.assertAlmostEqual(measured.loudness_value,
+                               -26.0 + 10 * np.log10(1.41), delta=0.1)
+
+    def test_declared(self):
+        tone = sine(5.0, -23.0)
+        write_float_wave(self.path, np.stack((tone, tone), axis=1),
+                         loudness=(-2300, 32767, -2300, -2300, 32767))
+
+        report = wavinfo.WavInfoReader(self.path).measure_loudness()
+        self.assertEqual(report.declared.loudness_value, -23.0)
+        self.assertIsNone(report.declared.loudness_range)
+        self.assertIsNone(report.declared.max_shortterm_loudness)
+
+        differences = report.differences()
+        self.assertAlmostEqual(differences['loudness_value'], 0.0,
+                               delta=0.1)
+        self.assertIsNone(differences['loudness_range'])
+
+    def test_batch(self):
+        tone = sine(1.0, -23.0)
+        write_float_wave(self.path, tone[:, None])
+        reports = measure_loudness_batch([self.path], max_workers=1)
+        self.assertAlmostEqual(reports[self.path].measured.loudness_value,
+                               -26.0, delta=0.1)
@@ -2,10 +2,12 @@ import unittest
 
 from unittest.mock import patch
 
-from wavinfo.__main__ import main
+from wavinfo.__main__ import main, write_json, LazyJSONObject
 
 import sys
 import glob
+import json
+from io import StringIO
 
 class MainTest(unittest.TestCase):
     
@@ -32,3 +34,13 @@ class MainTest(unittest.TestCase):
                 main()
             except:
                 self.fail("main() throwing an exception") 
+
+    def test_write_json(self):
+        value = {'a': [1, {'b': None}], 'c': {}, 'd': [], 1: "x"}
+        lazy = LazyJSONObject(iter([('a', iter([1, {'b': None}])),
+                                    ('c', LazyJSONObject(iter([]))),
+                                    ('d', iter([])), (1, "x")]))
+        for v in (value, lazy):
+            out = StringIO()
+            write_json(v, out, indent=2)
+            self.assertEqual(out.getvalue(), json.dumps(value, indent=2))
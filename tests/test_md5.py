@@ -0,0 +1,86 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import wavinfo
+from wavinfo.md5_checksum import verify_md5_batch, write_md5
+
+
+class TestMD5(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def copy(self, path):
+        copy = os.path.join(self.dir.name, os.path.basename(path))
+        shutil.copyfile(path, copy)
+        return copy
+
+    def audio_md5(self, path):
+        info = wavinfo.WavInfoReader(path)
+        assert info.data is not None
+        with open(path, 'rb') as f:
+            f.seek(info._data_chunk().start)
+            return hashlib.md5(f.read(info.data.byte_count)).hexdigest()
+
+    def test_write_into_filler(self):
+        path = self.copy('tests/test_files/zoom_F8/DISCRETE/'
+                         'Scene_1_2AG-T001.TAKE/Scene_1_2AG-T001_Tr1.WAV')
+        size = os.path.getsize(path)
+        before = wavinfo.WavInfoReader(path)
+        self.assertIsNone(before.md5)
+        self.assertIsNone(before.verify_md5().valid)
+
+        self.assertTrue(write_md5(path))
+        self.assertEqual(os.path.getsize(path), size)
+
+        info = wavinfo.WavInfoReader(path)
+        assert info.md5 is not None
+        self.assertEqual(info.md5.hexdigest, self.audio_md5(path))
+        self.assertTrue(info.verify_md5(read_size=4096).valid)
+        self.assertEqual(info.ixml.source, before.ixml.source)
+        self.assertIn((b'PAD ', 124640),
+                      [(c.ident, c.length) for c in info.main_list])
+        self.assertFalse(write_md5(path))
+
+    def test_write_appended(self):
+        # The JUNK chunk at the start is kept for a ds64 chunk
+        path = self.copy('tests/test_files/sound_grinder_pro/'
+                         'new_camera bumb 1.wav')
+        size = os.path.getsize(path)
+        self.assertTrue(write_md5(path))
+        self.assertEqual(os.path.getsize(path), size + size % 2 + 24)
+
+        info = wavinfo.WavInfoReader(path)
+        self.assertEqual(info.main_list[0].ident, b'JUNK')
+        self.assertEqual(info.main_list[-1].ident, b'MD5 ')
+        self.assertTrue(info.verify_md5().valid)
+
+        with open(path, 'r+b') as f:
+            f.seek(info._data_chunk().start + 100)
+            byte = f.read(1)
+            f.seek(-1, os.SEEK_CUR)
+            f.write(bytes([byte[0] ^ 0xFF]))
+
+        self.assertFalse(wavinfo.WavInfoReader(path).verify_md5().valid)
+
+    def test_batch(self):
+        paths = [self.copy('tests/test_files/protools/umid.wav'),
+                 self.copy('tests/test_files/smpl/alarm_citizen_loop1.wav')]
+        results = verify_md5_batch(paths, max_workers=2, read_size=1 << 16,
+                                   write_missing=True)
+        for path in paths:
+            self.assertIsNone(results[path].stored)
+            self.assertTrue(results[path].written)
+            self.assertEqual(results[path].computed, self.audio_md5(path))
+
+        results = verify_md5_batch(paths, max_workers=2)
+        self.assertTrue(all(result.valid and not result.written
+                            for result in results.values()))
+        self.assertIn(('md5', 'digest', self.audio_md5(paths[0])),
+                      list(wavinfo.WavInfoReader(paths[0]).walk()))
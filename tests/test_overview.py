@@ -0,0 +1,101 @@
+import os
+import struct
+import tempfile
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+import wavinfo
+from wavinfo.sample_decoder import np
+from wavinfo.waveform_overview import (
+    build_overview_batch,
+    load_overviews,
+    save_overviews,
+)
+
+from .utils import write_wave
+
+
+@skipUnless(np is not None, "requires NumPy")
+class TestOverview(TestCase):
+
+    def test_scan(self):
+        info = wavinfo.WavInfoReader(
+            'tests/test_files/sounddevices/A101_1.WAV')
+        assert info.data is not None
+        audio = info.frames(as_float=True).astype('f8')
+
+        overviews = info.overviews(levels=(100, 1000))
+        self.assertEqual([o.frames_per_point for o in overviews],
+                         [100, 1000])
+
+        for overview in overviews:
+            points = -(-info.data.frame_count // overview.frames_per_point)
+            self.assertEqual(overview.minimum.shape, (points, 2))
+            self.assertEqual(overview.frame_count, info.data.frame_count)
+
+            for point in (0, 7, points - 1):
+                start = point * overview.frames_per_point
+                run = audio[start:start + overview.frames_per_point]
+                self.assertTrue(np.allclose(overview.minimum[point],
+                                            run.min(axis=0)))
+                self.assertTrue(np.allclose(overview.maximum[point],
+                                            run.max(axis=0)))
+                self.assertTrue(np.allclose(
+                    overview.rms[point],
+                    np.sqrt(np.mean(run ** 2, axis=0)), rtol=1e-5))
+
+    def test_levl(self):
+        samples = np.zeros((1024, 2))
+        samples[10, 0] = 16384
+        samples[300, 1] = -8192
+
+        levl = struct.pack("<IIIIIIII28s60x", 1, 2, 2, 256, 2, 4, 10, 120,
+                           b'2024:01:01:00:00:00:000')
+        peaks = np.zeros((4, 2, 2), dtype='<u2')
+        peaks[0, 0, 0] = 32768
+        peaks[1, 1, 1] = 16384
+        levl += peaks.tobytes()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "levl.wav")
+            write_wave(path, samples.astype('<i2').tobytes(),
+                       chunks=[(b'levl', levl)], channels=2)
+            info = wavinfo.WavInfoReader(path)
+
+            from_levl = info.overviews(levels=(256, 512))
+            scanned = info.overviews(levels=(256, 512), use_levl=False)
+            unaligned = info.overviews(levels=(100,))
+
+        self.assertIsNone(from_levl[0].rms)
+        self.assertIsNotNone(scanned[0].rms)
+        self.assertIsNotNone(unaligned[0].rms)
+        self.assertEqual(from_levl[1].minimum.shape, (2, 2))
+        self.assertAlmostEqual(float(from_levl[0].maximum[0, 0]),
+                               float(scanned[0].maximum[0, 0]), places=4)
+        self.assertAlmostEqual(float(from_levl[1].minimum[0, 1]),
+                               float(scanned[1].minimum[0, 1]), places=4)
+
+    def test_batch_and_sidecar(self):
+        paths = ['tests/test_files/sounddevices/A101_1.WAV',
+                 'tests/test_files/cue_chunks/STE-000.wav']
+        batch = build_overview_batch(paths, max_workers=2, levels=(512,))
+        self.assertEqual(list(batch.keys()), paths)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            sidecar = os.path.join(tmp, "overview.npz")
+            save_overviews(sidecar, batch[paths[1]])
+            loaded = load_overviews(sidecar)
+
+        self.assertEqual(len(loaded), 1)
+        self.assertEqual(loaded[0].frames_per_point, 512)
+        self.assertEqual(loaded[0].frame_count, batch[paths[1]][0].frame_count)
+        self.assertTrue(np.array_equal(loaded[0].rms, batch[paths[1]][0].rms))
+
+
+class TestOverviewWithoutNumpy(TestCase):
+
+    def test_save_requires_numpy(self):
+        with tempfile.TemporaryDirectory() as dir, \
+                patch('wavinfo.sample_decoder.np', None), \
+                self.assertRaises(ImportError):
+            save_overviews(os.path.join(dir, 'test.npz'), [])
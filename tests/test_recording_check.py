@@ -0,0 +1,86 @@
+import os
+import tempfile
+from unittest import TestCase, skipUnless
+
+import wavinfo
+from wavinfo.recording_check import SampleRun, check_recording_batch
+from wavinfo.sample_decoder import np
+
+from .utils import wave_header
+
+
+def supports_holes(directory):
+    """
+    `True` if files in `directory` can be sparse and report their holes.
+    """
+    if not hasattr(os, 'SEEK_HOLE'):
+        return False
+
+    with tempfile.TemporaryFile(dir=directory) as f:
+        f.truncate(1 << 20)
+        f.seek(0, os.SEEK_END)
+        f.write(b'\1')
+        f.flush()
+        try:
+            return os.lseek(f.fileno(), 0, os.SEEK_HOLE) < (1 << 20)
+        except OSError:
+            return False
+
+
+@skipUnless(np is not None, "requires NumPy")
+class TestRecordingCheck(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'test.wav')
+        self.audio = np.random.default_rng(1) \
+            .integers(1, 256, (48000, 2, 3)).astype('u1')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_clean(self):
+        info = wavinfo.WavInfoReader(
+            'tests/test_files/sounddevices/A101_1.WAV')
+        check = info.check_recording()
+        self.assertFalse(check.truncated)
+        self.assertEqual(check.extra_bytes, 0)
+        self.assertEqual(check.holes, [])
+        self.assertEqual(check.zero_tail, [0, 0])
+
+    def test_zero_runs(self):
+        self.audio[1000:10000, 1] = 0
+        self.audio[20000:20010] = 0
+        self.audio[40000:] = 0
+        with open(self.path, 'wb') as f:
+            f.write(wave_header(48000 * 6, bits=24))
+            f.write(self.audio.tobytes())
+
+        check = wavinfo.WavInfoReader(self.path) \
+            .check_recording(min_zero_seconds=0.01)
+        self.assertEqual(check.zero_runs,
+                         [[SampleRun(40000, 48000)],
+                          [SampleRun(1000, 10000), SampleRun(40000, 48000)]])
+        self.assertEqual(check.zero_tail, [8000, 8000])
+
+    def test_truncated_with_hole(self):
+        if not supports_holes(self.dir.name):
+            self.skipTest("file system doesn't report sparse holes")
+
+        with open(self.path, 'wb') as f:
+            f.write(wave_header(4 * 48000 * 6, bits=24))
+            f.write(self.audio.tobytes())
+            f.truncate(f.tell() + 2 * len(self.audio.tobytes()))
+            f.seek(0, os.SEEK_END)
+            f.write(self.audio[:24000].tobytes())
+
+        results = check_recording_batch([self.path], max_workers=1,
+                                        read_size=1 << 16)
+        check = results[self.path]
+        self.assertTrue(check.truncated)
+        self.assertEqual(check.missing_bytes, 24000 * 6)
+        self.assertEqual(check.zero_runs, [[SampleRun(48000, 3 * 48000)]] * 2)
+        self.assertEqual(check.zero_tail, [0, 0])
+        self.assertTrue(check.holes)
+        for hole in check.holes:
+            self.assertTrue(48000 <= hole.start < hole.stop <= 3 * 48000)
@@ -1,13 +1,21 @@
 # import os.path
 import gzip
+import os
+import tempfile
 from glob import glob
+from io import BytesIO
+from struct import pack
 # from typing import Dict, Any, cast
 
 from unittest import TestCase
 
 # from .utils import all_files, ffprobe
+from .utils import rf64_header
 
 import wavinfo
+from wavinfo.rf64_parser import parse_rf64
+from wavinfo.riff_parser import parse_chunk
+
 
 class TestRf64(TestCase):
 
@@ -23,3 +31,71 @@ class TestRf64(TestCase):
             self.assertIsNotNone(wav_info)
             # self.assertIsNotNone(wav_info.bext)
 
+            assert wav_info.data is not None
+            self.assertEqual(wav_info.data.sample_count, 399914469)
+            self.assertEqual(wav_info.data.frame_count, 399914469)
+
+    def test_ds64_table(self):
+        table = [(b'axml', 0x1_0000_0010), (b'bxml', 0x2_0000_0020)]
+        stream = BytesIO(rf64_header(0x3_0000_0000, 0x8000_0000, table))
+        stream.seek(8)
+
+        context = parse_rf64(stream)
+        self.assertEqual(stream.tell(), 20 + 28 + 12 * len(table))
+        self.assertEqual(context.sample_count, 0x8000_0000)
+        self.assertEqual(context.bigchunk_table[b'axml'], 0x1_0000_0010)
+        self.assertEqual(context.bigchunk_table[b'bxml'], 0x2_0000_0020)
+        self.assertEqual(context.bigchunk_table[b'data'], 0x3_0000_0000)
+
+    def test_parse_after_ds64(self):
+        table = [(b'axml', 0x1_0000_0010)]
+        stream = BytesIO(rf64_header(600, 100, table) + bytes(600))
+        form = parse_chunk(stream)
+
+        self.assertEqual(form.signature, b'WAVE')
+        self.assertEqual([c.ident for c in form.children],
+                         [b'ds64', b'fmt ', b'data'])
+        ds64 = form.children[0]
+        self.assertEqual((ds64.start, ds64.length), (20, 28 + 12))
+        self.assertEqual(form.children[2].length, 600)
+        self.assertEqual(form.children[2].rf64_context.sample_count, 100)
+
+    def test_sparse_big_file(self):
+        frame_count = 1_000_000_000
+        data_size = frame_count * 6
+        header = rf64_header(data_size, frame_count)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "big.wav")
+            with open(path, 'wb') as f:
+                f.write(header)
+                f.truncate(len(header) + data_size)
+
+            wav_info = wavinfo.WavInfoReader(path)
+
+        assert wav_info.fmt is not None and wav_info.data is not None
+        self.assertEqual(wav_info.fmt.channel_count, 2)
+        self.assertEqual(wav_info.data.byte_count, data_size)
+        self.assertEqual(wav_info.data.frame_count, frame_count)
+        self.assertEqual(wav_info.data.sample_count, frame_count)
+
+    def test_hostile_ds64(self):
+        header = rf64_header(600, 100)
+        oversize = bytearray(header)
+        oversize[16:20] = pack("<I", 0xFFFFFF00)
+        stream = BytesIO(oversize)
+        stream.seek(8)
+        with self.assertRaises(wavinfo.WavInfoChunkSizeError):
+            parse_rf64(stream)
+
+        truncated = BytesIO(header[:40])
+        truncated.seek(8)
+        with self.assertRaises(wavinfo.WavInfoEOFError):
+            parse_rf64(truncated)
+
+        long_table = bytearray(header)
+        long_table[44:48] = pack("<I", 0x1000_0000)
+        stream = BytesIO(long_table)
+        stream.seek(8)
+        with self.assertRaises(ValueError):
+            parse_rf64(stream)
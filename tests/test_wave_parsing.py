@@ -1,3 +1,5 @@
+import io
+import struct
 import os.path
 from glob import glob
 from typing import Dict, Any, cast
@@ -43,6 +45,46 @@ class TestWaveInfo(TestCase):
                         int(streams['bits_per_sample']) / 8
                 self.assertEqual(info.fmt.byte_rate, byte_rate)
 
+    def test_extensible_fmt(self):
+        info = wavinfo.WavInfoReader(
+            'tests/test_files/nuendo/wavinfo Test Project - Audio - 5.1.wav')
+        assert info.fmt is not None
+        self.assertEqual(info.fmt.audio_format, 0xFFFE)
+        self.assertEqual(info.fmt.valid_bits_per_sample, 24)
+        self.assertEqual(info.fmt.channel_mask, 0x3F)
+        self.assertEqual(str(info.fmt.sub_format),
+                         '00000001-0000-0010-8000-00aa00389b71')
+        self.assertEqual(info.fmt.format_tag, 1)
+
+        sample_format = info.fmt.sample_format
+        assert sample_format is not None
+        self.assertEqual(sample_format.encoding, 'int')
+        self.assertEqual(sample_format.sample_width, 3)
+        self.assertEqual(sample_format.valid_bits, 24)
+        self.assertIsNone(sample_format.dtype)
+
+    def test_sample_format(self):
+        info = wavinfo.WavInfoReader(
+            'tests/test_files/cue_chunks/izotoperx_cues_test.wav')
+        assert info.fmt is not None
+        self.assertIsNone(info.fmt.channel_mask)
+        self.assertIsNone(info.fmt.sub_format)
+        assert info.fmt.sample_format is not None
+        self.assertEqual(info.fmt.sample_format.encoding, 'float')
+        self.assertEqual(info.fmt.sample_format.dtype, '<f4')
+
+        fmt = info.fmt._replace(audio_format=1, bits_per_sample=16,
+                                block_align=2)
+        assert fmt.sample_format is not None
+        self.assertEqual(fmt.sample_format.dtype, '<i2')
+
+        fmt = fmt._replace(bits_per_sample=8, block_align=1)
+        assert fmt.sample_format is not None
+        self.assertEqual(fmt.sample_format.encoding, 'uint')
+        self.assertEqual(fmt.sample_format.dtype, 'u1')
+
+        self.assertIsNone(fmt._replace(audio_format=0x55).sample_format)
+
     def test_data_against_ffprobe(self):
         for wav_file in all_files():
             info = wavinfo.WavInfoReader(wav_file)
@@ -177,6 +219,73 @@ class TestWaveInfo(TestCase):
         self.assertEqual(info.keywords,
                          'Sound Effect, movement, microphone, bump')
         self.assertEqual(info.title, 'camera bumb 1')
+        self.assertEqual(info.fields, {
+            b'IART': 'Jamie Hardt',
+            b'ICMT': 'Comments',
+            b'ICOP': 'Â© 2010 Jamie Hardt',
+            b'ICRD': '2010-12-28',
+            b'IENG': 'JPH',
+            b'IKEY': 'Sound Effect, movement, microphone, bump',
+            b'INAM': 'camera bumb 1',
+            b'IPRD': 'Test Sounds',
+            b'ISFT': 'Sound Grinder Pro',
+            b'ISRC': 'Unknown'})
         self.assertEqual(type(info.to_dict()), dict)
         self.assertEqual(type(info.__repr__()), str)
 
+
+    def test_info_unknown_fields(self):
+        fields = [(b'INAM', b'Title\0'), (b'ISMP', b'01:00:00:00\0'),
+                  (b'IDIT', b'Mon Oct 19 12:00:00 2026\0'),
+                  (b'XVND', b'caf\xe9\0')]
+        info_list = b'INFO' + b''.join(
+            ident + struct.pack("<I", len(data)) + data +
+            b'\0' * (len(data) % 2) for ident, data in fields)
+        fmt = struct.pack("<HHIIHH", 1, 1, 48000, 96000, 2, 16)
+        body = b'WAVE' + \
+            b'fmt ' + struct.pack("<I", len(fmt)) + fmt + \
+            b'LIST' + struct.pack("<I", len(info_list)) + info_list + \
+            b'data' + struct.pack("<I", 4) + b'\0' * 4
+        wav = b'RIFF' + struct.pack("<I", len(body)) + body
+
+        info = wavinfo.WavInfoReader(io.BytesIO(wav),
+                                     info_encoding='ascii').info
+        assert info is not None
+        self.assertEqual(info.title, 'Title')
+        self.assertEqual(info.fields, {
+            b'INAM': 'Title',
+            b'ISMP': '01:00:00:00',
+            b'IDIT': 'Mon Oct 19 12:00:00 2026',
+            b'XVND': 'caf\ufffd'})
+        self.assertEqual(info.to_dict()['extra'], {
+            'ISMP': '01:00:00:00',
+            'IDIT': 'Mon Oct 19 12:00:00 2026',
+            'XVND': 'caf\ufffd'})
+
+    def test_size_limits(self):
+        ixml = b'<BWFXML><PROJECT>Limits</PROJECT></BWFXML>'
+        fmt = struct.pack("<HHIIHH", 1, 1, 48000, 96000, 2, 16)
+        body = b'WAVE' + \
+            b'fmt ' + struct.pack("<I", len(fmt)) + fmt + \
+            b'data' + struct.pack("<I", 4) + b'\0' * 4 + \
+            b'iXML' + struct.pack("<I", 0xFFFFFF00) + ixml
+        wav = b'RIFF' + struct.pack("<I", len(body)) + body
+
+        with self.assertRaises(wavinfo.WavInfoChunkSizeError) as context:
+            wavinfo.WavInfoReader(io.BytesIO(wav))
+        self.assertEqual(context.exception.identifier, b'iXML')
+        self.assertEqual(context.exception.length, 0xFFFFFF00)
+
+        info = wavinfo.WavInfoReader(io.BytesIO(wav), oversize='skip')
+        self.assertIsNone(info.ixml)
+        assert info.data is not None
+        self.assertEqual(info.data.frame_count, 2)
+
+        info = wavinfo.WavInfoReader(io.BytesIO(wav),
+                                     size_limits={'ixml': None})
+        assert info.ixml is not None
+        self.assertEqual(info.ixml.project, 'Limits')
+
+        with self.assertRaises(wavinfo.WavInfoChunkSizeError):
+            wavinfo.WavInfoReader(io.BytesIO(wav), oversize='skip',
+                                  size_limits={'fmt': 8})
@@ -0,0 +1,68 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+
+def run_without_lxml(script: str) -> str:
+    """
+    Run `script` in a new interpreter where lxml cannot be imported.
+    """
+    preamble = "import sys; sys.modules['lxml'] = None\n"
+    process = subprocess.run([sys.executable, "-c", preamble + script],
+                             capture_output=True, text=True, check=True)
+    return process.stdout.strip()
+
+
+class TestXMLBackend(TestCase):
+    def test_no_xml_for_plain_files(self):
+        output = run_without_lxml(
+            "import wavinfo\n"
+            "w = wavinfo.WavInfoReader("
+            "'tests/test_files/sound_grinder_pro/new_camera bumb 1.wav')\n"
+            "list(w.walk())\n"
+            "print(any('xml' in name for name, module\n"
+            "          in sys.modules.items() if module is not None))\n")
+        self.assertEqual(output, "False")
+
+    def test_ixml_without_lxml(self):
+        output = run_without_lxml(
+            "import wavinfo\n"
+            "w = wavinfo.WavInfoReader("
+            "'tests/test_files/sounddevices/A101_4.WAV')\n"
+            "print(w.ixml.scene, w.ixml.take,\n"
+            "      [t.name for t in w.ixml.track_list][0])\n")
+        self.assertEqual(output, "A101 4 MKH516 A")
+
+    def test_steinberg_without_lxml(self):
+        output = run_without_lxml(
+            "import wavinfo\n"
+            "w = wavinfo.WavInfoReader('tests/test_files/nuendo/"
+            "wavinfo Test Project - Audio - 5.1.wav')\n"
+            "print(w.ixml.steinberg.sample_format_size)\n")
+        self.assertEqual(output, "3")
+
+    def test_adm_without_lxml(self):
+        output = run_without_lxml(
+            "import wavinfo\n"
+            "path = 'tests/test_files/protools/Test_ADM_ProTools.wav'\n"
+            "for mode in ('keep', 'stream'):\n"
+            "    adm = wavinfo.WavInfoReader(path, "
+            "adm_block_formats=mode).adm\n"
+            "    print(adm.track_info(10)['content_name'],\n"
+            "          len(adm.programme()['contents']),\n"
+            "          len(list(adm.block_formats())))\n")
+        self.assertEqual(output.splitlines(), ["Dialog 3 374"] * 2)
+
+    def test_iterparse_root_match(self):
+        script = (
+            "from io import BytesIO\n"
+            "from wavinfo.xml_backend import IterParser\n"
+            "doc = b'<item><item/><item/></item>'\n"
+            "print([parent is None for parent, _ in\n"
+            "       IterParser(BytesIO(doc), 'item')])\n")
+        expected = "[False, False, True]"
+        self.assertEqual(run_without_lxml(script), expected)
+
+        process = subprocess.run([sys.executable, "-c", script],
+                                 capture_output=True, text=True, check=True)
+        self.assertEqual(process.stdout.strip(), expected)
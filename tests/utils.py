@@ -3,6 +3,7 @@ import sys
 import subprocess
 from subprocess import PIPE
 import json
+from struct import pack
 
 FFPROBE = 'ffprobe'
 
@@ -36,3 +37,61 @@ def all_files():
             _, ext = os.path.splitext(filename)
             if ext in ['.wav', '.WAV']:
                 yield os.path.join(dirpath, filename)
+
+
+def fmt_chunk(channels=2, sample_rate=48000, bits=16, format_tag=1):
+    """
+    The body of a ``fmt`` chunk. Formats other than integer PCM get the
+    extended layout, with an empty extension.
+    """
+    block_align = channels * bits // 8
+    fmt = pack("<HHIIHH", format_tag, channels, sample_rate,
+               sample_rate * block_align, block_align, bits)
+    return fmt if format_tag == 1 else fmt + pack("<H", 0)
+
+
+def wave_header(data_size, chunks=(), **format):
+    """
+    The header of a WAVE file, up to the start of the `data` chunk's audio,
+    with the (ident, data) pairs in `chunks` between the ``fmt`` and
+    ``data`` chunks. Other keyword arguments are passed to
+    :func:`fmt_chunk`.
+    """
+    body = b'WAVE'
+    for ident, data in ((b'fmt ', fmt_chunk(**format)), *chunks):
+        body += ident + pack("<I", len(data)) + data + b'\0' * (len(data) % 2)
+
+    return b'RIFF' + pack("<I", len(body) + 8 + data_size) + body + \
+        b'data' + pack("<I", data_size)
+
+
+def wave_file(audio, chunks=(), **format):
+    """
+    A complete WAVE file of the `audio` bytes, as for :func:`wave_header`.
+    """
+    return wave_header(len(audio), chunks, **format) + audio
+
+
+def write_wave(path, audio, chunks=(), **format):
+    """
+    Write a WAVE file of the `audio` bytes to `path`, as for
+    :func:`wave_header`.
+    """
+    with open(path, 'wb') as f:
+        f.write(wave_file(audio, chunks, **format))
+
+
+def rf64_header(data_size, sample_count, table=(), block_align=6):
+    """
+    The header of an RF64 file, up to the start of the `data` chunk's
+    audio, with a ds64 table of `table` (ident, size) pairs.
+    """
+    ds64 = pack("<QQQI", data_size + 80 + len(table) * 12, data_size,
+                sample_count, len(table))
+    ds64 += b''.join(pack("<4sQ", ident, size) for ident, size in table)
+    fmt = fmt_chunk(channels=block_align // 3, bits=24)
+
+    return b'RF64' + pack("<I", 0xFFFFFFFF) + b'WAVE' + \
+        b'ds64' + pack("<I", len(ds64)) + ds64 + \
+        b'fmt ' + pack("<I", len(fmt)) + fmt + \
+        b'data' + pack("<I", 0xFFFFFFFF)